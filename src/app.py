@@ -1,10 +1,12 @@
-from flask import Flask, render_template
+from flask import Flask, jsonify, render_template
 import dash
 from dash import Dash
 import dash_bootstrap_components as dbc
 import os
 from dash import html, dcc
 
+from background import background_manager
+
 # -------------------------------------------------
 # Create Flask server
 # -------------------------------------------------
@@ -20,6 +22,12 @@ dash_app = Dash(
     pages_folder="pages",      # your NBA + NFL pages live here
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     url_base_pathname="/dash/",  # Dash lives under /dash/
+    # Callbacks target components on other pages; this also stops Dash from
+    # calling every page layout (and its data loaders) on the first request
+    # to build a validation layout.
+    suppress_callback_exceptions=True,
+    # slow callbacks run as background jobs (see background.py)
+    background_callback_manager=background_manager,
 )
 
 # -------------------------------------------------
@@ -41,14 +49,74 @@ dash_app.layout = html.Div(
 def index():
     return render_template("index.html")  # simple landing page
 
+# liveness + readiness (/healthz?ready passes once warm-up is done)
+import warmup
+
+warmup.register_health_routes(server)
+
+# resized, content-hashed WebP pitcher photos and team logos
+import images
+
+images.register_image_routes(server)
+
+# POST /admin/mlb/refresh: swap in the day's MLB files without a restart
+import mlb_data
+
+mlb_data.register_refresh_route(server)
+
+@server.route("/metrics/coalescing")
+def coalescing_metrics():
+    # computations saved per callback by request coalescing + the result cache
+    from caching import coalescing_stats
+    return jsonify(coalescing_stats())
+
 from callbacks import nba_cb, nfl_cb, nba_absence_cb, nba_props_lines_cb
 #import callbacks.nba_cb
 #import callbacks.nfl_cb
 #import callbacks.nba_absence_cb
 #import callbacks.nba_props_lines_cb
 
+# -------------------------------------------------
+# Metrics + on-demand profiling: wrap every registered callback,
+# serve /metrics and /admin/profiles
+# -------------------------------------------------
+import threading
+
+import metrics
+import profiling
+
+
+def instrument_all_callbacks():
+    profiling.instrument_callbacks(dash_app)
+    metrics.instrument_callbacks(dash_app)
+
+
+instrument_all_callbacks()
+
+# The pages router and the background cancel callbacks are only registered
+# by Dash's own first-request hooks, which run before this one.
+_late_callbacks = {"done": False, "lock": threading.Lock()}
+
+
+@server.before_request
+def instrument_late_callbacks():
+    if _late_callbacks["done"]:
+        return
+    with _late_callbacks["lock"]:
+        if not _late_callbacks["done"]:
+            instrument_all_callbacks()
+            _late_callbacks["done"] = True
+
+
+metrics.register_payload_hook(server, dash_app)
+metrics.register_metrics_route(server)
+profiling.register_admin_routes(server)
+
 # -------------------------------------------------
 # Run the app
 # -------------------------------------------------
 if __name__ == "__main__":
+    import background
+
+    background.start_job_launcher()
     server.run(debug=True)
@@ -0,0 +1,185 @@
+# -----------------------------
+# Background callbacks (Dash DiskcacheManager)
+# -----------------------------
+# Slow callbacks run as `background=True` callbacks: the request thread only
+# starts a job process and returns, the browser polls for progress/results,
+# and the job can be cancelled.
+#
+# Jobs are never forked from the serving worker itself: it runs request
+# threads that use the SQLite-backed diskcache below all the time, and a
+# process forked while another thread is inside SQLite inherits its locks
+# and hangs on its first write. Each worker instead forks a job launcher
+# while it is still single-threaded (gunicorn.conf.py, after warm-up), and
+# the launcher forks one process per job. Jobs start from the data the
+# worker had loaded at that point; anything a job loads stays in the job.
+#
+# The same diskcache directory is shared by all workers on the host and also
+# holds data generations: a job that reloads a source bumps its generation,
+# and every worker drops its in-process copy on the next read.
+import os
+import signal
+import sys
+import tempfile
+import threading
+import traceback
+import uuid
+from multiprocessing import Pipe
+
+import diskcache
+import psutil
+from dash import DiskcacheManager
+
+BACKGROUND_CACHE_DIR = os.getenv(
+    "BACKGROUND_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sports_background")
+)
+# Finished job results nobody collected are dropped after this many seconds
+BACKGROUND_RESULT_EXPIRE_S = int(os.getenv("BACKGROUND_RESULT_EXPIRE_S", "600"))
+# How often the browser polls a running job
+BACKGROUND_POLL_MS = int(os.getenv("BACKGROUND_POLL_MS", "250"))
+# Jobs run at this much lower CPU priority than the worker, so on a busy host
+# the request threads (fast callbacks) win over a long computation
+BACKGROUND_JOB_NICE = int(os.getenv("BACKGROUND_JOB_NICE", "5"))
+
+
+def _serve_jobs(conn, registry, cache):
+    """
+    The launcher's loop: for each (job function key, job args) received,
+    fork a job process and answer with its pid. Exits with the worker.
+    """
+    # the kernel reaps finished jobs; Dash tracks them by pid only
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # the worker's signal handlers are not ours; the worker's exit ends the loop
+    for sig in (signal.SIGTERM, signal.SIGQUIT, signal.SIGHUP, signal.SIGUSR1, signal.SIGUSR2, signal.SIGWINCH):
+        signal.signal(sig, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.set_wakeup_fd(-1)
+    try:
+        while True:
+            try:
+                fn_key, job_args = conn.recv()
+            except (EOFError, OSError):
+                break
+            pid = os.fork()
+            if pid == 0:
+                conn.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                code = 0
+                try:
+                    job_fn = registry.get(fn_key)
+                    if job_fn is None:
+                        raise LookupError(f"background callback {fn_key} was registered after the launcher started")
+                    job_fn(*job_args)
+                except BaseException as e:
+                    code = 1
+                    cache.set(job_args[0], {"background_callback_error": {"msg": str(e), "tb": traceback.format_exc()}})
+                finally:
+                    # os._exit skips atexit: write the job's queued views now
+                    from metrics import flush_views
+
+                    flush_views()
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(code)
+            conn.send(pid)
+    finally:
+        os._exit(0)
+
+
+class _JobLauncher:
+    """Handle on a forked launcher process (see _serve_jobs)."""
+
+    def __init__(self, registry, cache):
+        self._conn, child = Pipe()
+        self.owner = os.getpid()
+        self.pid = os.fork()
+        if self.pid == 0:
+            self._conn.close()
+            _serve_jobs(child, registry, cache)
+        child.close()
+        self._lock = threading.Lock()
+
+    def launch(self, fn_key, job_args) -> int:
+        with self._lock:
+            try:
+                self._conn.send((fn_key, job_args))
+                return self._conn.recv()
+            except (EOFError, OSError) as e:
+                raise RuntimeError(f"background job launcher {self.pid} is gone ({type(e).__name__})") from e
+
+
+class _JobManager(DiskcacheManager):
+    """
+    DiskcacheManager with per-job result keys, jobs forked by a launcher
+    process (see the module comment) and niced job processes.
+
+    Dash keys a job's result on the function source and its inputs, so two
+    users asking for the same chart at once share a key and the first one to
+    poll takes (and deletes) the other's result. Results are never reused
+    here (no cache_by), so every job gets its own key.
+    """
+
+    def build_cache_key(self, fn, args, cache_args_to_ignore, triggered):
+        return f"{super().build_cache_key(fn, args, cache_args_to_ignore, triggered)}-{uuid.uuid4().hex}"
+
+    def terminate_job(self, job):
+        # the job can exit between Dash's pid check and its child listing
+        try:
+            return super().terminate_job(job)
+        except psutil.NoSuchProcess:
+            return None
+
+    def make_job_fn(self, fn, progress, key=None):
+        job_fn = super().make_job_fn(fn, progress, key)
+
+        def nice_job_fn(*args):
+            if BACKGROUND_JOB_NICE:
+                os.nice(BACKGROUND_JOB_NICE)
+            return job_fn(*args)
+
+        return nice_job_fn
+
+    _launcher = None
+
+    def start_launcher(self):
+        self._launcher = _JobLauncher(self.func_registry, self.handle)
+        print(f"[background] Job launcher {self._launcher.pid} started", flush=True)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        launcher = self._launcher
+        if launcher is None or launcher.owner != os.getpid():
+            # not started at boot (an entry point other than gunicorn/app.py)
+            print(
+                f"[background] Starting the job launcher late, with {threading.active_count()} threads "
+                "running; call background.start_job_launcher() at startup instead",
+                flush=True,
+            )
+            self.start_launcher()
+            launcher = self._launcher
+        fn_key = next(k for k, fn in self.func_registry.items() if fn is job_fn)
+        return launcher.launch(fn_key, (key, self._make_progress_key(key), args, context))
+
+
+background_cache = diskcache.Cache(BACKGROUND_CACHE_DIR)
+background_manager = _JobManager(background_cache, expire=BACKGROUND_RESULT_EXPIRE_S)
+
+
+def start_job_launcher():
+    """
+    Forks this process's background job launcher. Call it once all callbacks
+    are registered and before any request thread runs (gunicorn.conf.py:
+    post_worker_init; app.py: before server.run).
+    """
+    background_manager.start_launcher()
+
+
+CANCEL_SHOWN = {"display": "inline-block", "marginLeft": "8px"}
+CANCEL_HIDDEN = {"display": "none"}
+
+
+def bump_generation(name: str) -> int:
+    """Marks `name`'s data as reloaded for every process on this host."""
+    return background_cache.incr(f"generation:{name}", default=0)
+
+
+def generation(name: str) -> int:
+    return background_cache.get(f"generation:{name}", 0)
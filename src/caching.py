@@ -0,0 +1,453 @@
+# -----------------------------
+# Process-level caching primitives
+# -----------------------------
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from metrics import LOADER_CALLS, LOADER_LATENCY, SHARED_CACHE_CALLS, log_view
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Failed loads are retried after base * 2**(failures-1) seconds, capped.
+SINGLE_FLIGHT_BACKOFF_BASE = float(os.getenv("SINGLE_FLIGHT_BACKOFF_BASE", "1.0"))
+SINGLE_FLIGHT_BACKOFF_MAX = float(os.getenv("SINGLE_FLIGHT_BACKOFF_MAX", "60.0"))
+
+
+def _make_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (object,) + tuple(sorted(kwargs.items()))
+
+
+class _Flight:
+    """One in-progress load that other callers can wait on."""
+
+    __slots__ = ("done", "result", "error", "abandoned")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # the leader was interrupted (KeyboardInterrupt, SystemExit, worker
+        # abort): nothing to share, waiters load again themselves
+        self.abandoned = False
+
+
+class _Failure:
+    __slots__ = ("error", "count", "retry_at")
+
+    def __init__(self, error, count, retry_at):
+        self.error = error
+        self.count = count
+        self.retry_at = retry_at
+
+
+def single_flight(maxsize: int | None = 128, backoff_base: float | None = None, backoff_max: float | None = None):
+    """
+    Drop-in replacement for functools.lru_cache for expensive loaders.
+
+    On a miss exactly one caller runs the function; concurrent callers with
+    the same arguments block until it finishes and then share its result. If
+    the load raises, the exception goes to the loader and every waiter, and
+    calls made during the backoff window re-raise it without loading again.
+    The first call after the window retries; the window doubles per
+    consecutive failure up to `backoff_max`.
+
+    Exposes cache_clear() and cache_info() like lru_cache.
+    """
+    base = SINGLE_FLIGHT_BACKOFF_BASE if backoff_base is None else backoff_base
+    cap = SINGLE_FLIGHT_BACKOFF_MAX if backoff_max is None else backoff_max
+
+    def decorator(fn):
+        loader = f"{fn.__module__}.{fn.__qualname__}"
+        lock = threading.Lock()
+        cache = OrderedDict()
+        flights = {}
+        failures = {}
+        stats = {"hits": 0, "misses": 0}
+        # bumped by cache_clear so loads started before a clear are not stored
+        generation = [0]
+
+        def _after_fork():
+            # A forked child (background callback job) inherits the lock and
+            # in-flight loads of threads that do not exist in it; start clean.
+            nonlocal lock
+            lock = threading.Lock()
+            flights.clear()
+
+        os.register_at_fork(after_in_child=_after_fork)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    LOADER_CALLS.inc(loader=loader, result="hit")
+                    return cache[key]
+
+                failure = failures.get(key)
+                if failure is not None and time.monotonic() < failure.retry_at:
+                    LOADER_CALLS.inc(loader=loader, result="error")
+                    raise failure.error
+
+                flight = flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = flights[key] = _Flight()
+                    stats["misses"] += 1
+                    started_generation = generation[0]
+
+            if not leader:
+                LOADER_CALLS.inc(loader=loader, result="wait")
+                flight.done.wait()
+                if flight.abandoned:
+                    return wrapper(*args, **kwargs)
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            t0 = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                LOADER_CALLS.inc(loader=loader, result="error")
+                with lock:
+                    flights.pop(key, None)
+                    if started_generation == generation[0]:
+                        count = failure.count + 1 if failure is not None else 1
+                        delay = min(cap, base * (2 ** (count - 1)))
+                        failures[key] = _Failure(e, count, time.monotonic() + delay)
+                    flight.error = e
+                    flight.done.set()
+                print(
+                    f"[caching] {fn.__qualname__}{args!r} failed ({type(e).__name__}: {e}); "
+                    f"retry after backoff",
+                    flush=True,
+                )
+                raise
+            except BaseException:
+                with lock:
+                    flights.pop(key, None)
+                    flight.abandoned = True
+                    flight.done.set()
+                raise
+
+            LOADER_LATENCY.observe(time.perf_counter() - t0, loader=loader)
+            LOADER_CALLS.inc(loader=loader, result="miss")
+            with lock:
+                flights.pop(key, None)
+                failures.pop(key, None)
+                if started_generation == generation[0]:
+                    cache[key] = result
+                    if maxsize is not None and len(cache) > maxsize:
+                        cache.popitem(last=False)
+                flight.result = result
+                flight.done.set()
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                failures.clear()
+                stats["hits"] = stats["misses"] = 0
+                generation[0] += 1
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(stats["hits"], stats["misses"], maxsize, len(cache))
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_info = cache_info
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------
+# Request coalescing for callbacks
+# -----------------------------
+COALESCE_TTL_SECONDS = float(os.getenv("COALESCE_TTL_SECONDS", "10"))
+COALESCE_MAX_ENTRIES = int(os.getenv("COALESCE_MAX_ENTRIES", "512"))
+
+# Per-callback counters: calls, computed, coalesced (joined an in-flight
+# computation), ttl_hits (served from the result cache), errors
+_COALESCE_STATS: dict[str, dict[str, int]] = {}
+_COALESCE_STATS_LOCK = threading.Lock()
+
+
+def _reset_stats_lock():
+    global _COALESCE_STATS_LOCK
+    _COALESCE_STATS_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_stats_lock)
+
+
+def _normalize_input(v, unordered: bool = False):
+    """
+    Canonical form so equivalent callback inputs map to the same key. A list
+    is sorted only when `unordered` (a checklist or multi-select whose order
+    the callback ignores); everywhere else order is part of the input.
+    """
+    if v is None or v == "" or v == []:
+        return None
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, str):
+        return v.strip()
+    if isinstance(v, (list, tuple)):
+        items = [_normalize_input(x) for x in v]
+        if not unordered:
+            return items
+        try:
+            return sorted(items, key=lambda x: (x is None, str(type(x)), x))
+        except TypeError:
+            return items
+    if isinstance(v, dict):
+        return {str(k): _normalize_input(x) for k, x in sorted(v.items())}
+    return repr(v)
+
+
+def _normalize_args(args, unordered) -> list:
+    return [_normalize_input(a, i in unordered) for i, a in enumerate(args)]
+
+
+def _serialize_output(result) -> str:
+    from plotly.io.json import to_json_plotly
+    return to_json_plotly(result)
+
+
+def _bump(name: str, field: str):
+    with _COALESCE_STATS_LOCK:
+        stats = _COALESCE_STATS.setdefault(
+            name, {"calls": 0, "computed": 0, "coalesced": 0, "ttl_hits": 0, "errors": 0}
+        )
+        stats[field] += 1
+
+
+def coalescing_stats() -> dict[str, dict[str, int]]:
+    """Counters per coalesced callback, with `saved` = coalesced + ttl_hits."""
+    with _COALESCE_STATS_LOCK:
+        return {
+            name: {**stats, "saved": stats["coalesced"] + stats["ttl_hits"]}
+            for name, stats in _COALESCE_STATS.items()
+        }
+
+
+# Cached callbacks by view id ("module.qualname"), so warm-up can replay the
+# inputs recorded in the view log (metrics.log_view)
+REPLAYABLE: dict[str, object] = {}
+
+
+def _view_id(fn) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def coalesce(snapshot=None, ttl: float | None = None, max_entries: int | None = None,
+             unordered: tuple[int, ...] = ()):
+    """
+    Shares one computation between concurrent callback invocations with the
+    same normalized inputs and data snapshot, and keeps the serialized
+    outputs for `ttl` seconds so repeats within the window skip the work.
+    Every caller gets the outputs as decoded JSON (what Dash would send),
+    whether it computed, waited or hit the cache.
+
+    `unordered` lists the positions of list inputs whose order does not
+    matter; they are sorted into the key.
+
+    `snapshot` is a zero-argument callable returning the data version token
+    (see data_store.data_snapshot). A result whose snapshot changed while it
+    was being computed is returned but not cached. Exceptions (including
+    PreventUpdate) reach every waiter and are never cached.
+
+    Place it directly under @callback.
+    """
+    ttl_s = COALESCE_TTL_SECONDS if ttl is None else ttl
+    cap = COALESCE_MAX_ENTRIES if max_entries is None else max_entries
+
+    def decorator(fn):
+        name = fn.__qualname__
+        lock = threading.Lock()
+        results = OrderedDict()  # key -> (expires_at, serialized outputs)
+        flights = {}
+
+        def _after_fork():
+            nonlocal lock
+            lock = threading.Lock()
+            flights.clear()
+
+        os.register_at_fork(after_in_child=_after_fork)
+
+        view_id = _view_id(fn)
+
+        @wraps(fn)
+        def wrapper(*args):
+            _bump(name, "calls")
+            log_view(view_id, args)
+            version = snapshot() if snapshot is not None else ""
+            key = json.dumps(_normalize_args(args, unordered) + [version], sort_keys=True, default=repr)
+
+            with lock:
+                hit = results.get(key)
+                if hit is not None:
+                    if hit[0] > time.monotonic():
+                        results.move_to_end(key)
+                        _bump(name, "ttl_hits")
+                        return json.loads(hit[1])
+                    del results[key]
+
+                flight = flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = flights[key] = _Flight()
+
+            if not leader:
+                _bump(name, "coalesced")
+                flight.done.wait()
+                if flight.abandoned:
+                    return wrapper(*args)
+                if flight.error is not None:
+                    raise flight.error
+                return json.loads(flight.result)
+
+            try:
+                result = fn(*args)
+                serialized = _serialize_output(result)
+            except Exception as e:
+                _bump(name, "errors")
+                with lock:
+                    flights.pop(key, None)
+                    flight.error = e
+                    flight.done.set()
+                raise
+            except BaseException:
+                with lock:
+                    flights.pop(key, None)
+                    flight.abandoned = True
+                    flight.done.set()
+                raise
+
+            _bump(name, "computed")
+            still_current = snapshot is None or snapshot() == version
+            with lock:
+                flights.pop(key, None)
+                if still_current and ttl_s > 0:
+                    results[key] = (time.monotonic() + ttl_s, serialized)
+                    while len(results) > cap:
+                        results.popitem(last=False)
+                flight.result = serialized
+                flight.done.set()
+            return json.loads(serialized)
+
+        def cache_clear():
+            with lock:
+                results.clear()
+
+        wrapper.cache_clear = cache_clear
+        REPLAYABLE[view_id] = wrapper
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------
+# Shared result cache (all workers on the host)
+# -----------------------------
+# coalesce() and single_flight() are per process, so with several gunicorn
+# workers each one recomputes the same impact charts and props pivots. This
+# cache keeps serialized callback outputs in a diskcache directory every
+# worker (and background job) on the host reads, bounded by size with LRU
+# eviction. Keys carry the data snapshot, so a refreshed source is never
+# served from old entries; those just age out.
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sports_results"))
+# 0 disables the shared cache (every call computes)
+RESULT_CACHE_SIZE_MB = int(os.getenv("RESULT_CACHE_SIZE_MB", "256"))
+
+_result_cache = []
+
+
+def _shared_results():
+    if not _result_cache:
+        import diskcache
+
+        _result_cache.append(diskcache.Cache(
+            RESULT_CACHE_DIR,
+            size_limit=RESULT_CACHE_SIZE_MB * 1024 * 1024,
+            eviction_policy="least-recently-used",
+            tag_index=True,
+        ))
+    return _result_cache[0]
+
+
+def shared_cache(snapshot=None, name: str | None = None, expire: float | None = None,
+                 unordered: tuple[int, ...] = ()):
+    """
+    Caches a callback's serialized outputs across worker processes, keyed on
+    `name` (default: module.qualname), the normalized inputs (`unordered` as
+    in coalesce) and the `snapshot()` data version token. Hits and misses
+    both return the outputs as decoded JSON.
+
+    Like coalesce, results computed while the snapshot changed are returned
+    but not stored, and exceptions (including PreventUpdate) are never
+    cached. `expire` bounds an entry's age in seconds (default: until
+    evicted). Place it directly under @callback (under @coalesce if both).
+    """
+
+    def decorator(fn):
+        cache_id = name or _view_id(fn)
+        view_id = _view_id(fn)
+
+        def _key(args, version):
+            return json.dumps([cache_id, _normalize_args(args, unordered), version], sort_keys=True, default=repr)
+
+        @wraps(fn)
+        def wrapper(*args):
+            log_view(view_id, args)
+            if RESULT_CACHE_SIZE_MB <= 0:
+                return json.loads(_serialize_output(fn(*args)))
+            version = snapshot() if snapshot is not None else ""
+            key = _key(args, version)
+
+            cache = _shared_results()
+            hit = cache.get(key)
+            if hit is not None:
+                SHARED_CACHE_CALLS.inc(cache=cache_id, result="hit")
+                return json.loads(hit)
+
+            SHARED_CACHE_CALLS.inc(cache=cache_id, result="miss")
+            serialized = _serialize_output(fn(*args))
+            if snapshot is None or snapshot() == version:
+                cache.set(key, serialized, expire=expire, tag=cache_id)
+            return json.loads(serialized)
+
+        def peek(*args):
+            """The cached outputs for `args` (decoded), or None; never computes."""
+            if RESULT_CACHE_SIZE_MB <= 0:
+                return None
+            hit = _shared_results().get(_key(args, snapshot() if snapshot is not None else ""))
+            if hit is None:
+                return None
+            SHARED_CACHE_CALLS.inc(cache=cache_id, result="hit")
+            return json.loads(hit)
+
+        def cache_clear():
+            if RESULT_CACHE_SIZE_MB > 0:
+                _shared_results().evict(cache_id)
+
+        wrapper.peek = peek
+        wrapper.cache_clear = cache_clear
+        REPLAYABLE[view_id] = wrapper
+        return wrapper
+
+    return decorator
+
@@ -1,8 +1,11 @@
-from dash import Input, Output, callback, html, dcc, callback_context
+from dash import Input, Output, callback, html, dcc, callback_context, no_update
+from dash.exceptions import PreventUpdate
 from dash.dependencies import ALL
-import pandas as pd
 
-from data_store import get_nba_impact_df, get_nba_impact_stat_cols
+from background import BACKGROUND_POLL_MS, CANCEL_HIDDEN, CANCEL_SHOWN, background_manager
+from caching import shared_cache
+from data_store import data_snapshot
+from query_backend import get_backend
 import json
 
 
@@ -18,16 +21,7 @@ def update_exclude_dropdown(player_a):
     if not player_a:
         return [], []
 
-    df_impact = get_nba_impact_df()
-
-    team_series = df_impact.loc[df_impact["player"] == player_a, "team"]
-    if team_series.empty:
-        return [], []
-
-    team = team_series.mode()[0]
-
-    teammates = sorted(df_impact[df_impact["team"] == team]["player"].dropna().unique())
-    teammates = [p for p in teammates if p != player_a]
+    teammates = get_backend().impact_teammates(player_a)
 
     return [{"label": p, "value": p} for p in teammates], []
 
@@ -43,8 +37,7 @@ def build_stat_buttons(player_a):
     if not player_a:
         return html.Div("Select Player A above.")
 
-    df_impact = get_nba_impact_df()
-    impact_stat_cols = get_nba_impact_stat_cols(df_impact)
+    impact_stat_cols = get_backend().impact_stat_cols()
 
     buttons = []
     for stat in impact_stat_cols:
@@ -73,6 +66,7 @@ def build_stat_buttons(player_a):
 # -------------------------------------------------
 @callback(
     Output("nba-impact-chart-container", "children"),
+    Output("nba-impact-job", "data"),
     Input({"type": "nba-impact-stat-button", "index": ALL}, "n_clicks"),
     Input("nba-impact-player-a", "value"),
     Input("nba-impact-exclude-players", "value"),
@@ -80,103 +74,58 @@ def build_stat_buttons(player_a):
 def update_impact_chart(n_clicks_list, player_a, exclude_players):
     ctx = callback_context
     if not ctx.triggered:
-        return html.Div("Select a stat above.")
+        return html.Div("Select a stat above."), no_update
 
     trigger = ctx.triggered[0]["prop_id"].split(".")[0]
 
     try:
         stat_clicked = json.loads(trigger)["index"]
     except Exception:
-        return html.Div("Select a stat above.")
+        return html.Div("Select a stat above."), no_update
 
     if not player_a:
-        return html.Div("Select Player A above.")
-
-    df_impact = get_nba_impact_df()
-
-    # Basic validation for expected columns
-    required_cols = {"player", "team", "game_date", "played"}
-    missing = required_cols - set(df_impact.columns)
-    if missing:
-        return html.Div(f"Impact dataset missing columns: {', '.join(sorted(missing))}")
-
-    team_series = df_impact.loc[df_impact["player"] == player_a, "team"]
-    if team_series.empty:
-        return html.Div(f"No team found for {player_a}.")
-    team = team_series.mode()[0]
-
-    team_games = df_impact[df_impact["team"] == team]["game_date"].dropna().unique()
-    team_rows = df_impact[df_impact["team"] == team][["player", "game_date", "played"]].copy()
+        return html.Div("Select Player A above."), no_update
 
     excluded = exclude_players[:2] if exclude_players else []
 
-    game_status = {}
-    for game in team_games:
-        a_played = bool(
-            team_rows[
-                (team_rows["player"] == player_a) &
-                (team_rows["game_date"] == game)
-            ]["played"].sum()
-        )
-
-        excluded_played = []
-        for p in excluded:
-            played = bool(
-                team_rows[
-                    (team_rows["player"] == p) &
-                    (team_rows["game_date"] == game)
-                ]["played"].sum()
-            )
-            excluded_played.append(played)
-
-        if a_played and all(excluded_played):
-            game_status[game] = "With"
-        elif (not a_played) and all(not x for x in excluded_played):
-            game_status[game] = "Without"
-        else:
-            game_status[game] = "Exclude"
-
-    df_team = df_impact[df_impact["team"] == team].copy()
-    df_team["WithOrWithout"] = df_team["game_date"].map(game_status)
-    df_team = df_team[df_team["WithOrWithout"].isin(["With", "Without"])]
-    df_team = df_team[df_team["player"] != player_a]
-
-    if df_team.empty:
-        return html.Div("No teammate data available after filtering games.")
-
-    if stat_clicked not in df_team.columns:
-        return html.Div(f"Stat '{stat_clicked}' not found in dataset.")
-
-    df_team[stat_clicked] = pd.to_numeric(df_team[stat_clicked], errors="coerce")
-    df_team = df_team.dropna(subset=[stat_clicked])
+    # without exclusions (or once cached) the chart is quick: answer inline;
+    # the with/without pivot over every teammate takes seconds, so charts
+    # with exclusions go to update_impact_chart_job
+    cached = impact_chart.peek(player_a, excluded, stat_clicked)
+    if cached is not None:
+        return cached, no_update
+    if not excluded:
+        return impact_chart(player_a, excluded, stat_clicked), no_update
+    return no_update, {"player_a": player_a, "excluded": excluded, "stat": stat_clicked}
 
-    if df_team.empty:
-        return html.Div("No valid values for this stat after cleaning.")
 
-    df_grouped = (
-        df_team.groupby(["player", "WithOrWithout"])[stat_clicked]
-        .mean()
-        .reset_index()
-    )
-
-    if df_grouped.empty:
-        return html.Div("No grouped data available.")
-
-    df_pivot = df_grouped.pivot(
-        index="player",
-        columns="WithOrWithout",
-        values=stat_clicked
-    ).reset_index()
+@callback(
+    Output("nba-impact-chart-container", "children", allow_duplicate=True),
+    Input("nba-impact-job", "data"),
+    background=True,
+    manager=background_manager,
+    interval=BACKGROUND_POLL_MS,
+    running=[(Output("nba-impact-cancel", "style"), CANCEL_SHOWN, CANCEL_HIDDEN)],
+    progress=[Output("nba-impact-progress", "children")],
+    progress_default=[""],
+    cancel=[Input("nba-impact-cancel", "n_clicks")],
+    prevent_initial_call=True,
+)
+def update_impact_chart_job(set_progress, job):
+    if not job:
+        raise PreventUpdate
 
-    if "With" not in df_pivot.columns or "Without" not in df_pivot.columns:
-        return html.Div("Insufficient With/Without data to compute differences.")
+    set_progress((f"Computing {job['stat'].upper()} impact for {job['player_a']}...",))
+    return impact_chart(job["player_a"], job["excluded"], job["stat"])
 
-    df_pivot = df_pivot.dropna(subset=["With", "Without"])
-    if df_pivot.empty:
-        return html.Div("No players have both With and Without data.")
 
-    df_pivot["Difference"] = df_pivot["Without"] - df_pivot["With"]
-    df_pivot = df_pivot.sort_values("Difference", ascending=False)
+# chart per (player, exclusions, stat), shared by every worker until the
+# impact data changes
+@shared_cache(snapshot=lambda: data_snapshot("nba_impact"))
+def impact_chart(player_a, excluded, stat_clicked):
+    df_pivot, message = get_backend().impact_table(player_a, excluded, stat_clicked)
+    if message:
+        return html.Div(message)
 
     df_pivot["With_avg"] = df_pivot["With"]
     df_pivot["Without_avg"] = df_pivot["Without"]
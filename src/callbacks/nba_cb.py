@@ -1,10 +1,13 @@
 # callbacks/nba_callbacks.py
 import pandas as pd
 import plotly.graph_objects as go
-from dash import Input, Output, callback, html
+from dash import Input, Output, State, callback, html
 
 # ✅ Import cached loader + constants (safe at import time)
-from data_store import get_nba_df, NBA_PLAYER_COL, NBA_DATE_COL, NBA_LOCATION_COL
+from caching import coalesce
+from data_store import NBA_PLAYER_COL, NBA_DATE_COL, NBA_LOCATION_COL, data_snapshot
+from metrics import sampled_log
+from query_backend import get_backend
 
 # Keep names consistent with your existing code
 player_col = NBA_PLAYER_COL
@@ -12,6 +15,10 @@ date_col = NBA_DATE_COL
 location_col = NBA_LOCATION_COL
 
 
+def _nba_snapshot():
+    return data_snapshot("nba")
+
+
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
@@ -93,135 +100,24 @@ def build_table(all_counts, home_counts, away_counts):
     )
 
 
-def apply_schedule_filters(sub: pd.DataFrame, b2b_toggle, three_in_four_toggle) -> pd.DataFrame:
-    """
-    b2b_toggle comes from id='nba-b2b-toggle' -> [] or ['b2b2']
-    three_in_four_toggle comes from id='nba-3in4-toggle' -> [] or ['3in4']
-    """
-    # Back-to-back filter
-    if b2b_toggle and "b2b2" in b2b_toggle:
-        if "back_to_back" in sub.columns:
-            sub = sub[sub["back_to_back"] == 1]
-        else:
-            return sub.iloc[0:0]
-
-    # 3rd game in 4 nights filter
-    if three_in_four_toggle and "3in4" in three_in_four_toggle:
-        if "third_in_four" in sub.columns:
-            sub = sub[sub["third_in_four"] == 1]
-        else:
-            return sub.iloc[0:0]
-
-    return sub
-
-
 # -------------------------------------------------
-# NEW helpers: teammate options + WITH/WITHOUT filters
+# Season selector (latest season by default)
 # -------------------------------------------------
-def _first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    for c in candidates:
-        if c in df.columns:
-            return c
-    return None
-
-
-def _latest_team_for_player(df: pd.DataFrame, team_col: str, player: str) -> str | None:
-    """
-    For traded players, choose team based on most recent game_date.
-    Prefer played==1 rows if available.
-    """
-    if not player or team_col not in df.columns or date_col not in df.columns:
-        return None
-
-    tmp = df[df[player_col] == player].copy()
-    if tmp.empty:
-        return None
-
-    tmp[date_col] = pd.to_datetime(tmp[date_col], errors="coerce")
-    tmp = tmp.dropna(subset=[date_col, team_col])
-    if tmp.empty:
-        return None
-
-    if "played" in tmp.columns:
-        tmp_played = tmp[tmp["played"] == 1]
-        if not tmp_played.empty:
-            tmp = tmp_played
-
-    tmp = tmp.sort_values(date_col)
-    return str(tmp.iloc[-1][team_col])
-
-
-def teammates_for_player(df: pd.DataFrame, player: str) -> list[str]:
-    """
-    Returns other players on the same team as `player` (based on latest team).
-    Falls back to all other players if no team column exists.
-    """
-    if not player:
-        return []
-
-    team_col = _first_existing_col(df, ["team", "team_abbreviation", "tm", "team_name", "team_id"])
-    if not team_col:
-        return sorted([p for p in df[player_col].dropna().unique() if p != player])
-
-    team_val = _latest_team_for_player(df, team_col, player)
-    if not team_val:
-        return sorted([p for p in df[player_col].dropna().unique() if p != player])
-
-    team_mask = df[team_col].astype(str) == str(team_val)
-    teammates = df.loc[team_mask, player_col].dropna().unique().tolist()
-    return sorted([p for p in teammates if p != player])
-
-
-def apply_with_without_filters(
-    df: pd.DataFrame,
-    main_player: str,
-    with_player: str | None,
-    without_player: str | None,
-) -> tuple[pd.DataFrame, str]:
-    """
-    Returns:
-      - MAIN PLAYER rows only, filtered by with/without logic
-      - suffix label for chart title / notes
-
-    Requires 'played' column.
-    """
-    if not main_player:
-        return df.iloc[0:0].copy(), ""
-
-    if "played" not in df.columns:
-        raise ValueError("Missing required column 'played' in NBA dataset.")
-
-    # main player rows
-    sub = df[df[player_col] == main_player].copy()
-
-    # default: show games where main played
-    if not with_player and not without_player:
-        sub = sub[sub["played"] == 1]
-        return sub, ""
-
-    suffix_parts = []
-
-    # WITH: dates where both players played => sum(played) across those two players == 2
-    if with_player:
-        pair = df[df[player_col].isin([main_player, with_player])].copy()
-        g = pair.groupby(date_col, dropna=False)["played"].sum()
-        with_dates = set(g[g == 2].index.tolist())
-        sub = sub[sub[date_col].isin(with_dates)]
-        suffix_parts.append(f"WITH: {with_player}")
-
-    # WITHOUT: dates where main played and other did not (missing row or played==0)
-    if without_player:
-        without_played_dates = set(
-            df.loc[(df[player_col] == without_player) & (df["played"] == 1), date_col]
-            .dropna()
-            .unique()
-            .tolist()
-        )
-        sub = sub[(sub["played"] == 1) & (~sub[date_col].isin(without_played_dates))]
-        suffix_parts.append(f"WITHOUT: {without_player}")
+@callback(
+    Output("nba-season-dropdown", "options"),
+    Output("nba-season-dropdown", "value"),
+    Input("nba-init", "n_intervals"),
+    State("nba-season-dropdown", "value"),
+)
+def populate_season_dropdown(_, current_season):
+    try:
+        seasons = get_backend().nba_seasons()
+    except Exception:
+        return [], None
 
-    suffix = " | " + " & ".join(suffix_parts) if suffix_parts else ""
-    return sub, suffix
+    opts = [{"label": f"{s}-{str(s + 1)[-2:]}", "value": s} for s in reversed(seasons)]
+    value = current_season if current_season in seasons else (seasons[-1] if seasons else None)
+    return opts, value
 
 
 # -------------------------------------------------
@@ -231,17 +127,14 @@ def apply_with_without_filters(
     Output("nba-stats-player-dropdown", "options"),
     Output("nba-data-load-status", "children"),
     Input("nba-init", "n_intervals"),
+    Input("nba-season-dropdown", "value"),
 )
-def populate_player_dropdown(_):
+def populate_player_dropdown(_, season=None):
     try:
-        df = get_nba_df()
-        if df is None or df.empty:
+        players = get_backend().nba_players(season)
+        if not players:
             return [], "NBA data is missing or empty."
 
-        if player_col not in df.columns:
-            return [], f"Missing required column '{player_col}' in NBA data."
-
-        players = sorted(df[player_col].dropna().unique().tolist())
         opts = [{"label": p, "value": p} for p in players]
         return opts, ""
     except Exception as e:
@@ -259,16 +152,16 @@ def populate_player_dropdown(_):
     Input("nba-stats-player-dropdown", "value"),
     Input("nba-stats-with-dropdown", "value"),
     Input("nba-stats-without-dropdown", "value"),
+    Input("nba-season-dropdown", "value"),
 )
-def update_with_without_dropdowns(main_player, current_with, current_without):
+def update_with_without_dropdowns(main_player, current_with, current_without, season=None):
     if not main_player:
         return [], [], None, None
 
-    df = get_nba_df()
-    if df is None or df.empty:
+    teammates = get_backend().nba_teammates(main_player, season)
+    if not teammates:
         return [], [], None, None
 
-    teammates = teammates_for_player(df, main_player)
     opts = [{"label": p, "value": p} for p in teammates]
     valid = set(teammates)
 
@@ -298,25 +191,30 @@ def update_with_without_dropdowns(main_player, current_with, current_without):
     Input("nba-stats-without-dropdown", "value"),   # ✅ NEW
     Input("nba-b2b-toggle", "value"),
     Input("nba-3in4-toggle", "value"),
+    Input("nba-season-dropdown", "value"),
+    Input("nba-4in6-toggle", "value"),
+    Input("nba-rest-dropdown", "value"),
+    Input("nba-games-last-7-dropdown", "value"),
 )
-def stats_update_slider_props(player, stat_col, with_player, without_player, b2b_toggle, three_in_four_toggle):
-    print(
-        "SLIDER CALLBACK — Player:", player, "Stat:", stat_col,
-        "WITH:", with_player, "WITHOUT:", without_player,
-        "B2B:", b2b_toggle, "3in4:", three_in_four_toggle,
-        flush=True,
+# the schedule checklists (b2b, 3in4, 4in6) are sets
+@coalesce(snapshot=_nba_snapshot, unordered=(4, 5, 7))
+def stats_update_slider_props(player, stat_col, with_player, without_player, b2b_toggle, three_in_four_toggle, season=None,
+                              four_in_six_toggle=None, rest_days=None, min_games_last_7=None):
+    sampled_log(
+        "nba_slider", player=player, stat=stat_col,
+        with_player=with_player, without_player=without_player,
+        b2b=b2b_toggle, three_in_four=three_in_four_toggle, season=season,
+        four_in_six=four_in_six_toggle, rest_days=rest_days, games_last_7=min_games_last_7,
     )
 
     if not player or not stat_col:
         return 0, 25, {}, 10, "Select a player and stat to begin."
 
-    df_stats = get_nba_df()
-    if df_stats is None or df_stats.empty:
-        return 0, 25, {}, 10, "Data file is missing or empty."
-
     # Apply WITH/WITHOUT then schedule
-    sub, suffix = apply_with_without_filters(df_stats, player, with_player, without_player)
-    sub = apply_schedule_filters(sub, b2b_toggle, three_in_four_toggle)
+    sub, suffix = get_backend().nba_player_games(
+        player, with_player, without_player, b2b_toggle, three_in_four_toggle, season,
+        four_in_six_toggle, rest_days, min_games_last_7,
+    )
 
     if sub.empty:
         msg = f"No games found for this player with the selected filters.{suffix}"
@@ -347,7 +245,7 @@ def stats_update_slider_props(player, stat_col, with_player, without_player, b2b
     Input("nba-stats-threshold-slider", "value"),
 )
 def show_threshold(slider_value):
-    print("THRESHOLD DISPLAY — Slider value:", slider_value, flush=True)
+    sampled_log("nba_threshold_display", threshold=slider_value)
     return f"{slider_value}"
 
 
@@ -366,28 +264,32 @@ def show_threshold(slider_value):
     Input("nba-stats-threshold-slider", "value"),
     Input("nba-b2b-toggle", "value"),
     Input("nba-3in4-toggle", "value"),
+    Input("nba-season-dropdown", "value"),
+    Input("nba-4in6-toggle", "value"),
+    Input("nba-rest-dropdown", "value"),
+    Input("nba-games-last-7-dropdown", "value"),
 )
-def stats_update_chart_and_counts(player, stat_col, with_player, without_player, threshold, b2b_toggle, three_in_four_toggle):
-    print(
-        "CHART CALLBACK — Player:", player, "Stat:", stat_col, "Threshold:", threshold,
-        "WITH:", with_player, "WITHOUT:", without_player,
-        "B2B:", b2b_toggle, "3in4:", three_in_four_toggle,
-        flush=True,
+@coalesce(snapshot=_nba_snapshot, unordered=(5, 6, 8))
+def stats_update_chart_and_counts(player, stat_col, with_player, without_player, threshold, b2b_toggle, three_in_four_toggle, season=None,
+                                  four_in_six_toggle=None, rest_days=None, min_games_last_7=None):
+    sampled_log(
+        "nba_chart", player=player, stat=stat_col, threshold=threshold,
+        with_player=with_player, without_player=without_player,
+        b2b=b2b_toggle, three_in_four=three_in_four_toggle, season=season,
+        four_in_six=four_in_six_toggle, rest_days=rest_days, games_last_7=min_games_last_7,
     )
 
     if not stat_col:
         return empty_fig("Please select a statistic.")
 
-    df_stats = get_nba_df()
-    if df_stats is None or df_stats.empty:
-        return empty_fig("Data file is missing or empty.")
-
     if not player:
         return empty_fig("Select a player to view game-by-game stats.")
 
     # Apply WITH/WITHOUT then schedule
-    sub, suffix = apply_with_without_filters(df_stats, player, with_player, without_player)
-    sub = apply_schedule_filters(sub, b2b_toggle, three_in_four_toggle)
+    sub, suffix = get_backend().nba_player_games(
+        player, with_player, without_player, b2b_toggle, three_in_four_toggle, season,
+        four_in_six_toggle, rest_days, min_games_last_7,
+    )
 
     if sub.empty:
         return empty_fig(f"No games found for this player with the selected filter(s).{suffix}")
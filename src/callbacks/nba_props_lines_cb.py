@@ -1,10 +1,12 @@
-import pandas as pd
+import numpy as np
 
-from dash import Input, Output, callback, html, dash_table
+from dash import Input, Output, callback, html
 
-# Import dataframe AND helper functions from the page module
+from components.server_table import register_server_table
+from data_store import data_snapshot, get_nba_props_df
+from odds import implied_prob
+# Import helper functions from the page module
 from pages.nba_props_lines import (
-    df_props,
     props_player_options,
     props_market_options
 )
@@ -22,20 +24,14 @@ def props_update_options(tab):
 
 
 # ------------------------------------------------------------
-# MAIN TABLE CALLBACK
+# MAIN TABLE (server-side paging / sorting / filtering)
 # ------------------------------------------------------------
-@callback(
-    Output('props-odds-table', 'children'),
-    Input('props-player-dropdown', 'value'),
-    Input('props-market-dropdown', 'value'),
-    Input('props-side-radio', 'value')
-)
-def props_update_table(player, market, side):
-
+def props_odds_frame(player, market, side):
+    df_props = get_nba_props_df()
     if df_props.empty:
         return html.Div("No props data file found.", style={"color": "red"})
 
-    filtered = df_props.copy()
+    filtered = df_props
 
     # Filtering
     if player:
@@ -51,11 +47,11 @@ def props_update_table(player, market, side):
         return html.Div("No data available for this selection.", style={"color": "red"})
 
     # Build line_id using normalized column names
-    filtered['line_id'] = (
+    filtered = filtered.assign(line_id=(
         filtered['player'] + " " +
         filtered['line'].astype(str) + " " +
         filtered['market']
-    )
+    ))
 
     # Pivot table
     pivot = filtered.pivot_table(
@@ -71,62 +67,37 @@ def props_update_table(player, market, side):
     if pivot.empty:
         return html.Div("No lines with enough sportsbook coverage.", style={"color": "orange"})
 
-    pivot.reset_index(inplace=True)
-
-    # Implied probability helper
-    def implied_prob(odds):
-        try:
-            odds = float(odds)
-            if odds > 0:
-                return 100 / (odds + 100)
-            else:
-                return abs(odds) / (abs(odds) + 100)
-        except:
-            return None
-
-    # Highlighting logic
-    styles = []
-    for i, row in pivot.iterrows():
-        odds_values = row[1:].dropna()
-        if odds_values.empty:
-            continue
-
-        probs = odds_values.apply(implied_prob)
-        if probs.isnull().all():
-            continue
-
-        best_col = probs.idxmin()
-        best_prob = probs[best_col]
-        other_probs = probs.drop(best_col)
-
-        if len(other_probs) == 0:
-            continue
-
-        if all(p > best_prob * 1.05 for p in other_probs):
-            styles.append({
-                'if': {'row_index': i, 'column_id': best_col},
-                'backgroundColor': '#d4edda',
-                'fontWeight': 'bold'
-            })
-
-    # Build table
-    table = dash_table.DataTable(
-        columns=[{"name": col, "id": col} for col in pivot.columns],
-        data=pivot.to_dict('records'),
-        style_table={'overflowX': 'auto', 'border': '1px solid #dee2e6'},
-        style_cell={
-            'textAlign': 'center',
-            'padding': '8px',
-            'border': '1px solid #dee2e6',
-            'whiteSpace': 'normal'
-        },
-        style_header={
-            'backgroundColor': '#343a40',
-            'color': 'white',
-            'fontWeight': 'bold',
-            'border': '1px solid #dee2e6'
-        },
-        style_data_conditional=styles
-    )
-
-    return table
+    # Highlight a book whose price beats every other book's by 5% implied probability
+    probs = implied_prob(pivot).to_numpy(dtype=float)
+    ranked = np.sort(probs, axis=1)  # NaN last
+    best_prob = ranked[:, 0]
+    runner_up = ranked[:, 1] if ranked.shape[1] > 1 else np.full(len(ranked), np.nan)
+    best_col = pivot.columns.to_numpy()[np.argmin(np.where(np.isnan(probs), np.inf, probs), axis=1)]
+    pivot = pivot.reset_index()
+    pivot["_best"] = np.where(runner_up > best_prob * 1.05, best_col, None)
+    return pivot
+
+
+def best_price_styles(page):
+    return [
+        {
+            'if': {'row_index': i, 'column_id': col},
+            'backgroundColor': '#d4edda',
+            'fontWeight': 'bold'
+        }
+        for i, col in enumerate(page["_best"]) if col is not None
+    ]
+
+
+props_update_table = register_server_table(
+    "props-odds-table",
+    props_odds_frame,
+    snapshot=lambda: data_snapshot("nba_props"),
+    inputs=[
+        ("props-player-dropdown", "value"),
+        ("props-market-dropdown", "value"),
+        ("props-side-radio", "value"),
+    ],
+    page_style=best_price_styles,
+    name="props_update_table",
+)
@@ -1,9 +1,10 @@
 import pandas as pd
 import plotly.graph_objects as go
-from dash import Input, Output, callback, html
+from dash import Input, Output, State, callback, html
 
 # ✅ Load from shared cached data store (safe at import time)
-from data_store import get_nfl_df, NFL_PLAYER_COL, NFL_DATE_COL, NFL_LOCATION_COL
+from data_store import get_nfl_df, has_partitioned_store, nfl_seasons, NFL_PLAYER_COL, NFL_DATE_COL, NFL_LOCATION_COL
+from query_backend import get_backend
 
 player_col = NFL_PLAYER_COL
 date_col = NFL_DATE_COL
@@ -30,6 +31,12 @@ def empty_fig(message: str):
     return fig, html.Div(), html.Div(), ""
 
 
+def _no_games(schedule_toggle) -> str:
+    if schedule_toggle:
+        return "No games found for this player with the selected schedule filters."
+    return "No games found for this player."
+
+
 def clean_numeric(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce").dropna()
 
@@ -93,6 +100,29 @@ def build_table(all_counts: dict):
     )
 
 
+# -------------------------------------------------
+# INIT: Season selector (latest season by default; every season of the
+# file when reading a single stats file, whose season labels are not split
+# into partitions)
+# -------------------------------------------------
+@callback(
+    Output("nfl-season-dropdown", "options"),
+    Output("nfl-season-dropdown", "value"),
+    Input("nfl-init", "n_intervals"),
+    State("nfl-season-dropdown", "value"),
+)
+def nfl_init_season_dropdown(_, current_season):
+    try:
+        seasons = nfl_seasons()
+    except Exception:
+        return [], None
+
+    opts = [{"label": str(s), "value": s} for s in reversed(seasons)]
+    if current_season in seasons:
+        return opts, current_season
+    return opts, (seasons[-1] if seasons and has_partitioned_store() else None)
+
+
 # -------------------------------------------------
 # INIT: Populate Player + Stat dropdowns (layout-only page needs this)
 # -------------------------------------------------
@@ -100,10 +130,11 @@ def build_table(all_counts: dict):
     Output("nfl-stats-player-dropdown", "options"),
     Output("nfl-stats-stat-dropdown", "options"),
     Input("nfl-init", "n_intervals"),
+    Input("nfl-season-dropdown", "value"),
 )
-def nfl_init_dropdowns(_):
+def nfl_init_dropdowns(_, season=None):
     try:
-        df = get_nfl_df()
+        df = get_nfl_df(season)
         if df is None or df.empty:
             return [], [], "NFL data is empty or not loaded."
 
@@ -133,21 +164,20 @@ def nfl_init_dropdowns(_):
     Output("nfl-stats-range-note", "children"),
     Input("nfl-stats-player-dropdown", "value"),
     Input("nfl-stats-stat-dropdown", "value"),
+    Input("nfl-season-dropdown", "value"),
+    Input("nfl-schedule-toggle", "value"),
 )
-def nfl_update_slider_props(player, stat_col):
+def nfl_update_slider_props(player, stat_col, season=None, schedule_toggle=None):
     if not player or not stat_col:
         return 0, 25, {}, 10, "Select a player and stat to begin."
 
-    df_stats = get_nfl_df()
-    if df_stats is None or df_stats.empty:
-        return 0, 25, {}, 10, "NFL data is empty."
-
-    if player_col not in df_stats.columns:
+    try:
+        sub = get_backend().nfl_player_games(player, stat_col, season, schedule_toggle)
+    except KeyError:
         return 0, 25, {}, 10, f"Error: player column '{player_col}' not found in NFL data."
 
-    sub = df_stats[df_stats[player_col] == player]
     if sub.empty:
-        return 0, 25, {}, 10, "No games found for this player."
+        return 0, 25, {}, 10, _no_games(schedule_toggle)
 
     if stat_col not in sub.columns:
         return 0, 25, {}, 10, "Selected stat not found in data."
@@ -188,24 +218,23 @@ def nfl_show_threshold(slider_value):
     Input("nfl-stats-player-dropdown", "value"),
     Input("nfl-stats-stat-dropdown", "value"),
     Input("nfl-stats-threshold-slider", "value"),
+    Input("nfl-season-dropdown", "value"),
+    Input("nfl-schedule-toggle", "value"),
 )
-def nfl_update_chart_and_counts(player, stat_col, threshold):
+def nfl_update_chart_and_counts(player, stat_col, threshold, season=None, schedule_toggle=None):
     if not stat_col:
         return empty_fig("Please select a statistic.")
 
     if not player:
         return empty_fig("Please select a player.")
 
-    df_stats = get_nfl_df()
-    if df_stats is None or df_stats.empty:
-        return empty_fig("Data file is missing or empty.")
-
-    if player_col not in df_stats.columns:
+    try:
+        sub = get_backend().nfl_player_games(player, stat_col, season, schedule_toggle).copy()
+    except KeyError:
         return empty_fig(f"Missing column '{player_col}' in NFL data.")
 
-    sub = df_stats[df_stats[player_col] == player].copy()
     if sub.empty:
-        return empty_fig("No games found for this player.")
+        return empty_fig(_no_games(schedule_toggle))
 
     if stat_col not in sub.columns:
         return empty_fig("Selected stat not found in data.")
@@ -0,0 +1,68 @@
+import threading
+
+from dash import Input, Output, callback, dcc, html
+
+from background import BACKGROUND_POLL_MS, CANCEL_HIDDEN, CANCEL_SHOWN, background_manager
+from mlb_data import get_mlb_data, mlb_data_loaded
+
+
+# -------------------------------------------------
+# MLB pages: build directly when the data is loaded, otherwise return a
+# shell and build the page in a background job (progress + cancel). The
+# worker prefetches the data for the page's own callbacks at the same time;
+# each file is parsed once on the host either way (mlb_data's frame cache),
+# so the job and the prefetch never both parse the spreadsheets.
+# -------------------------------------------------
+_prefetch_state = {"thread": None, "lock": threading.Lock()}
+
+
+def _prefetch():
+    with _prefetch_state["lock"]:
+        thread = _prefetch_state["thread"]
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=get_mlb_data, name="mlb-prefetch", daemon=True)
+            _prefetch_state["thread"] = thread
+            thread.start()
+
+
+def mlb_page(page_id: str, build):
+    if mlb_data_loaded():
+        return build()
+
+    _prefetch()
+    return html.Div(
+        id=f"{page_id}-body",
+        children=[
+            dcc.Store(id=f"{page_id}-load", data=1),
+            html.Div(
+                [
+                    dcc.Loading(html.Div(id=f"{page_id}-progress", children="Loading MLB data..."), type="dot"),
+                    html.Button("Cancel", id=f"{page_id}-cancel", n_clicks=0, style=CANCEL_HIDDEN),
+                ],
+                style={"textAlign": "center", "marginTop": "40px"},
+            ),
+        ],
+    )
+
+
+def register_mlb_page(page_id: str, build):
+    """Registers the background callback that fills `mlb_page(page_id, build)`'s shell."""
+
+    def load_mlb_page(set_progress, _load):
+        set_progress(("Loading MLB data...",))
+        get_mlb_data()
+        set_progress(("Building page...",))
+        return build()
+
+    # named per page (before registering) so metrics and profiles tell them apart
+    load_mlb_page.__name__ = f"load_{page_id.replace('-', '_')}"
+    return callback(
+        Output(f"{page_id}-body", "children"),
+        Input(f"{page_id}-load", "data"),
+        background=True,
+        manager=background_manager,
+        interval=BACKGROUND_POLL_MS,
+        running=[(Output(f"{page_id}-cancel", "style"), CANCEL_SHOWN, CANCEL_HIDDEN)],
+        progress=[Output(f"{page_id}-progress", "children")],
+        cancel=[Input(f"{page_id}-cancel", "n_clicks")],
+    )(load_mlb_page)
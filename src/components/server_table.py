@@ -0,0 +1,246 @@
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from dash import Input, Output, State, callback, callback_context, dash_table, html, no_update
+
+from caching import single_flight
+
+# Source frames kept per table (one per distinct set of source inputs)
+SERVER_TABLE_CACHE_SIZE = int(os.getenv("SERVER_TABLE_CACHE_SIZE", "32"))
+
+_FILTER_PART = re.compile(
+    r"^\{(?P<col>[^}]+)\}\s*"
+    r"(?P<op>[si]?(?:contains|datestartswith|eq|ne|lt|le|gt|ge)\b|!=|<=|>=|=|<|>)\s*"
+    r"(?P<value>.*)$"
+)
+_SYMBOLS = {"=": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+_COMPARE = {
+    "eq": lambda s, v: s == v,
+    "ne": lambda s, v: s != v,
+    "lt": lambda s, v: s < v,
+    "le": lambda s, v: s <= v,
+    "gt": lambda s, v: s > v,
+    "ge": lambda s, v: s >= v,
+}
+
+
+# -------------------------------------------------
+# Server-side DataTable: page_action / sort_action / filter_action="custom".
+# The browser only ever holds one page of rows; the full frame stays here
+# with its sort orders computed once per column.
+# -------------------------------------------------
+def parse_filter(filter_query: str) -> list[tuple[str, str, bool, str]]:
+    """DataTable filter_query -> [(column, op, case_insensitive, value)]; unknown parts are skipped."""
+    parts = []
+    for part in (filter_query or "").split(" && "):
+        m = _FILTER_PART.match(part.strip())
+        if not m:
+            continue
+        op = _SYMBOLS.get(m["op"], m["op"])
+        insensitive = op.startswith("i")
+        if op[0] in "si" and op[1:] in (*_COMPARE, "contains", "datestartswith"):
+            op = op[1:]
+        value = m["value"].strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1]
+        parts.append((m["col"], op, insensitive, value))
+    return parts
+
+
+def _part_mask(s: pd.Series, op: str, insensitive: bool, value: str) -> np.ndarray:
+    if op in _COMPARE and pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        try:
+            return _COMPARE[op](s, float(value)).to_numpy()
+        except ValueError:
+            return np.full(len(s), op == "ne")
+
+    text = s.astype(str).where(s.notna(), "")
+    if insensitive:
+        text, value = text.str.lower(), value.lower()
+    if op == "contains":
+        return text.str.contains(value, regex=False).to_numpy()
+    if op == "datestartswith":
+        return text.str.startswith(value).to_numpy()
+    return _COMPARE[op](text, value).to_numpy()
+
+
+class TableFrame:
+    """
+    A frame served one page at a time. Sort orders (row positions) are
+    computed on first use per column and direction and reused for every
+    later page, filter and user. Columns starting with "_" are kept for
+    page_style but not sent. Request threads share one TableFrame: the memos
+    are only read and written under its lock (computing happens outside it).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.visible = [c for c in self.df.columns if not str(c).startswith("_")]
+        self._orders = {}
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def columns(self) -> list[dict]:
+        return [
+            {"name": c, "id": c, "type": "numeric" if pd.api.types.is_numeric_dtype(self.df[c]) else "text"}
+            for c in self.visible
+        ]
+
+    def order(self, column: str, descending: bool) -> np.ndarray:
+        key = (column, descending)
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            s = self.df[column]
+            try:
+                s = s.sort_values(ascending=not descending, kind="stable", na_position="last")
+            except TypeError:  # mixed types: order as text
+                s = s.astype(str).where(s.notna()).sort_values(ascending=not descending, kind="stable", na_position="last")
+            order = s.index.to_numpy()
+            with self._lock:
+                order = self._orders.setdefault(key, order)
+        return order
+
+    def mask(self, filter_query: str) -> np.ndarray | None:
+        parts = [p for p in parse_filter(filter_query) if p[0] in self.df.columns]
+        if not parts:
+            return None
+        key = tuple(parts)
+        with self._lock:
+            mask = self._masks.get(key)
+        if mask is None:
+            mask = np.ones(len(self.df), dtype=bool)
+            for column, op, insensitive, value in parts:
+                mask &= _part_mask(self.df[column], op, insensitive, value)
+            with self._lock:
+                self._masks[key] = mask
+                while len(self._masks) > 16:
+                    self._masks.popitem(last=False)
+        return mask
+
+    def page(self, page_current: int, page_size: int, sort_by: list | None, filter_query: str):
+        """(rows of the page, page_current clamped to the result, page_count)."""
+        rows = None
+        sort = next((s for s in sort_by or [] if s.get("column_id") in self.df.columns), None)
+        if sort is not None:
+            rows = self.order(sort["column_id"], sort.get("direction") == "desc")
+        mask = self.mask(filter_query)
+        if mask is not None:
+            rows = rows[mask[rows]] if rows is not None else np.flatnonzero(mask)
+
+        total = len(self.df) if rows is None else len(rows)
+        page_count = max(1, math.ceil(total / page_size))
+        page_current = min(max(int(page_current or 0), 0), page_count - 1)
+        start = page_current * page_size
+        if rows is None:
+            page = self.df.iloc[start:start + page_size]
+        else:
+            page = self.df.iloc[rows[start:start + page_size]]
+        return page.reset_index(drop=True), page_current, page_count
+
+
+def server_table(table_id: str, page_size: int = 25, **table_kwargs):
+    """
+    A DataTable filled by register_server_table(table_id, ...), plus the
+    message shown when the source has no table for the inputs.
+    """
+    return html.Div(
+        [
+            html.Div(id=f"{table_id}-message"),
+            dash_table.DataTable(
+                id=table_id,
+                columns=[],
+                data=[],
+                page_action="custom",
+                page_current=0,
+                page_size=page_size,
+                page_count=1,
+                sort_action="custom",
+                sort_mode="single",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                **table_kwargs,
+            ),
+        ]
+    )
+
+
+def _hashable(v):
+    return tuple(_hashable(x) for x in v) if isinstance(v, (list, tuple)) else v
+
+
+def register_server_table(
+    table_id: str, source, snapshot, inputs=(), state=(), triggers=(), page_style=None, name=None
+):
+    """
+    Registers the callback serving server_table(table_id) and returns it.
+
+    `source(*trigger flags, *input values, *state values)` returns the full
+    DataFrame, or a message (any Dash children) when there is nothing to
+    show. It runs once per distinct set of values and `snapshot()` token
+    (e.g. data_snapshot("nba_props")), so paging, sorting and filtering
+    never rebuild it. `triggers` are inputs that only fire the callback,
+    such as a button's n_clicks: the source gets whether each has fired,
+    so the click count never splits the cache. `page_style(page)` returns
+    style_data_conditional for the rows of one page. The callback is named
+    `name` (default: the source's).
+    """
+    n_triggers = len(triggers)
+
+    def _table(*values):
+        result = source(*values)
+        # the snapshot is read after the source ran: a first call that loads
+        # the data is stored under the loaded version, not "unloaded"
+        return snapshot(), (TableFrame(result) if isinstance(result, pd.DataFrame) else result)
+
+    _table.__qualname__ = f"server_table[{table_id}]"
+    _table = single_flight(maxsize=SERVER_TABLE_CACHE_SIZE)(_table)
+
+    def update_server_table(page_current, page_size, sort_by, filter_query, *values):
+        triggered = callback_context.triggered_prop_ids
+        table_only = bool(triggered) and all(p.startswith(f"{table_id}.") for p in triggered)
+        if not table_only or f"{table_id}.page_current" not in triggered:
+            page_current = 0  # new rows, sort or filter: back to the first page
+
+        values = (*(bool(v) for v in values[:n_triggers]), *values[n_triggers:])
+        values = tuple(_hashable(v) for v in values)
+        version, table = _table(*values)
+        if version != snapshot():  # the data changed: every cached table is stale
+            _table.cache_clear()
+            version, table = _table(*values)
+        if not isinstance(table, TableFrame):
+            return [], [], 1, 0, no_update, table
+
+        page, page_current, page_count = table.page(page_current, page_size or 25, sort_by, filter_query)
+        return (
+            page[table.visible].to_dict("records"),
+            no_update if table_only else table.columns(),
+            page_count,
+            page_current,
+            page_style(page) if page_style is not None else no_update,
+            no_update if table_only else "",
+        )
+
+    update_server_table.__name__ = name or source.__name__
+    update_server_table.cache_clear = _table.cache_clear
+    return callback(
+        Output(table_id, "data"),
+        Output(table_id, "columns"),
+        Output(table_id, "page_count"),
+        Output(table_id, "page_current"),
+        Output(table_id, "style_data_conditional"),
+        Output(f"{table_id}-message", "children"),
+        Input(table_id, "page_current"),
+        Input(table_id, "page_size"),
+        Input(table_id, "sort_by"),
+        Input(table_id, "filter_query"),
+        *[Input(cid, prop) for cid, prop in triggers],
+        *[Input(cid, prop) for cid, prop in inputs],
+        *[State(cid, prop) for cid, prop in state],
+    )(update_server_table)
@@ -1,13 +1,25 @@
 # -----------------------------
 # NFL: Game logs dataset (parquet)
 # -----------------------------
+import hashlib
+import json
 import os
+import re
+import tempfile
 from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 import pandas as pd
 import requests
 
+from caching import single_flight
+from schedule_features import (
+    NFL_SCHEDULE_COLS,
+    add_nba_schedule_features,
+    add_nfl_schedule_features,
+    schedule_team_weeks,
+)
+
 # ---------- Helpers ----------
 def _is_url(s: str) -> bool:
     return s.startswith("http://") or s.startswith("https://")
@@ -25,13 +37,264 @@ def _fetch_bytes_public(url: str) -> bytes:
 def _read_parquet_anywhere(path_or_url: str) -> pd.DataFrame:
     if _is_url(path_or_url):
         content = _fetch_bytes_public(path_or_url)
+        _record_version(path_or_url, content)
         return pd.read_parquet(BytesIO(content))
+    _record_version(path_or_url)
     return pd.read_parquet(path_or_url)
 
+def _read_excel_anywhere(path_or_url: str) -> pd.DataFrame:
+    if _is_url(path_or_url):
+        content = _fetch_bytes_public(path_or_url)
+        _record_version(path_or_url, content)
+        return pd.read_excel(BytesIO(content))
+    _record_version(path_or_url)
+    return pd.read_excel(path_or_url)
+
+# ---------- Data snapshot versions ----------
+# Version of every source this process has read: sha1 of the bytes for URLs,
+# mtime/size for local files and dataset directories. Result caches key on
+# these, so a reload or a new file on disk never serves stale outputs.
+_SOURCE_VERSIONS: dict[str, str] = {}
+
+def _local_version(path: str) -> str:
+    p = Path(path)
+    try:
+        if p.is_dir():
+            stats = [f.stat() for f in p.rglob("*.parquet")]
+            newest = max((st.st_mtime_ns for st in stats), default=0)
+            return f"d{len(stats)}-{newest}-{sum(st.st_size for st in stats)}"
+        st = p.stat()
+        return f"f{st.st_mtime_ns}-{st.st_size}"
+    except OSError:
+        return "missing"
+
+def _record_version(path_or_url: str, content: bytes | None = None) -> None:
+    if content is not None:
+        _SOURCE_VERSIONS[path_or_url] = hashlib.sha1(content).hexdigest()[:16]
+    else:
+        _SOURCE_VERSIONS[path_or_url] = _local_version(path_or_url)
+
+def _forget_version(*paths_or_urls: str) -> None:
+    for p in paths_or_urls:
+        _SOURCE_VERSIONS.pop(p, None)
+
+def source_version(path_or_url: str) -> str:
+    """Version of the data loaded from `path_or_url` (or of the file on disk if not loaded yet)."""
+    version = _SOURCE_VERSIONS.get(path_or_url)
+    if version is not None:
+        return version
+    return "unloaded" if _is_url(path_or_url) else _local_version(path_or_url)
+
+# ---------- Local copies of URL sources ----------
+# DuckDB scans and cold single-player lookups need a file on disk. Copies are
+# named by URL and content hash and revalidated with the server's ETag once
+# per process, so a changed source is fetched again after a restart and two
+# URLs with the same basename never share a file.
+DOWNLOAD_CACHE_DIR = os.getenv(
+    "DOWNLOAD_CACHE_DIR",
+    os.getenv("DUCKDB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sports_duckdb")),
+)
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    # per-process temp file, so workers downloading at once never interleave
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@single_flight(maxsize=None)
+def local_copy(path_or_url: str) -> str:
+    """
+    Path of a local file with the contents of `path_or_url`; local paths pass
+    through. Records the source version like the readers above.
+    """
+    if not _is_url(path_or_url):
+        _record_version(path_or_url)
+        return path_or_url
+
+    cache_dir = Path(DOWNLOAD_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(path_or_url.encode()).hexdigest()[:16]
+    suffix = Path(path_or_url.split("?", 1)[0]).suffix
+    meta_path = cache_dir / f"{key}.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        meta = {}
+
+    headers = {"User-Agent": "dash-app", "Accept": "application/octet-stream"}
+    cached = cache_dir / f"{key}-{meta.get('digest')}{suffix}"
+    if meta.get("etag") and cached.exists():
+        headers["If-None-Match"] = meta["etag"]
+
+    r = requests.get(path_or_url, headers=headers, timeout=60)
+    if r.status_code == 304:
+        _SOURCE_VERSIONS[path_or_url] = meta["digest"]
+        return str(cached)
+    r.raise_for_status()
+
+    _record_version(path_or_url, r.content)
+    digest = _SOURCE_VERSIONS[path_or_url]
+    target = cache_dir / f"{key}-{digest}{suffix}"
+    if not target.exists():
+        _write_atomic(target, r.content)
+    meta = {"url": path_or_url, "etag": r.headers.get("ETag"), "digest": digest}
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    return str(target)
+
+
 def _normalize_cols(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
     return df
 
+def _normalize_name(col: str) -> str:
+    return str(col).strip().lower().replace(" ", "_")
+
+def read_parquet_player_rows(
+    path_or_url: str,
+    player_col: str,
+    player: str,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Reads one player's rows without loading the whole file: only row groups
+    whose min/max statistics for `player_col` can contain `player` are read,
+    and only `columns` (normalized names). Files written by
+    tools/repack_parquet.py are sorted by player, so a lookup touches one or
+    two small row groups. A URL is read from its local_copy, so only the
+    first lookup per process revalidates it with the server.
+    """
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(local_copy(path_or_url))
+
+    # normalized name -> name as stored in the file
+    raw_by_norm = {_normalize_name(c): c for c in pf.schema_arrow.names}
+    raw_player = raw_by_norm.get(player_col)
+    if raw_player is None:
+        raise KeyError(f"Column '{player_col}' not found in {path_or_url}")
+
+    wanted = [raw_by_norm[c] for c in (columns or list(raw_by_norm)) if c in raw_by_norm]
+    if raw_player not in wanted:
+        wanted.insert(0, raw_player)
+
+    leaf_paths = [pf.metadata.schema.column(j).path for j in range(pf.metadata.num_columns)]
+    player_idx = leaf_paths.index(raw_player)
+
+    row_groups = []
+    for i in range(pf.metadata.num_row_groups):
+        stats = pf.metadata.row_group(i).column(player_idx).statistics
+        if stats is None or not stats.has_min_max or stats.min <= player <= stats.max:
+            row_groups.append(i)
+
+    if row_groups:
+        df = pf.read_row_groups(row_groups, columns=wanted).to_pandas()
+    else:
+        df = pf.schema_arrow.empty_table().select(wanted).to_pandas()
+
+    df = _normalize_cols(df)
+    return df[df[player_col] == player].reset_index(drop=True)
+
+
+# -----------------------------
+# Partitioned game log store (multi-season)
+# -----------------------------
+# Hive layout written by tools/partition_game_logs.py:
+#   <root>/sport=nba/season=2025/month=3/part-0.parquet
+#   <root>/sport=nfl/season=2025/week=1/part-0.parquet
+# When GAMELOG_DATASET_ROOT is unset (or missing) the loaders below fall back
+# to the single-season parquet files.
+GAMELOG_DATASET_ROOT = os.getenv("GAMELOG_DATASET_ROOT", "")
+
+# Partition-only column that is not part of the original NBA game logs
+_PARTITION_ONLY_COLS = ["month"]
+
+
+def has_partitioned_store() -> bool:
+    return bool(GAMELOG_DATASET_ROOT) and Path(GAMELOG_DATASET_ROOT).is_dir()
+
+
+def _partition_root(sport: str) -> str:
+    return str(Path(GAMELOG_DATASET_ROOT) / f"sport={sport}")
+
+
+@lru_cache(maxsize=None)
+def _gamelog_dataset(sport: str):
+    # One dataset per sport: NBA and NFL files have unrelated schemas
+    import pyarrow.dataset as ds
+
+    root = _partition_root(sport)
+    _record_version(root)
+    return ds.dataset(str(root), format="parquet", partitioning="hive")
+
+
+def partitioned_seasons(sport: str) -> list[int]:
+    """
+    Seasons present in the partitioned store for `sport`, read from the
+    partition directory names only (no data files are opened).
+    """
+    if not has_partitioned_store():
+        return []
+
+    root = Path(GAMELOG_DATASET_ROOT) / f"sport={sport}"
+    if not root.is_dir():
+        return []
+
+    seasons = []
+    for p in root.iterdir():
+        m = re.fullmatch(r"season=(\d+)", p.name)
+        if m and p.is_dir():
+            seasons.append(int(m.group(1)))
+    return sorted(seasons)
+
+
+def scan_game_logs(
+    sport: str,
+    seasons: list[int] | None = None,
+    player_col: str | None = None,
+    players: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Scans the partitioned store with the season predicate pushed down to
+    partition pruning and the player predicate pushed down to the parquet scan.
+    """
+    import pyarrow.dataset as ds
+
+    expr = None
+    if seasons:
+        expr = ds.field("season").isin([int(s) for s in seasons])
+    if player_col and players:
+        player_expr = ds.field(player_col).isin(list(players))
+        expr = player_expr if expr is None else expr & player_expr
+
+    table = _gamelog_dataset(sport).to_table(columns=columns, filter=expr)
+    df = table.to_pandas()
+    df = df.drop(columns=[c for c in _PARTITION_ONLY_COLS if c in df.columns])
+    return _normalize_cols(df)
+
+
+def _filter_season(df: pd.DataFrame, season: int | None) -> pd.DataFrame:
+    if season is None or "season" not in df.columns:
+        return df
+    return df[df["season"] == int(season)].reset_index(drop=True)
+
+
+# Seasons currently held in memory by the per-season loaders below
+_LOADED_SEASONS: dict[str, set] = {"nba": set(), "nfl": set()}
+
+
+def _file_seasons(df: pd.DataFrame) -> list[int]:
+    if df is None or df.empty or "season" not in df.columns:
+        return []
+    return sorted(int(s) for s in df["season"].dropna().unique())
+
 
 # -----------------------------
 # NBA: Player game logs dataset
@@ -44,17 +307,71 @@ NBA_STATS_FILE = os.getenv(
 NBA_PLAYER_COL = "player"
 NBA_DATE_COL = "game_date"
 NBA_LOCATION_COL = "location"
+# A season is named for the year it starts in (2025-26 -> 2025) and is taken
+# from the game date: the game log file's own Season column mixes games of
+# one season under two labels.
+NBA_SEASON_START_MONTH = 8
+
+
+def nba_season_of(dates: pd.Series) -> pd.Series:
+    """Season (start year) of each game date; missing dates give <NA>."""
+    d = pd.to_datetime(dates, errors="coerce")
+    return (d.dt.year - (d.dt.month < NBA_SEASON_START_MONTH)).astype("Int64")
+
+
+def with_nba_season(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalized NBA game logs with `season` derived from the game date."""
+    if NBA_DATE_COL in df.columns:
+        df["season"] = nba_season_of(df[NBA_DATE_COL])
+    return df
 
 
-@lru_cache(maxsize=1)
-def get_nba_df() -> pd.DataFrame:
+@single_flight(maxsize=1)
+def _get_nba_file_df() -> pd.DataFrame:
     print(f"[data_store] Loading NBA stats from: {NBA_STATS_FILE}", flush=True)
     df = _read_parquet_anywhere(NBA_STATS_FILE)
-    return _normalize_cols(df)
+    return add_nba_schedule_features(with_nba_season(_normalize_cols(df)), NBA_DATE_COL, player_col=NBA_PLAYER_COL)
+
+
+@single_flight(maxsize=None)
+def _get_nba_season_df(season: int | None) -> pd.DataFrame:
+    if has_partitioned_store():
+        print(f"[data_store] Scanning NBA season {season} from: {GAMELOG_DATASET_ROOT}", flush=True)
+        df = scan_game_logs("nba", seasons=[season] if season is not None else None)
+        df = add_nba_schedule_features(df, NBA_DATE_COL, player_col=NBA_PLAYER_COL)
+    else:
+        df = _filter_season(_get_nba_file_df(), season)
+    _LOADED_SEASONS["nba"].add(season)
+    return df
+
+
+def nba_seasons() -> list[int]:
+    if has_partitioned_store():
+        return partitioned_seasons("nba")
+    return _file_seasons(_get_nba_file_df())
+
+
+def get_nba_df(season: int | None = None) -> pd.DataFrame:
+    """
+    NBA game logs for one season. With `season=None` this is the latest season
+    in the partitioned store, or the whole file in single-file mode.
+    Each season is cached separately, so memory grows with the seasons
+    actually requested rather than with the total history on disk.
+    """
+    if season is None and has_partitioned_store():
+        seasons = nba_seasons()
+        season = seasons[-1] if seasons else None
+    return _get_nba_season_df(season)
 
 
 def clear_nba_cache():
-    get_nba_df.cache_clear()
+    _forget_version(NBA_STATS_FILE, _partition_root("nba"))
+    # revalidate the downloaded copy too, or a reload reads the stale file
+    local_copy.cache_clear()
+    _get_nba_file_df.cache_clear()
+    _get_nba_season_df.cache_clear()
+    _LOADED_SEASONS["nba"].clear()
+    _gamelog_dataset.cache_clear()
 
 
 # -----------------------------
@@ -66,7 +383,7 @@ NBA_IMPACT_FILE = os.getenv(
 )
 
 
-@lru_cache(maxsize=1)
+@single_flight(maxsize=1)
 def get_nba_impact_df() -> pd.DataFrame:
     print(f"[data_store] Loading NBA impact from: {NBA_IMPACT_FILE}", flush=True)
     df = _read_parquet_anywhere(NBA_IMPACT_FILE)
@@ -75,6 +392,8 @@ def get_nba_impact_df() -> pd.DataFrame:
 
 
 def clear_nba_impact_cache():
+    _forget_version(NBA_IMPACT_FILE)
+    local_copy.cache_clear()
     get_nba_impact_df.cache_clear()
 
 
@@ -93,6 +412,34 @@ def get_nba_impact_stat_cols(df_impact: pd.DataFrame) -> list[str]:
     return numeric_cols
 
 
+# -----------------------------
+# NBA: Player props lines (xlsx)
+# -----------------------------
+NBA_PROPS_FILE = os.getenv(
+    "NBA_PROPS_FILE",
+    "https://raw.githubusercontent.com/mtdewrocks/sports_analysis/main/data/Basketball_Props.xlsx",
+)
+
+NBA_PROPS_BAD_BOOKS = {
+    "betonlineag", "ballybet", "betrivers", "bovada", "mybookieag",
+    "hardrockbet", "prizepicks", "betparx", "rebet", "williamhill_us", "betr_us_dfs"
+}
+
+
+@single_flight(maxsize=1)
+def get_nba_props_df() -> pd.DataFrame:
+    print(f"[data_store] Loading NBA props from: {NBA_PROPS_FILE}", flush=True)
+    df = _normalize_cols(_read_excel_anywhere(NBA_PROPS_FILE))
+    if "bookmakers" in df.columns:
+        df = df[~df["bookmakers"].str.lower().isin(NBA_PROPS_BAD_BOOKS)].copy()
+    return df
+
+
+def clear_nba_props_cache():
+    _forget_version(NBA_PROPS_FILE)
+    get_nba_props_df.cache_clear()
+
+
 # ---------------------------------------------------------
 # NFL FILE — ALWAYS LOAD FROM RAW GITHUB URL BY DEFAULT
 # ---------------------------------------------------------
@@ -106,12 +453,33 @@ NFL_PLAYER_COL = "player_display_name"
 NFL_DATE_COL = "week"
 NFL_LOCATION_COL = "location"
 
+# Game days per team and week, for rest days and short weeks (same file as the matchups page)
+NFL_SCHEDULE_FILE = os.getenv(
+    "NFL_SCHEDULE_FILE",
+    str(Path(__file__).resolve().parents[1] / "data" / "schedule.xlsx"),
+)
+
+
+@single_flight(maxsize=1)
+def get_nfl_team_weeks() -> pd.DataFrame | None:
+    """
+    Rest days, short weeks and byes of every scheduled team week
+    (schedule_features.schedule_team_weeks), or None if the schedule cannot
+    be read (rest days are then unknown).
+    """
+    try:
+        schedule = _read_excel_anywhere(NFL_SCHEDULE_FILE)
+    except Exception as e:
+        print(f"[data_store] No NFL schedule ({type(e).__name__}: {e}); rest days unknown", flush=True)
+        return None
+    return schedule_team_weeks(schedule)
+
 
-@lru_cache(maxsize=1)
-def get_nfl_df() -> pd.DataFrame:
+@single_flight(maxsize=1)
+def _get_nfl_file_df() -> pd.DataFrame:
     print(f"[data_store] Loading NFL stats from: {NFL_STATS_FILE}", flush=True)
     df = _read_parquet_anywhere(NFL_STATS_FILE)
-    df = _normalize_cols(df)
+    df = add_nfl_schedule_features(_normalize_cols(df), get_nfl_team_weeks(), NFL_DATE_COL)
 
     # Debug print — remove after confirming
     print("[data_store] NFL columns:", df.columns.tolist(), flush=True)
@@ -120,5 +488,97 @@ def get_nfl_df() -> pd.DataFrame:
     return df
 
 
+@single_flight(maxsize=None)
+def _get_nfl_season_df(season: int | None) -> pd.DataFrame:
+    if has_partitioned_store():
+        print(f"[data_store] Scanning NFL season {season} from: {GAMELOG_DATASET_ROOT}", flush=True)
+        df = scan_game_logs("nfl", seasons=[season] if season is not None else None)
+        df = add_nfl_schedule_features(df, get_nfl_team_weeks(), NFL_DATE_COL)
+    else:
+        df = _filter_season(_get_nfl_file_df(), season)
+    _LOADED_SEASONS["nfl"].add(season)
+    return df
+
+
+def nfl_seasons() -> list[int]:
+    if has_partitioned_store():
+        return partitioned_seasons("nfl")
+    return _file_seasons(_get_nfl_file_df())
+
+
+def get_nfl_df(season: int | None = None) -> pd.DataFrame:
+    """
+    NFL weekly player stats for one season. With `season=None` this is the
+    latest season in the partitioned store, or the whole file in single-file mode.
+    """
+    if season is None and has_partitioned_store():
+        seasons = nfl_seasons()
+        season = seasons[-1] if seasons else None
+    return _get_nfl_season_df(season)
+
+
+# Columns a single-player weekly lookup needs besides the stat itself
+NFL_PLAYER_LOOKUP_COLS = [NFL_PLAYER_COL, NFL_DATE_COL, "season", "team", NFL_LOCATION_COL]
+
+
+def get_nfl_player_df(player: str, stat_col: str | None = None, season: int | None = None) -> pd.DataFrame:
+    """
+    One player's weekly stats with only the lookup columns (plus `stat_col`)
+    and the schedule features. Served from memory when the full season is
+    already cached; otherwise only that player's row groups/partitions are
+    read (read_parquet_player_rows), so a cold worker can answer without
+    loading the whole file. The features of a cold lookup come from the
+    schedule.
+    """
+    columns = NFL_PLAYER_LOOKUP_COLS + ([stat_col] if stat_col else [])
+
+    if has_partitioned_store():
+        if season is None:
+            seasons = nfl_seasons()
+            season = seasons[-1] if seasons else None
+        if season not in _LOADED_SEASONS["nfl"]:
+            df = scan_game_logs(
+                "nfl",
+                seasons=[season] if season is not None else None,
+                player_col=NFL_PLAYER_COL,
+                players=[player],
+                columns=[c for c in dict.fromkeys(columns) if c in _gamelog_dataset("nfl").schema.names],
+            )
+            return add_nfl_schedule_features(df, get_nfl_team_weeks(), NFL_DATE_COL)
+    elif _get_nfl_file_df.cache_info().currsize == 0:
+        df = read_parquet_player_rows(NFL_STATS_FILE, NFL_PLAYER_COL, player, list(dict.fromkeys(columns)))
+        return add_nfl_schedule_features(_filter_season(df, season), get_nfl_team_weeks(), NFL_DATE_COL)
+
+    df = get_nfl_df(season)
+    columns += NFL_SCHEDULE_COLS
+    return df.loc[df[NFL_PLAYER_COL] == player, [c for c in dict.fromkeys(columns) if c in df.columns]]
+
+
 def clear_nfl_cache():
-    get_nfl_df.cache_clear()
+    _forget_version(NFL_STATS_FILE, _partition_root("nfl"), NFL_SCHEDULE_FILE)
+    local_copy.cache_clear()
+    get_nfl_team_weeks.cache_clear()
+    _get_nfl_file_df.cache_clear()
+    _get_nfl_season_df.cache_clear()
+    _LOADED_SEASONS["nfl"].clear()
+    _gamelog_dataset.cache_clear()
+
+
+# -----------------------------
+# Snapshot token for result caches
+# -----------------------------
+def _dataset_source(dataset: str) -> str:
+    if dataset in ("nba", "nfl"):
+        if has_partitioned_store():
+            return _partition_root(dataset)
+        return NBA_STATS_FILE if dataset == "nba" else NFL_STATS_FILE
+    return {"nba_impact": NBA_IMPACT_FILE, "nba_props": NBA_PROPS_FILE}[dataset]
+
+
+def data_snapshot(*datasets: str) -> str:
+    """
+    Token identifying the data behind a computation, e.g.
+    data_snapshot("nba") -> "nba=f1718000000000000-123456". Changes whenever
+    one of the datasets is reloaded with different contents.
+    """
+    return "|".join(f"{d}={source_version(_dataset_source(d))}" for d in datasets)
@@ -0,0 +1,32 @@
+# gunicorn settings for app:server
+#
+# Picked up automatically when gunicorn runs from src/; from the repo root:
+#     gunicorn --chdir src -c src/gunicorn.conf.py app:server
+# Command-line flags (--workers, --threads, --bind, ...) still override these.
+import os
+
+# Seconds a worker may go without a heartbeat before the master restarts it.
+# Warm-up beats after every dataset and replayed view, but a single cold
+# download or parquet load can take longer than gunicorn's default of 30.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def on_starting(server):
+    # Counters restart with the server: drop the previous run's per-worker
+    # metrics snapshots (see metrics.py).
+    import metrics
+
+    metrics.clear_snapshots()
+
+
+def post_worker_init(worker):
+    # Runs in each worker after app.py is imported and before it accepts
+    # connections, so no request lands on cold caches (see warmup.py).
+    # worker.notify is the heartbeat that keeps the master from timing the
+    # worker out while it warms up.
+    import background
+    import warmup
+
+    warmup.run_warmup(notify=worker.notify)
+    # no request threads yet: background jobs fork from here (background.py)
+    background.start_job_launcher()
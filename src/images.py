@@ -0,0 +1,227 @@
+# -----------------------------
+# Image thumbnails: pitcher photos + team logos
+# -----------------------------
+# Pitcher photos live on MLB_IMAGE_BASE (remote) and NFL logos in
+# assets/logos at whatever size they were saved. Both are served instead from
+# /img/<kind>/<hash>.webp: the source is read (remote ones fetched once into
+# IMAGE_CACHE_DIR), shrunk to the size its page shows (2x for high-DPI
+# screens), WebP-encoded and named by the hash of the encoded bytes. The URL
+# of a given image never changes content, so responses are cacheable for a
+# year; a new source image gets a new URL.
+#
+# The cache directory is shared by every worker on the host. image_src()
+# falls back to the original URL when an image cannot be fetched or decoded,
+# so a page never loses a picture it showed before.
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+from caching import single_flight
+
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sports_images")))
+IMAGE_ROUTE = os.getenv("IMAGE_ROUTE", "/img")
+# Longest side in pixels per kind (2x the size the pages display)
+THUMB_SIZES = {
+    "pitcher": int(os.getenv("IMAGE_PITCHER_PX", "140")),
+    "logo": int(os.getenv("IMAGE_LOGO_PX", "360")),
+}
+WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+IMAGE_FETCH_TIMEOUT_S = float(os.getenv("IMAGE_FETCH_TIMEOUT_S", "5"))
+# Unreachable images are retried after this many seconds, doubling up to an hour
+IMAGE_RETRY_S = float(os.getenv("IMAGE_RETRY_S", "60"))
+IMAGE_MAX_AGE_S = 365 * 86400
+
+LOGO_DIR = Path(__file__).resolve().parent / "assets" / "logos"
+LOGO_FORMATS = (".png", ".jpg")
+
+_HASHED_NAME = re.compile(r"^[0-9a-f]{20}\.webp$")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:20]
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _source_bytes(source: str) -> bytes:
+    """A local path's bytes, or a URL's from the cache (fetched on first use)."""
+    if not _is_remote(source):
+        return Path(source).read_bytes()
+
+    cached = IMAGE_CACHE_DIR / "src" / _digest(source)
+    if cached.exists():
+        return cached.read_bytes()
+
+    import requests
+
+    resp = requests.get(source, timeout=IMAGE_FETCH_TIMEOUT_S)
+    resp.raise_for_status()
+    _write_atomic(cached, resp.content)
+    return resp.content
+
+
+def _encode_webp(data: bytes, size: int) -> bytes:
+    from PIL import Image
+
+    with Image.open(BytesIO(data)) as im:
+        im = im.convert("RGBA" if "A" in im.getbands() or im.mode == "P" else "RGB")
+        im.thumbnail((size, size), Image.LANCZOS)  # never enlarges
+        out = BytesIO()
+        im.save(out, "WEBP", quality=WEBP_QUALITY, method=6)
+    return out.getvalue()
+
+
+def _is_remote(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def _ref(kind: str, source: str) -> Path:
+    """Where the thumbnail name for this source, size and quality is recorded."""
+    stamp = source
+    if not _is_remote(source):  # a local file that changes gets a new thumbnail
+        st = os.stat(source)
+        stamp = f"{source}|{st.st_mtime_ns}|{st.st_size}"
+    return IMAGE_CACHE_DIR / kind / "refs" / _digest(f"{stamp}|{THUMB_SIZES[kind]}|{WEBP_QUALITY}")
+
+
+def cached_thumbnail(kind: str, source: str) -> str | None:
+    """File name of an already built thumbnail of `source`, without building it."""
+    try:
+        name = _ref(kind, source).read_text().strip()
+    except OSError:
+        return None
+    return name if (IMAGE_CACHE_DIR / kind / name).exists() else None
+
+
+@single_flight(maxsize=None, backoff_base=IMAGE_RETRY_S, backoff_max=3600.0)
+def thumbnail(kind: str, source: str) -> str:
+    """
+    File name (<hash>.webp) of the thumbnail of `source` (a URL or local
+    path) in IMAGE_CACHE_DIR/<kind>, building it on first use on this host.
+    Raises if the source cannot be read or decoded.
+    """
+    name = cached_thumbnail(kind, source)
+    if name is not None:
+        return name
+
+    data = _encode_webp(_source_bytes(source), THUMB_SIZES[kind])
+    name = f"{hashlib.sha256(data).hexdigest()[:20]}.webp"
+    _write_atomic(IMAGE_CACHE_DIR / kind / name, data)
+    _write_atomic(_ref(kind, source), name.encode())
+    return name
+
+
+# thumbnails this process built or found (wait=False lookups), and when a
+# background build last failed, so selecting a picture costs a dict lookup
+_known = {}
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _build_in_background(kind: str, source: str):
+    with _pending_lock:
+        started = _pending.get((kind, source))
+        if started is not None and time.monotonic() - started < IMAGE_RETRY_S:
+            return
+        _pending[(kind, source)] = time.monotonic()
+
+    def build():
+        try:
+            _known[(kind, source)] = thumbnail(kind, source)
+        except Exception:
+            return  # logged by single_flight; retried after IMAGE_RETRY_S
+        with _pending_lock:
+            _pending.pop((kind, source), None)
+
+    threading.Thread(target=build, name="thumbnail", daemon=True).start()
+
+
+def image_src(kind: str, source: str, fallback: str | None = None, wait: bool = True) -> str:
+    """
+    The thumbnail URL for `source`, or `fallback` (default: source) if it
+    cannot be built. With wait=False a thumbnail not built yet is started in
+    a thread and the fallback returned, so a remote fetch never holds up the
+    caller; later calls get the thumbnail.
+    """
+    if not source:
+        return ""
+    fallback = source if fallback is None else fallback
+    if not wait:
+        key = (kind, source)
+        name = _known.get(key)
+        if name is None and key not in _pending:
+            name = cached_thumbnail(kind, source)  # perhaps built by another worker
+        if name is None:
+            _build_in_background(kind, source)
+            return fallback
+        _known[key] = name
+        return f"{IMAGE_ROUTE}/{kind}/{name}"
+    try:
+        return f"{IMAGE_ROUTE}/{kind}/{thumbnail(kind, source)}"
+    except Exception:
+        return fallback
+
+
+@single_flight(maxsize=None)
+def logo_file(team: str) -> Path | None:
+    """
+    The team's logo in assets/logos. Some teams are saved as both JPG and
+    PNG; the larger image wins, the PNG (transparent background) on a tie.
+    """
+    from PIL import Image
+
+    best, best_px = None, -1
+    for ext in LOGO_FORMATS:
+        path = LOGO_DIR / f"{team}{ext}"
+        if not path.exists():
+            continue
+        with Image.open(path) as im:  # reads the header only
+            px = im.width * im.height
+        if px > best_px:
+            best, best_px = path, px
+    return best
+
+
+def logo_src(team: str) -> str:
+    """Thumbnail URL of a team's logo; the asset URL if it cannot be built."""
+    from dash import get_asset_url
+
+    path = logo_file(team)
+    if path is not None:
+        try:
+            return f"{IMAGE_ROUTE}/logo/{thumbnail('logo', str(path))}"
+        except Exception:
+            pass
+    return get_asset_url(f"logos/{path.name if path is not None else team + '.jpg'}")
+
+
+def precompute_logos() -> dict:
+    """Builds every logo thumbnail (warm-up); team -> thumbnail URL."""
+    teams = sorted({p.stem for p in LOGO_DIR.iterdir() if p.suffix in LOGO_FORMATS})
+    return {team: logo_src(team) for team in teams}
+
+
+def register_image_routes(server):
+    """GET IMAGE_ROUTE/<kind>/<hash>.webp: a thumbnail, cacheable for a year."""
+    from flask import abort, send_from_directory
+
+    @server.route(f"{IMAGE_ROUTE}/<kind>/<name>")
+    def image(kind, name):
+        if kind not in THUMB_SIZES or not _HASHED_NAME.match(name):
+            abort(404)
+        resp = send_from_directory(IMAGE_CACHE_DIR / kind, name, mimetype="image/webp", max_age=IMAGE_MAX_AGE_S)
+        resp.cache_control.public = True
+        resp.cache_control.immutable = True
+        return resp
+
+    return image
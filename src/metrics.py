@@ -0,0 +1,450 @@
+# -----------------------------
+# Callback / loader instrumentation + Prometheus text exposition
+# -----------------------------
+# Dependency-free: a tiny Counter/Histogram registry rendered in the
+# Prometheus text format (version 0.0.4) on the Flask `/metrics` route.
+#
+# Values are per process. Each worker writes a snapshot of its registry to
+# METRICS_DIR every METRICS_FLUSH_SECONDS (and when it answers a scrape), and
+# /metrics sums the snapshots of every worker, so a scrape sees the whole
+# server whichever worker answers. Snapshots of exited workers are kept so
+# counters never go backwards; gunicorn.conf.py clears the directory when the
+# master starts. METRICS_DIR="" serves the answering process only.
+import atexit
+import glob
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Fraction of hot-path callback events written to the log (0 disables, 1 logs all)
+CALLBACK_LOG_SAMPLE_RATE = float(os.getenv("CALLBACK_LOG_SAMPLE_RATE", "0.01"))
+
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "sports_metrics"))
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _label_str(labels: tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # a background job forked while a request thread held the lock
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(map(list, key)), v] for key, v in self._values.items()]
+
+    @staticmethod
+    def merge(total: dict, snapshot: list):
+        for key, v in snapshot:
+            key = tuple(map(tuple, key))
+            total[key] = total.get(key, 0.0) + v
+
+    def render(self, values: dict) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, v in sorted(values.items()):
+            lines.append(f"{self.name}{_label_str(key)} {v:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(map(list, key)), list(series)] for key, series in self._series.items()]
+
+    @staticmethod
+    def merge(total: dict, snapshot: list):
+        for key, series in snapshot:
+            key = tuple(map(tuple, key))
+            current = total.get(key)
+            total[key] = list(series) if current is None else [a + b for a, b in zip(current, series)]
+
+    def render(self, values: dict) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(values.items()):
+            for upper, n in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_label_str(key + (('le', f'{upper:g}'),))} {n}")
+            lines.append(f"{self.name}_bucket{_label_str(key + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_label_str(key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(key)} {series[-1]}")
+        return lines
+
+
+# ---------- Registry ----------
+CALLBACK_LATENCY = Histogram(
+    "dash_callback_latency_seconds", "Dash callback wall time per callback id.", LATENCY_BUCKETS
+)
+CALLBACK_PAYLOAD = Histogram(
+    "dash_callback_payload_bytes", "Dash callback request (in) and response (out) body size.", BYTES_BUCKETS
+)
+CALLBACK_CALLS = Counter(
+    "dash_callback_calls_total", "Dash callback invocations by outcome (ok, no_update, error)."
+)
+LOADER_LATENCY = Histogram(
+    "data_loader_latency_seconds", "Cold load time of cached data loaders.", LATENCY_BUCKETS
+)
+LOADER_CALLS = Counter(
+    "data_loader_calls_total", "Cached data loader calls by result (hit, miss, wait, error)."
+)
+SHARED_CACHE_CALLS = Counter(
+    "shared_result_cache_calls_total", "Cross-worker result cache lookups by cache and result (hit, miss)."
+)
+
+_REGISTRY = [CALLBACK_LATENCY, CALLBACK_PAYLOAD, CALLBACK_CALLS, LOADER_LATENCY, LOADER_CALLS, SHARED_CACHE_CALLS]
+
+
+_COALESCING = "dash_callback_cache_total"
+_COALESCING_FIELDS = (("computed", "computed"), ("coalesced", "coalesced"), ("ttl_hit", "ttl_hits"))
+
+
+def _coalescing_snapshot() -> list:
+    # Result-cache / coalescing counters live in caching.py; exported here so
+    # cache hit rates sit next to the callback latencies.
+    from caching import coalescing_stats
+
+    return [
+        [[["function", fn], ["result", result]], stats[field]]
+        for fn, stats in coalescing_stats().items()
+        for result, field in _COALESCING_FIELDS
+    ]
+
+
+def _process_snapshot() -> dict:
+    snap = {metric.name: metric.snapshot() for metric in _REGISTRY}
+    snap[_COALESCING] = _coalescing_snapshot()
+    return snap
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"worker-{pid}.json")
+
+
+def flush_snapshot() -> None:
+    """Writes this process's registry to METRICS_DIR (atomically)."""
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = _snapshot_path(os.getpid())
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(_process_snapshot(), f)
+    os.replace(tmp, path)
+
+
+def clear_snapshots() -> None:
+    """Removes every worker snapshot (gunicorn master start)."""
+    if not METRICS_DIR:
+        return
+    for path in glob.glob(os.path.join(METRICS_DIR, "worker-*.json")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_flusher = {"pid": None}
+_flusher_lock = threading.Lock()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            flush_snapshot()
+        except OSError as e:
+            print(f"[metrics] Snapshot flush failed ({type(e).__name__}: {e})", flush=True)
+
+
+def start_flusher() -> None:
+    """Starts this process's snapshot thread (once per process)."""
+    if not METRICS_DIR:
+        return
+    with _flusher_lock:
+        if _flusher["pid"] == os.getpid():
+            return
+        _flusher["pid"] = os.getpid()
+    threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+def _server_snapshots() -> list[dict]:
+    try:
+        flush_snapshot()
+    except OSError:
+        return [_process_snapshot()]
+    if not METRICS_DIR:
+        return [_process_snapshot()]
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_DIR, "worker-*.json")):
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # being replaced or removed
+    return snapshots
+
+
+def render_prometheus() -> str:
+    snapshots = _server_snapshots()
+    lines = []
+    for metric in _REGISTRY:
+        values = {}
+        for snap in snapshots:
+            metric.merge(values, snap.get(metric.name, []))
+        lines.extend(metric.render(values))
+
+    coalescing = {}
+    for snap in snapshots:
+        Counter.merge(coalescing, snap.get(_COALESCING, []))
+    lines.extend(Counter(
+        _COALESCING, "Coalesced callback results by source (computed, coalesced, ttl_hit)."
+    ).render(coalescing))
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Sampled structured logging
+# -----------------------------
+def sampled_log(event: str, sample_rate: float | None = None, **fields):
+    """
+    Writes one JSON line for `event` with probability `sample_rate`
+    (CALLBACK_LOG_SAMPLE_RATE by default). Use on hot paths instead of print.
+    """
+    rate = CALLBACK_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return
+    record = {"ts": round(time.time(), 3), "event": event, "sample_rate": rate, **fields}
+    print(json.dumps(record, default=str), flush=True)
+
+
+# -----------------------------
+# Daily view log (what users look at; read by warmup.py)
+# -----------------------------
+# One JSON line per cached-callback call: function id and raw inputs. Files
+# are per UTC day, appended by every worker; warm-up precomputes the most
+# viewed results from the previous day's file. Calls only queue the view in
+# memory: a background thread appends the queue every VIEW_LOG_FLUSH_S (and
+# at exit), so a cache hit never waits on the disk.
+VIEW_LOG_DIR = os.getenv("VIEW_LOG_DIR", os.path.join(tempfile.gettempdir(), "sports_views"))
+VIEW_LOG_KEEP_DAYS = int(os.getenv("VIEW_LOG_KEEP_DAYS", "7"))
+VIEW_LOG_FLUSH_S = float(os.getenv("VIEW_LOG_FLUSH_S", "5"))
+# Views queued beyond this between flushes drop the oldest
+VIEW_LOG_BUFFER_MAX = int(os.getenv("VIEW_LOG_BUFFER_MAX", "20000"))
+
+
+def view_log_path(day: str | None = None) -> str:
+    """Path of the view log for `day` (YYYY-MM-DD, UTC; default today)."""
+    day = day or time.strftime("%Y-%m-%d", time.gmtime())
+    return os.path.join(VIEW_LOG_DIR, f"views-{day}.jsonl")
+
+
+_view_log_paused = threading.local()
+_view_queue = deque(maxlen=VIEW_LOG_BUFFER_MAX)
+_view_flusher = {"pid": None}
+_view_flusher_lock = threading.Lock()
+
+
+@contextmanager
+def views_not_logged():
+    """Calls made inside (e.g. warm-up replays) are not user views."""
+    _view_log_paused.on = True
+    try:
+        yield
+    finally:
+        _view_log_paused.on = False
+
+
+def log_view(fn_id: str, args) -> None:
+    if not VIEW_LOG_DIR or getattr(_view_log_paused, "on", False):
+        return
+    _view_queue.append((time.time(), fn_id, args))
+    if _view_flusher["pid"] != os.getpid():
+        _start_view_flusher()
+
+
+def _start_view_flusher():
+    with _view_flusher_lock:
+        if _view_flusher["pid"] == os.getpid():
+            return
+        _view_flusher["pid"] = os.getpid()
+    threading.Thread(target=_flush_views_loop, name="view-log-flush", daemon=True).start()
+
+
+def _flush_views_loop():
+    while True:
+        time.sleep(VIEW_LOG_FLUSH_S)
+        flush_views()
+
+
+def flush_views() -> None:
+    """Appends the queued views to their day's view log."""
+    by_day = {}
+    while True:
+        try:
+            ts, fn_id, args = _view_queue.popleft()
+        except IndexError:
+            break
+        try:
+            line = json.dumps({"ts": round(ts, 3), "fn": fn_id, "args": list(args)})
+        except (TypeError, ValueError):
+            continue
+        by_day.setdefault(time.strftime("%Y-%m-%d", time.gmtime(ts)), []).append(line + "\n")
+    for day, lines in by_day.items():
+        try:
+            os.makedirs(VIEW_LOG_DIR, exist_ok=True)
+            with open(view_log_path(day), "a") as f:
+                f.write("".join(lines))
+        except OSError:
+            pass
+
+
+def _after_fork():
+    # a forked child (job launcher, background job) does not own the
+    # parent's queued views; it starts its own flusher on its first view
+    global _view_flusher_lock
+    _view_queue.clear()
+    _view_flusher_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(flush_views)
+
+
+# -----------------------------
+# Dash callback instrumentation
+# -----------------------------
+def _instrument(callback_id: str, func):
+    if getattr(func, "_metrics_wrapped", False):
+        return func
+
+    from dash.exceptions import PreventUpdate
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        outcome = "ok"
+        try:
+            result = func(*args, **kwargs)
+        except PreventUpdate:
+            outcome = "no_update"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            CALLBACK_LATENCY.observe(time.perf_counter() - t0, callback=callback_id)
+            CALLBACK_CALLS.inc(callback=callback_id, outcome=outcome)
+        return result
+
+    wrapper._metrics_wrapped = True
+    return wrapper
+
+
+def instrument_callbacks(dash_app) -> int:
+    """
+    Wraps every registered Dash callback (global `@callback`s and app
+    callbacks) with latency/payload/outcome metrics. Call once after all
+    callback modules are imported. Returns the number of callbacks wrapped.
+    """
+    from dash import _callback
+
+    wrapped = 0
+    for callback_map in (_callback.GLOBAL_CALLBACK_MAP, dash_app.callback_map):
+        for callback_id, spec in callback_map.items():
+            func = spec.get("callback")
+            if func is None or getattr(func, "_metrics_wrapped", False):
+                continue
+            spec["callback"] = _instrument(callback_id, func)
+            wrapped += 1
+    print(f"[metrics] Instrumented {wrapped} Dash callbacks", flush=True)
+    return wrapped
+
+
+def register_payload_hook(server, dash_app):
+    """
+    Records CALLBACK_PAYLOAD from the request and response of every Dash
+    callback dispatch: the sizes Flask already knows, labelled with the
+    callback's output id, so no callback result is serialized twice.
+    """
+    from flask import request
+
+    dispatch_path = dash_app.config.requests_pathname_prefix + "_dash-update-component"
+
+    @server.after_request
+    def record_callback_payload(response):
+        if request.path != dispatch_path or request.method != "POST":
+            return response
+        body = request.get_json(silent=True) or {}
+        callback_id = body.get("output")
+        if callback_id is None:
+            return response
+        if request.content_length is not None:
+            CALLBACK_PAYLOAD.observe(request.content_length, callback=callback_id, direction="in")
+        if response.content_length is not None:
+            CALLBACK_PAYLOAD.observe(response.content_length, callback=callback_id, direction="out")
+        return response
+
+    return record_callback_payload
+
+
+def register_metrics_route(server, path: str = "/metrics"):
+    from flask import Response
+
+    start_flusher()
+
+    @server.route(path)
+    def prometheus_metrics():
+        return Response(render_prometheus(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    return prometheus_metrics
@@ -1,7 +1,21 @@
 # mlb_data.py
+import fcntl
+import hashlib
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
 import pandas as pd
 
+from caching import single_flight
+from odds import add_price_columns
+
 # -------------------------------------------------
 # CONFIG: data sources + image base
 # -------------------------------------------------
@@ -18,6 +32,7 @@ MLB_IMAGE_BASE = os.getenv(
 PITCHER_SEASON_STATS_URL = f"{DATA_BASE_RAW}/Pitcher_Season_Stats.xlsx"
 HIST_STARTING_PITCHERS_URL = f"{DATA_BASE_RAW}/Historical_Starting_Pitchers.xlsx"
 PITCHING_LOGS_URL = f"{DATA_BASE_RAW}/2025_Pitching_Logs.xlsx"
+HITTING_LOGS_URL = f"{DATA_BASE_RAW}/2025_Hitting_Logs.xlsx"
 SEASON_SPLITS_URL = f"{DATA_BASE_RAW}/Season_Aggregated_Pitcher_Statistics.xlsx"
 PITCHER_PCT_URL = f"{DATA_BASE_RAW}/Pitcher_Percentile_Rankings.csv"
 LAST_WEEK_URL = f"{DATA_BASE_RAW}/Last_Week_Stats.xlsx"
@@ -27,107 +42,601 @@ DAILY_PROPS_URL = f"{DATA_BASE_RAW}/Daily_Props.xlsx"
 MY_PITCHER_LIST_URL = f"{DATA_BASE_RAW}/My_Pitcher_Listing.xlsx"
 MY_HITTER_LIST_URL = f"{DATA_BASE_RAW}/My_Hitter_Listing.xlsx"
 
+
+# a props line: every book's over/under price on it is compared (odds.add_price_columns)
+PROP_LINE_COLS = ["Player", "market", "Line"]
+
+# one row per hitter per game; optional (the hot-hitters page falls back to Last_Week_Stats)
+HITTING_LOG_COLS = ["Name", "Date", "PA", "AB", "H", "2B", "3B", "HR", "BB", "HBP", "SF", "SO"]
+
 # -------------------------------------------------
-# LOAD DATA (module import time = once per server start)
+# PLAYER CROSSWALK: one integer key per player across sources
 # -------------------------------------------------
-df = pd.read_excel(PITCHER_SEASON_STATS_URL, usecols=["Name", "W", "L", "ERA", "IP", "SO", "WHIP", "GS"])
-df["K/IP"] = (df["SO"] / df["IP"]).round(2)
-df["WHIP"] = df["WHIP"].round(2)
+# Sources spell the same player differently ("Last, First" in the Savant
+# percentile files, accents, punctuation, ...). Every spelling is normalized
+# once and mapped to an integer player_key; frames are joined and filtered on
+# those keys instead of on raw names. Suffixes stay in the key: "Luis Garcia
+# Jr." and "Luis García" are two different players.
+KEY_COLS = ["player_key", "pitcher_key"]
 
-dfPitchers = pd.read_excel(
-    HIST_STARTING_PITCHERS_URL,
-    usecols=["Baseball_Savant_Name", "Savant ID", "Handedness"]
-).dropna()
+_NAME_SUFFIX = r"(?:jr|sr|ii|iii|iv)"
 
-df = df.merge(dfPitchers, left_on="Name", right_on="Baseball_Savant_Name", how="left")
-df = df[["Name", "Baseball_Savant_Name", "Handedness", "GS", "W", "L", "ERA", "IP", "SO", "K/IP", "WHIP"]]
 
-dfGameLogs = pd.read_excel(
-    PITCHING_LOGS_URL,
-    usecols=["Name", "Date", "Opp", "W", "L", "IP", "BF", "H", "R", "ER", "HR", "BB", "SO", "Pit"]
-)
-dfGameLogs["Date"] = pd.to_datetime(dfGameLogs["Date"], format="%Y-%m-%d").dt.date
-dfGameLogs = dfGameLogs.rename(columns={"Opp": "Opponent"}).sort_values(by="Date", ascending=False)
-
-dfS = pd.read_excel(SEASON_SPLITS_URL)
-dfSplits = pd.melt(
-    dfS,
-    id_vars=["Pitcher", "Team", "Handedness", "Opposing Team", "Name", "Rotowire Name", "Split", "Baseball Savant Name", "Tm"],
-    var_name="Statistic",
-    value_name="Value",
-)
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Vectorized canonical spelling: "Acuña Jr., Ronald" -> "ronald acuna jr"."""
+    s = names.astype("string")
+    s = s.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").astype("string")
+    # "Garcia, Jr." / "Garcia, Jr., Luis": the suffix belongs to the last name
+    s = s.str.lower().str.replace(r",\s*(" + _NAME_SUFFIX + r")\.?\s*(,|$)", r" \1\2", regex=True)
+    s = s.str.replace(r"^\s*([^,]+?)\s*,\s*(.+?)\s*$", r"\2 \1", regex=True)  # "Last, First"
+    s = s.str.replace("[.'`\u2019]", "", regex=True).str.replace("-", " ", regex=False)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def build_player_crosswalk(sources: dict) -> pd.DataFrame:
+    """
+    source -> name column in, one row per (source, spelling) out with its
+    name_key and integer player_key. Keys are the rank of name_key, so they
+    are stable for the same set of players.
+    """
+    cw = pd.concat(
+        [pd.DataFrame({"source": src, "name": pd.unique(names.dropna())}) for src, names in sources.items()],
+        ignore_index=True,
+    )
+    cw["name_key"] = normalize_names(cw["name"]).to_numpy(dtype=object)
+    keys = np.sort(cw["name_key"].unique())
+    cw["player_key"] = np.searchsorted(keys, cw["name_key"].to_numpy()).astype("int64")
+    return cw
+
+
+def _key_lookup(crosswalk: pd.DataFrame):
+    """names -> Int64 player keys (one name -> int or None), for any spelling in the crosswalk."""
+    key_of = dict(zip(crosswalk["name"], crosswalk["player_key"].tolist()))
+
+    def keys(names):
+        if isinstance(names, str):
+            return key_of.get(names)
+        return names.map(key_of).astype("Int64")
+
+    return keys
+
+
+def _merge_keyed(left, right, left_name, right_name, keys, on=(), **kwargs):
+    """
+    left.merge(right) matching left[left_name] and right[right_name] by
+    player key (plus `on`). A name column both sides share is kept once,
+    from the left, as merging on it would.
+    """
+    right = right.assign(_key=keys(right[right_name]))
+    if right_name == left_name:
+        right = right.drop(columns=right_name)
+    return (
+        left.assign(_key=keys(left[left_name]))
+        .merge(right, on=["_key", *on], **kwargs)
+        .drop(columns="_key")
+    )
+
+
+# -------------------------------------------------
+# SOURCES: every file the MLB pages read
+# -------------------------------------------------
+# name -> (file, reader, read kwargs). Each is fetched and parsed on its own,
+# so a refresh re-reads only the files whose content changed.
+MLB_SOURCES = {
+    "pitcher_season": (PITCHER_SEASON_STATS_URL, pd.read_excel,
+                       {"usecols": ["Name", "W", "L", "ERA", "IP", "SO", "WHIP", "GS"]}),
+    "starting_pitchers": (HIST_STARTING_PITCHERS_URL, pd.read_excel,
+                          {"usecols": ["Baseball_Savant_Name", "Savant ID", "Handedness"]}),
+    "pitching_logs": (PITCHING_LOGS_URL, pd.read_excel,
+                      {"usecols": ["Name", "Date", "Opp", "W", "L", "IP", "BF", "H", "R", "ER", "HR", "BB", "SO", "Pit"]}),
+    "hitting_logs": (HITTING_LOGS_URL, pd.read_excel, {"usecols": HITTING_LOG_COLS}),
+    "pitcher_splits": (SEASON_SPLITS_URL, pd.read_excel, {}),
+    "pitcher_percentiles": (PITCHER_PCT_URL, pd.read_csv, {}),
+    "last_week": (LAST_WEEK_URL, pd.read_excel, {}),
+    "daily": (DAILY_COMBINED_URL, pd.read_excel, {}),
+    "hitter_percentiles": (HITTER_PCT_URL, pd.read_csv, {
+        "usecols": ["player_name", "xwoba", "xba", "xslg", "xiso", "xobp", "brl_percent",
+                    "exit_velocity", "hard_hit_percent", "k_percent", "bb_percent", "whiff_percent", "chase_percent"]
+    }),
+    "props": (DAILY_PROPS_URL, pd.read_excel, {}),
+    "props_pitchers": (MY_PITCHER_LIST_URL, pd.read_excel, {"usecols": ["Props Name", "mlb_team_long"]}),
+    "props_hitters": (MY_HITTER_LIST_URL, pd.read_excel, {"usecols": ["Props Name", "mlb_team_long"]}),
+}
+# may be missing or unreadable: their frame is None instead of failing the load
+OPTIONAL_SOURCES = {"hitting_logs"}
+
+MLB_FETCH_TIMEOUT_S = float(os.getenv("MLB_FETCH_TIMEOUT_S", "60"))
+MLB_FETCH_WORKERS = int(os.getenv("MLB_FETCH_WORKERS", "4"))
+# Parsed frames shared by every process on the host, by source and content:
+# the first process to parse a file (a worker, or the background job of a
+# first MLB page visit) writes it, the others wait for it and read the
+# pickle instead of parsing the spreadsheet again. "" parses in every process.
+MLB_FRAME_CACHE_DIR = os.getenv("MLB_FRAME_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sports_mlb_frames"))
+
+
+def _is_remote(path: str) -> bool:
+    return path.startswith(("http://", "https://"))
+
+
+def _fetch(path: str, previous):
+    """
+    (stamp, bytes) of a source, or (stamp, None) when it has not changed
+    since `previous` was read: same ETag for a URL (the server answers 304),
+    same mtime and size for a local file.
+    """
+    if _is_remote(path):
+        import requests
 
-dfpct = pd.read_csv(PITCHER_PCT_URL).rename(columns={
-    "xera": "Expected ERA",
-    "xba": "Expected Batting Avg",
-    "fb_velocity": "Fastball Velo",
-    "exit_velocity": "Avg Exit Velocity",
-    "k_percent": "K %",
-    "chase_percent": "Chase %",
-    "whiff_percent": "Whiff %",
-    "brl_percent": "Barrel %",
-    "hard_hit_percent": "Hard-Hit %",
-    "bb_percent": "BB %",
-}).drop(columns=["year"], errors="ignore")
-
-# keep your suffix scheme
-dfpct = dfpct.rename(columns=lambda x: x + "_pitcher")
-dfpct = dfpct[
-    [
-        "player_name_pitcher", "player_id_pitcher",
-        "Expected ERA_pitcher", "Expected Batting Avg_pitcher", "Fastball Velo_pitcher",
-        "Avg Exit Velocity_pitcher", "Chase %_pitcher", "Whiff %_pitcher", "K %_pitcher",
-        "BB %_pitcher", "Barrel %_pitcher", "Hard-Hit %_pitcher",
+        headers = {"User-Agent": "dash-app", "Accept": "application/octet-stream"}
+        if previous is not None and previous.stamp:
+            headers["If-None-Match"] = previous.stamp
+        resp = requests.get(path, headers=headers, timeout=MLB_FETCH_TIMEOUT_S)
+        if resp.status_code == 304 and previous is not None:
+            return previous.stamp, None
+        resp.raise_for_status()
+        return resp.headers.get("ETag", ""), resp.content
+
+    st = os.stat(path)
+    stamp = f"{st.st_mtime_ns}-{st.st_size}"
+    if previous is not None and previous.stamp == stamp:
+        return stamp, None
+    with open(path, "rb") as f:
+        return stamp, f.read()
+
+
+def _read_source(name: str, previous):
+    """
+    The source's stamp, content digest and parsed frame. The previous frame
+    is reused unless the bytes' sha1 changed.
+    """
+    path, reader, kwargs = MLB_SOURCES[name]
+    try:
+        stamp, data = _fetch(path, previous)
+        if data is None:
+            return previous
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        if previous is not None and previous.digest == digest:
+            return SimpleNamespace(stamp=stamp, digest=digest, frame=previous.frame)
+        frame = _parse(name, digest, data, reader, kwargs)
+    except Exception as e:
+        if name not in OPTIONAL_SOURCES:
+            raise
+        if previous is not None:
+            # a failed re-read keeps the copy already loaded
+            print(f"[mlb_data] Keeping the loaded {name} ({type(e).__name__}: {e})", flush=True)
+            return previous
+        print(f"[mlb_data] No {name} ({type(e).__name__}: {e})", flush=True)
+        return SimpleNamespace(stamp="", digest="missing", frame=None)
+    return SimpleNamespace(stamp=stamp, digest=digest, frame=frame)
+
+
+def _parse(name: str, digest: str, data: bytes, reader, kwargs: dict) -> pd.DataFrame:
+    """reader(data), through the host's frame cache (MLB_FRAME_CACHE_DIR)."""
+    if not MLB_FRAME_CACHE_DIR:
+        return reader(BytesIO(data), **kwargs)
+
+    cache_dir = Path(MLB_FRAME_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(f"{digest}|{sorted(kwargs.items())!r}|{pd.__version__}".encode()).hexdigest()[:16]
+    path = cache_dir / f"{name}-{key}.pkl"
+    # one parser per source on the host; the lock dies with a cancelled job
+    with open(cache_dir / f"{name}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if path.exists():
+                try:
+                    return pd.read_pickle(path)
+                except Exception as e:  # truncated or from another pandas: parse again
+                    print(f"[mlb_data] Ignoring cached {path.name} ({type(e).__name__}: {e})", flush=True)
+            frame = reader(BytesIO(data), **kwargs)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=path.name + ".", suffix=".part")
+            os.close(fd)
+            try:
+                frame.to_pickle(tmp)
+                os.replace(tmp, path)
+            except OSError:
+                Path(tmp).unlink(missing_ok=True)
+                return frame
+            for old in cache_dir.glob(f"{name}-*.pkl"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+            return frame
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# -------------------------------------------------
+# LOAD DATA (lazily, on first use — never at import time)
+# -------------------------------------------------
+def read_mlb_sources(old: dict | None = None) -> dict:
+    """
+    Source name -> (stamp, digest, frame). Given the sources of the previous
+    snapshot, only those whose content changed are parsed again.
+    """
+    old = old or {}
+    with ThreadPoolExecutor(MLB_FETCH_WORKERS, thread_name_prefix="mlb-fetch") as pool:
+        read = pool.map(lambda name: _read_source(name, old.get(name)), MLB_SOURCES)
+        return dict(zip(MLB_SOURCES, read))
+
+
+def load_mlb_data(sources: dict | None = None, changed: list | None = None) -> SimpleNamespace:
+    """
+    Reads every MLB source (unless `sources` already holds them) and derives
+    the frames used by the MLB pages.
+    """
+    if sources is None:
+        print(f"[mlb_data] Loading MLB data from: {DATA_BASE_RAW}", flush=True)
+        sources = read_mlb_sources()
+    mlb = derive_mlb_data({name: src.frame for name, src in sources.items()})
+    mlb.sources = sources
+    mlb.changed = list(sources) if changed is None else changed
+    # the content of every source: equal in every worker that read the same files
+    mlb.version = hashlib.sha1("|".join(src.digest for src in sources.values()).encode()).hexdigest()[:12]
+    return mlb
+
+
+def derive_mlb_data(frames: dict) -> SimpleNamespace:
+    """
+    Every MLB frame the pages use, from the parsed sources (source name ->
+    frame). The inputs are not modified; they are kept for the next refresh.
+    """
+    frames = {name: (frame.copy() if frame is not None else None) for name, frame in frames.items()}
+    df = frames["pitcher_season"]
+    dfPitchers = frames["starting_pitchers"].dropna()
+    dfGameLogs = frames["pitching_logs"]
+    dfHittingLogs = frames["hitting_logs"]
+    if dfHittingLogs is None:
+        print("[mlb_data] No hitting logs; hot hitters use last week's stats", flush=True)
+    dfS = frames["pitcher_splits"]
+    dfpct = frames["pitcher_percentiles"]
+    dfLast7 = frames["last_week"]
+    dfDaily = frames["daily"]
+    df_hitter_pct = frames["hitter_percentiles"]
+    df_props = frames["props"]
+    df_pitchers = frames["props_pitchers"]
+    df_hitters = frames["props_hitters"]
+
+    players = build_player_crosswalk({
+        "pitcher_season": df["Name"],
+        "starting_pitchers": dfPitchers["Baseball_Savant_Name"],
+        "pitching_logs": dfGameLogs["Name"],
+        "pitcher_splits": dfS["Baseball Savant Name"],
+        "pitcher_percentiles": dfpct["player_name"],
+        "last_week": dfLast7["Name"],
+        "hitting_logs": dfHittingLogs["Name"] if dfHittingLogs is not None else pd.Series(dtype=object),
+        "daily_hitters": dfDaily["Savant Name"],
+        "daily_pitchers": dfDaily["Baseball Savant Name"],
+        "daily_props_names": dfDaily["Props Name"],
+        "hitter_percentiles": df_hitter_pct["player_name"],
+        "props": df_props["Player"],
+        "props_pitchers": df_pitchers["Props Name"],
+        "props_hitters": df_hitters["Props Name"],
+    })
+    keys = _key_lookup(players)
+
+    df["K/IP"] = (df["SO"] / df["IP"]).round(2)
+    df["WHIP"] = df["WHIP"].round(2)
+
+    dfPitchers["player_key"] = keys(dfPitchers["Baseball_Savant_Name"])
+
+    df = _merge_keyed(df, dfPitchers, "Name", "Baseball_Savant_Name", keys, how="left")
+    df = df[["Name", "Baseball_Savant_Name", "Handedness", "GS", "W", "L", "ERA", "IP", "SO", "K/IP", "WHIP"]]
+    df = df.assign(player_key=keys(df["Name"]))
+
+    dfGameLogs["Date"] = pd.to_datetime(dfGameLogs["Date"], format="%Y-%m-%d").dt.date
+    dfGameLogs = dfGameLogs.rename(columns={"Opp": "Opponent"}).sort_values(by="Date", ascending=False)
+    dfGameLogs["player_key"] = keys(dfGameLogs["Name"])
+
+    dfSplits = pd.melt(
+        dfS,
+        id_vars=["Pitcher", "Team", "Handedness", "Opposing Team", "Name", "Rotowire Name", "Split", "Baseball Savant Name", "Tm"],
+        var_name="Statistic",
+        value_name="Value",
+    )
+    dfSplits["player_key"] = keys(dfSplits["Baseball Savant Name"])
+
+    dfpct = dfpct.rename(columns={
+        "xera": "Expected ERA",
+        "xba": "Expected Batting Avg",
+        "fb_velocity": "Fastball Velo",
+        "exit_velocity": "Avg Exit Velocity",
+        "k_percent": "K %",
+        "chase_percent": "Chase %",
+        "whiff_percent": "Whiff %",
+        "brl_percent": "Barrel %",
+        "hard_hit_percent": "Hard-Hit %",
+        "bb_percent": "BB %",
+    }).drop(columns=["year"], errors="ignore")
+
+    # keep your suffix scheme
+    dfpct = dfpct.rename(columns=lambda x: x + "_pitcher")
+    dfpct = dfpct[
+        [
+            "player_name_pitcher", "player_id_pitcher",
+            "Expected ERA_pitcher", "Expected Batting Avg_pitcher", "Fastball Velo_pitcher",
+            "Avg Exit Velocity_pitcher", "Chase %_pitcher", "Whiff %_pitcher", "K %_pitcher",
+            "BB %_pitcher", "Barrel %_pitcher", "Hard-Hit %_pitcher",
+        ]
     ]
-]
 
-dfpct_chart = dfpct.rename(columns=lambda x: x.replace("_pitcher", "")).rename(
-    columns={"player_name": "player_name", "player_id": "player_id"}
-)
-dfpct_reshaped = pd.melt(dfpct_chart, id_vars=["player_name", "player_id"], var_name="Statistic", value_name="Percentile")
+    dfpct_chart = dfpct.rename(columns=lambda x: x.replace("_pitcher", "")).rename(
+        columns={"player_name": "player_name", "player_id": "player_id"}
+    )
+    dfpct_reshaped = pd.melt(dfpct_chart, id_vars=["player_name", "player_id"], var_name="Statistic", value_name="Percentile")
 
-def convert_name(name: str) -> str:
-    last_name, first_name = name.split(", ")
-    return f"{first_name} {last_name}"
+    dfpct_reshaped["converted_name"] = dfpct_reshaped["player_name"].str.replace(r"^(.*?), (.*)$", r"\2 \1", regex=True)
+    dfpct_reshaped["player_key"] = keys(dfpct_reshaped["player_name"])
 
-dfpct_reshaped["converted_name"] = dfpct_reshaped["player_name"].apply(convert_name)
+    dfHot = dfLast7.query("PA>=20 & BA>=.350")
 
-dfLast7 = pd.read_excel(LAST_WEEK_URL)
-dfHot = dfLast7.query("PA>=20 & BA>=.350")
+    if dfHittingLogs is not None:
+        dfHittingLogs["Date"] = pd.to_datetime(dfHittingLogs["Date"]).dt.normalize()
+        dfHittingLogs["player_key"] = keys(dfHittingLogs["Name"])
 
-dfLastWeek = dfLast7[["Name", "BA"]].rename(columns={"BA": "Last Week Average"})
+    dfLastWeek = dfLast7[["Name", "BA"]].rename(columns={"BA": "Last Week Average"})
 
-dfDaily = pd.read_excel(DAILY_COMBINED_URL)
+    dfDaily["player_key"] = keys(dfDaily["Savant Name"])
+    dfDaily["pitcher_key"] = keys(dfDaily["Baseball Savant Name"])
 
-dfHitters = dfDaily[
-    ["fg_name", "Savant Name", "Bats", "Batting Order", "Average", "wOBA",
-     "ISO", "K%", "BB%", "Fly Ball %", "Hard Contact %", "Pitcher", "Baseball Savant Name"]
-]
+    dfHitters = dfDaily[
+        ["fg_name", "Savant Name", "Bats", "Batting Order", "Average", "wOBA",
+         "ISO", "K%", "BB%", "Fly Ball %", "Hard Contact %", "Pitcher", "Baseball Savant Name", "pitcher_key"]
+    ]
+
+    df_hitter_pct = df_hitter_pct.rename(columns=lambda x: x + "_hitter")
+
+    dfHittersFinal = _merge_keyed(dfHitters, dfLastWeek, "Savant Name", "Name", keys, how="left").drop(columns=["Name"], errors="ignore")
+
+    dfHitterMerge = _merge_keyed(dfDaily, df_hitter_pct, "Savant Name", "player_name_hitter", keys, how="left")
+    dfFinalMatchup = _merge_keyed(
+        dfHitterMerge,
+        dfpct,
+        "Baseball Savant Name",
+        "player_name_pitcher",
+        keys,
+        how="left",
+        suffixes=["_Hitter", "_Pitcher"],
+    )
+
+    df_players = pd.concat([df_pitchers, df_hitters], ignore_index=True)
+    df_daily_props = _merge_keyed(df_props, df_players, "Player", "Props Name", keys, how="left").dropna(subset=["mlb_team_long"])
+    df_daily_props = add_price_columns(df_daily_props, PROP_LINE_COLS)
+    df_props_matchup = _merge_keyed(
+        df_daily_props,
+        dfFinalMatchup,
+        "Props Name",
+        "Props Name",
+        keys,
+        on=["mlb_team_long"],
+        how="left",
+    )
+    df_daily_props = df_daily_props.assign(player_key=keys(df_daily_props["Player"]))
+    df_props_matchup["player_key"] = keys(df_props_matchup["Player"])
+
+    print(
+        f"[mlb_data] Loaded pitchers={len(df):,} hitters={len(dfHittersFinal):,} props={len(df_daily_props):,} "
+        f"players={players['player_key'].nunique():,}",
+        flush=True,
+    )
+
+    return SimpleNamespace(
+        df=df,
+        dfPitchers=dfPitchers,
+        dfGameLogs=dfGameLogs,
+        dfSplits=dfSplits,
+        dfpct=dfpct,
+        dfpct_reshaped=dfpct_reshaped,
+        dfHot=dfHot,
+        dfLast7=dfLast7,
+        dfHittingLogs=dfHittingLogs,
+        dfLastWeek=dfLastWeek,
+        dfDaily=dfDaily,
+        dfHittersFinal=dfHittersFinal,
+        dfFinalMatchup=dfFinalMatchup,
+        df_daily_props=df_daily_props,
+        df_props_matchup=df_props_matchup,
+        players=players,
+        player_keys=keys,
+        # per-snapshot structures built from the frames above (mlb_derived)
+        derived={},
+    )
+
+
+# -------------------------------------------------
+# CURRENT SNAPSHOT: read through get_mlb_data(), replaced whole by a refresh
+# -------------------------------------------------
+# A refresh builds the new snapshot (and every mlb_derived structure) off to
+# the side while requests keep reading the old one, then swaps it in with a
+# single assignment. A request that holds a snapshot keeps a consistent view
+# until it finishes; the next one gets the new data. The worker that
+# refreshes bumps the "mlb" generation, and every other worker on the host
+# notices within MLB_GENERATION_CHECK_S and refreshes itself in a thread.
+# A failed background refresh is retried after MLB_GENERATION_CHECK_S,
+# doubling per consecutive failure up to MLB_REFRESH_BACKOFF_MAX_S.
+MLB_GENERATION_CHECK_S = float(os.getenv("MLB_GENERATION_CHECK_S", "5"))
+MLB_REFRESH_BACKOFF_MAX_S = float(os.getenv("MLB_REFRESH_BACKOFF_MAX_S", "300"))
+# also re-check the sources this often (0 = only on /admin/mlb/refresh)
+MLB_REFRESH_INTERVAL_S = float(os.getenv("MLB_REFRESH_INTERVAL_S", "0"))
+
+_current = [None]
+_refresh_lock = threading.Lock()
+# generation last acted on, when it / the sources were last checked, and
+# the backoff after failed background refreshes
+_seen = {
+    "generation": None,
+    "generation_checked": 0.0,
+    "refreshed": time.monotonic(),
+    "failures": 0,
+    "retry_at": 0.0,
+}
+
+
+def _generation() -> int:
+    from background import generation  # lazy: scripts use mlb_data without the job cache
+
+    return generation("mlb")
+
+
+@single_flight(maxsize=1)
+def _first_load() -> SimpleNamespace:
+    _seen["generation"] = _generation()
+    mlb = load_mlb_data()
+    _current[0] = mlb
+    _seen["refreshed"] = time.monotonic()
+    return mlb
+
+
+def get_mlb_data() -> SimpleNamespace:
+    """
+    The current MLB snapshot, loaded on first use. Pages call this from
+    their layout functions and callbacks instead of importing frames, once
+    per call, so a refresh never hands one request two snapshots.
+    """
+    mlb = _current[0]
+    if mlb is None:
+        return _first_load()
+    _maybe_refresh()
+    return mlb
+
+
+def mlb_data_loaded() -> bool:
+    """True once this process holds the MLB frames (get_mlb_data() is cheap)."""
+    return _current[0] is not None
+
+
+def mlb_version() -> str:
+    """Content token of the current snapshot; changes when a refresh swaps in new data."""
+    return get_mlb_data().version
+
+
+def clear_mlb_cache():
+    _current[0] = None
+    _first_load.cache_clear()
+
+
+def _maybe_refresh():
+    now = time.monotonic()
+    if now < _seen["retry_at"]:
+        return
+    due = MLB_REFRESH_INTERVAL_S > 0 and now - _seen["refreshed"] >= MLB_REFRESH_INTERVAL_S
+    if now - _seen["generation_checked"] >= MLB_GENERATION_CHECK_S:
+        _seen["generation_checked"] = now
+        due = due or _generation() != _seen["generation"]
+    if due and not _refresh_lock.locked():
+        threading.Thread(target=_refresh_quietly, name="mlb-refresh", daemon=True).start()
+
+
+def _refresh_quietly():
+    try:
+        refresh_mlb_data(broadcast=False)
+    except Exception as e:
+        _seen["failures"] += 1
+        delay = min(MLB_GENERATION_CHECK_S * 2 ** (_seen["failures"] - 1), MLB_REFRESH_BACKOFF_MAX_S)
+        _seen["retry_at"] = time.monotonic() + delay
+        print(
+            f"[mlb_data] Refresh failed, keeping the current data for {delay:.0f}s ({type(e).__name__}: {e})",
+            flush=True,
+        )
+
+
+def refresh_mlb_data(broadcast: bool = True) -> dict:
+    """
+    Re-reads the MLB sources and, if any changed, swaps in a new snapshot
+    with its derived structures already built. Raises (keeping the current
+    snapshot) if a source cannot be read. With broadcast, the other workers
+    refresh too.
+    """
+    with _refresh_lock:
+        t0 = time.perf_counter()
+        gen = _generation()
+        old = _current[0] or _first_load()
+        print(f"[mlb_data] Checking MLB data from: {DATA_BASE_RAW}", flush=True)
+        sources = read_mlb_sources(old.sources)
+        changed = [
+            name for name, src in sources.items() if name not in old.sources or src.digest != old.sources[name].digest
+        ]
+        if changed:
+            mlb = load_mlb_data(sources, changed)
+        else:
+            # new stamps, so the next check skips re-reading the same bytes;
+            # only refreshes (serialized by this lock) read them
+            old.sources = sources
+            mlb = old
+            print("[mlb_data] MLB data unchanged", flush=True)
+        if mlb is not old:
+            for name, build in list(_derived_builders.items()):
+                mlb.derived[name] = build(mlb)
+            _current[0] = mlb
+            if broadcast:
+                gen = _bump_generation()
+        _seen.update(generation=gen, refreshed=time.monotonic(), failures=0, retry_at=0.0)
+
+    summary = {
+        "version": mlb.version,
+        "changed": mlb.changed if mlb is not old else [],
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    print(f"[mlb_data] Refresh: {summary}", flush=True)
+    return summary
+
+
+def _bump_generation() -> int:
+    from background import bump_generation
+
+    return bump_generation("mlb")
+
+
+def register_refresh_route(server):
+    """
+    POST /admin/mlb/refresh: picks up new MLB files in every worker without
+    a restart (JSON summary). Answers 404 unless the caller is an admin.
+    """
+    from flask import abort, jsonify, request
+
+    from profiling import is_admin
+
+    @server.route("/admin/mlb/refresh", methods=["POST"])
+    def refresh_mlb():
+        if not is_admin(request):
+            abort(404)
+        try:
+            return jsonify(refresh_mlb_data())
+        except Exception as e:
+            return jsonify({"error": f"{type(e).__name__}: {e}", "version": mlb_version()}), 502
+
+    return refresh_mlb
+
+
+_derived_lock = threading.Lock()
+# name -> build of every structure asked for, rebuilt by refresh_mlb_data
+_derived_builders = {}
+
+
+def _reset_locks():
+    # a background job forked while a request thread was building or refreshing
+    global _derived_lock, _refresh_lock
+    _derived_lock = threading.Lock()
+    _refresh_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks)
 
-df_hitter_pct = pd.read_csv(
-    HITTER_PCT_URL,
-    usecols=["player_name", "xwoba", "xba", "xslg", "xiso", "xobp", "brl_percent",
-             "exit_velocity", "hard_hit_percent", "k_percent", "bb_percent", "whiff_percent", "chase_percent"]
-).rename(columns=lambda x: x + "_hitter")
-
-dfHittersFinal = dfHitters.merge(dfLastWeek, left_on="Savant Name", right_on="Name", how="left").drop(columns=["Name"], errors="ignore")
-
-dfHitterMerge = dfDaily.merge(df_hitter_pct, left_on="Savant Name", right_on="player_name_hitter", how="left")
-dfFinalMatchup = dfHitterMerge.merge(
-    dfpct,
-    left_on="Baseball Savant Name",
-    right_on="player_name_pitcher",
-    how="left",
-    suffixes=["_Hitter", "_Pitcher"],
-)
 
-df_props = pd.read_excel(DAILY_PROPS_URL)
-df_pitchers = pd.read_excel(MY_PITCHER_LIST_URL, usecols=["Props Name", "mlb_team_long"])
-df_hitters = pd.read_excel(MY_HITTER_LIST_URL, usecols=["Props Name", "mlb_team_long"])
+def mlb_derived(name: str, build, mlb: SimpleNamespace | None = None):
+    """
+    `build(mlb)` computed once per MLB snapshot (default: the current one)
+    and kept next to its frames. A refresh builds it for the new snapshot
+    before swapping it in.
+    """
+    _derived_builders.setdefault(name, build)
+    mlb = mlb if mlb is not None else get_mlb_data()
+    derived = mlb.derived
+    if name not in derived:
+        with _derived_lock:
+            if name not in derived:
+                derived[name] = build(mlb)
+    return derived[name]
 
-df_players = pd.concat([df_pitchers, df_hitters], ignore_index=True)
-df_daily_props = df_props.merge(df_players, left_on="Player", right_on="Props Name", how="left").dropna(subset=["mlb_team_long"])
-df_props_matchup = df_daily_props.merge(dfFinalMatchup, on=["Props Name", "mlb_team_long"], how="left")
 
 # -------------------------------------------------
 # Shared styling
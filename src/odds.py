@@ -0,0 +1,57 @@
+# -----------------------------
+# Betting odds helpers (American odds)
+# -----------------------------
+# Column-at-a-time conversions shared by the NBA and MLB props tables; none
+# of them loops over rows, so a full slate of every game, market and book is
+# a handful of array operations.
+import pandas as pd
+
+
+def _numeric(odds):
+    if isinstance(odds, pd.DataFrame):
+        return odds.apply(pd.to_numeric, errors="coerce")
+    return pd.to_numeric(pd.Series(odds), errors="coerce")
+
+
+def implied_prob(odds):
+    """American odds (Series or DataFrame) -> implied probability (NaN where the odds are not a number)."""
+    odds = _numeric(odds)
+    return odds.abs().where(odds <= 0, 100) / (odds.abs() + 100)
+
+
+def decimal_odds(odds):
+    """American odds -> decimal odds (total return per unit staked)."""
+    odds = _numeric(odds)
+    return 1 + (odds / 100).where(odds > 0, 100 / odds.abs())
+
+
+def add_price_columns(df: pd.DataFrame, line_cols: list[str], over: str = "Over Price",
+                      under: str = "Under Price") -> pd.DataFrame:
+    """
+    df plus, per row (one book's two-way price on a line):
+
+      Over/Under Implied  probability implied by each price
+      Over No-Vig         over probability with the book's margin removed
+      Consensus Over      mean no-vig over probability of every book on the
+                          same line (rows sharing `line_cols`)
+      Over/Under EV       expected profit per unit staked at this price if
+                          the consensus is the true probability
+
+    Rows missing either price get no no-vig probability and take no part in
+    the consensus.
+    """
+    over_p = implied_prob(df[over])
+    under_p = implied_prob(df[under])
+    no_vig = over_p / (over_p + under_p)
+
+    keys = [df[c] for c in line_cols]
+    consensus = no_vig.groupby(keys, sort=False, dropna=False).transform("mean")
+
+    return df.assign(**{
+        "Over Implied": over_p.round(4).to_numpy(),
+        "Under Implied": under_p.round(4).to_numpy(),
+        "Over No-Vig": no_vig.round(4).to_numpy(),
+        "Consensus Over": consensus.round(4).to_numpy(),
+        "Over EV": (consensus * decimal_odds(df[over]) - 1).round(4).to_numpy(),
+        "Under EV": ((1 - consensus) * decimal_odds(df[under]) - 1).round(4).to_numpy(),
+    })
@@ -1,26 +1,196 @@
 # pages/mlb_hot_hitters.py
+import os
+from types import SimpleNamespace
+
 import dash
-from dash import html
+import numpy as np
+import pandas as pd
+from dash import dcc, html
 import dash_bootstrap_components as dbc
-from dash import dash_table
 
-from mlb_data import dfHot
+from components.mlb_loader import mlb_page, register_mlb_page
+from components.server_table import register_server_table, server_table
+from mlb_data import get_mlb_data, mlb_derived, mlb_version
 
 dash.register_page(__name__, path="/mlb/hot-hitters", name="MLB Hot Hitters")
 
-layout = dbc.Container(
-    [
-        dbc.Row([html.H1("Hot Hitters", style={"color": "red", "fontSize": 40, "textAlign": "center"})]),
-        dbc.Row(html.H6("Statistics over the last week", style={"fontSize": 20, "textAlign": "center"})),
-        dbc.Row(
-            dash_table.DataTable(
-                id="mlb-hot-hitters",
-                data=dfHot.to_dict("records"),
-                style_cell={"textAlign": "center"},
-                sort_action="native",
-                page_size=25,
-            )
-        ),
+# Rolling windows (days, ending on the latest hitting-log date) offered on the page
+HOT_WINDOWS = [int(x) for x in os.getenv("MLB_HOT_WINDOWS", "3,7,14,30").split(",") if x.strip()]
+DEFAULT_WINDOW = 7 if 7 in HOT_WINDOWS else HOT_WINDOWS[0]
+DEFAULT_MIN_PA = 20
+DEFAULT_STAT = "BA"
+DEFAULT_THRESHOLD = 0.350
+
+COUNT_COLS = ["PA", "AB", "H", "2B", "3B", "HR", "BB", "HBP", "SF", "SO"]
+RATE_STATS = ["BA", "OBP", "SLG", "ISO", "K%"]
+# a hot hitter is at or above the threshold, except for these
+LOWER_IS_HOTTER = {"K%"}
+
+
+def _build_layout():
+    windows = hitting_windows()
+    if windows is None:
+        subtitle = "Statistics over the last week"
+    else:
+        subtitle = f"Rolling windows through {windows.last_date:%B %d, %Y}"
+
+    return dbc.Container(
+        [
+            dbc.Row([html.H1("Hot Hitters", style={"color": "red", "fontSize": 40, "textAlign": "center"})]),
+            dbc.Row(html.H6(subtitle, style={"fontSize": 20, "textAlign": "center"})),
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dcc.Dropdown(
+                            id="mlb-hot-window",
+                            options=[{"label": f"Last {n} days", "value": n} for n in HOT_WINDOWS],
+                            value=DEFAULT_WINDOW,
+                            clearable=False,
+                            disabled=windows is None,
+                        ),
+                        md=3,
+                    ),
+                    dbc.Col(
+                        dcc.Dropdown(
+                            id="mlb-hot-stat",
+                            options=[{"label": s, "value": s} for s in RATE_STATS],
+                            value=DEFAULT_STAT,
+                            clearable=False,
+                        ),
+                        md=2,
+                    ),
+                    dbc.Col(
+                        dcc.Input(
+                            id="mlb-hot-threshold", type="number", value=DEFAULT_THRESHOLD,
+                            step=0.005, debounce=True, placeholder="Threshold",
+                        ),
+                        md=2,
+                    ),
+                    dbc.Col(
+                        dcc.Input(
+                            id="mlb-hot-min-pa", type="number", value=DEFAULT_MIN_PA,
+                            min=0, step=1, debounce=True, placeholder="Min PA",
+                        ),
+                        md=2,
+                    ),
+                ],
+                style={"marginBottom": "10px"},
+            ),
+            dbc.Row(server_table("mlb-hot-hitters", page_size=25, style_cell={"textAlign": "center"})),
+        ],
+        fluid=True,
+    )
+
+
+def layout(**kwargs):
+    return mlb_page("mlb-hot-hitters", _build_layout)
+
+
+register_mlb_page("mlb-hot-hitters", _build_layout)
+
+
+# -----------------------------
+# Rolling-window engine
+# -----------------------------
+# Built once per MLB snapshot from the hitting logs: a hitter x day x stat
+# array of counting stats and its running sum along the days. Any window
+# ending on the latest date is then one subtraction of two day slices for
+# every hitter at once, so changing the window never touches the logs.
+def build_hitting_windows(mlb):
+    """Per-hitter prefix sums of daily counting stats, or None without hitting logs."""
+    logs = mlb.dfHittingLogs
+    if logs is None:
+        return None
+    logs = logs.dropna(subset=["player_key", "Date"]).sort_values("Date", kind="stable")
+    if logs.empty:
+        return None
+
+    keys, hitter = np.unique(logs["player_key"].to_numpy(dtype="int64"), return_inverse=True)
+    first_date = logs["Date"].iloc[0]
+    day = (logs["Date"] - first_date).dt.days.to_numpy()
+    n_days = int(day.max()) + 1
+
+    cell = hitter * n_days + day
+    counts = logs[COUNT_COLS].fillna(0).to_numpy(dtype="float64")
+    daily = np.stack(
+        [np.bincount(cell, weights=counts[:, i], minlength=len(keys) * n_days) for i in range(len(COUNT_COLS))],
+        axis=-1,
+    ).reshape(len(keys), n_days, len(COUNT_COLS))
+
+    prefix = np.zeros((len(keys), n_days + 1, len(COUNT_COLS)))
+    np.cumsum(daily, axis=1, out=prefix[:, 1:])
+
+    names = pd.Series(logs["Name"].to_numpy()).groupby(hitter).last().to_numpy()
+    print(f"[mlb_hot_hitters] Built {n_days}-day windows for {len(keys):,} hitters", flush=True)
+    return SimpleNamespace(
+        names=names,
+        prefix=prefix,
+        last_date=logs["Date"].iloc[-1],
+    )
+
+
+def hitting_windows(mlb=None):
+    return mlb_derived("hitting_windows", build_hitting_windows, mlb=mlb)
+
+
+def _rate(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def window_stats(windows, days: int) -> pd.DataFrame:
+    """Every hitter's counting stats and BA/OBP/SLG/ISO/K% over the last `days` days."""
+    end = windows.prefix.shape[1] - 1
+    totals = windows.prefix[:, end] - windows.prefix[:, max(end - int(days), 0)]
+    c = dict(zip(COUNT_COLS, totals.T))
+
+    total_bases = c["H"] + c["2B"] + 2 * c["3B"] + 3 * c["HR"]
+    ba = _rate(c["H"], c["AB"])
+    slg = _rate(total_bases, c["AB"])
+    df = pd.DataFrame({"Name": windows.names, **{k: v.astype("int64") for k, v in c.items()}})
+    df["BA"] = ba
+    df["OBP"] = _rate(c["H"] + c["BB"] + c["HBP"], c["AB"] + c["BB"] + c["HBP"] + c["SF"])
+    df["SLG"] = slg
+    df["ISO"] = slg - ba
+    df["K%"] = _rate(c["SO"], c["PA"])
+    df[RATE_STATS] = df[RATE_STATS].round(3)
+    return df
+
+
+def _hot(df: pd.DataFrame, min_pa, stat, threshold) -> pd.DataFrame:
+    mask = np.ones(len(df), dtype=bool)
+    if min_pa is not None and "PA" in df.columns:
+        mask &= (df["PA"] >= min_pa).to_numpy()
+    if threshold is not None and stat in df.columns:
+        values = df[stat]
+        mask &= (values <= threshold if stat in LOWER_IS_HOTTER else values >= threshold).to_numpy()
+    return df[mask]
+
+
+# -----------------------------
+# CALLBACKS (hot hitters page only)
+# -----------------------------
+def hot_hitters_frame(window, stat, threshold, min_pa):
+    mlb = get_mlb_data()
+    windows = hitting_windows(mlb)
+    if windows is None:
+        # no hitting logs: the prebuilt last-week sheet, without windows
+        return _hot(mlb.dfLast7, min_pa, stat, threshold)
+
+    stat = stat if stat in RATE_STATS else DEFAULT_STAT
+    df = _hot(window_stats(windows, window or DEFAULT_WINDOW), min_pa, stat, threshold)
+    return df.sort_values(stat, ascending=stat in LOWER_IS_HOTTER, kind="stable")
+
+
+update_hot_hitters = register_server_table(
+    "mlb-hot-hitters",
+    hot_hitters_frame,
+    snapshot=mlb_version,
+    inputs=[
+        ("mlb-hot-window", "value"),
+        ("mlb-hot-stat", "value"),
+        ("mlb-hot-threshold", "value"),
+        ("mlb-hot-min-pa", "value"),
     ],
-    fluid=True,
+    name="update_hot_hitters",
 )
@@ -1,15 +1,16 @@
 # pages/mlb.py
+import os
+import numpy as np
+import pandas as pd
 import plotly.express as px
 import dash
-from dash import html, dcc, Input, Output, callback, dash_table, no_update
+from dash import html, dcc, Input, Output, callback, dash_table
 import dash_bootstrap_components as dbc
 
-from mlb_data import (
-    MLB_IMAGE_BASE,
-    df, dfPitchers, dfGameLogs, dfSplits,
-    dfpct_reshaped, dfHittersFinal,
-    hitter_style
-)
+from components.mlb_loader import mlb_page, register_mlb_page
+from images import image_src
+from mlb_data import KEY_COLS, MLB_IMAGE_BASE, get_mlb_data, hitter_style, mlb_derived
+from percentiles import long_percentiles, parse_metrics, percentile_ranks
 
 dash.register_page(__name__, path="/mlb/matchup", name="MLB Matchup")
 
@@ -32,260 +33,249 @@ def cols_from_df(dff, drop=None):
     drop = set(drop or [])
     return [{"name": c, "id": c} for c in dff.columns if c not in drop]
 
-# Predefine headers so tables show structure before selection
-SEASON_COLS = cols_from_df(df)
-GAMELOG_COLS = cols_from_df(dfGameLogs, drop=["Name"])          # you drop Name in callback
 SPLITS_COLS = [{"name": c, "id": c} for c in ["vs L", "Statistic", "vs R"]]  # what your pivot returns
-HITTER_COLS = cols_from_df(dfHittersFinal, drop=["Pitcher"])    # you drop Pitcher in callback
-
-
-layout = dbc.Container(
-    [
-        # Title
-        dbc.Row(
-            dbc.Col(
-                html.H1("MLB Matchup Analysis", className="text-center my-3"),
-                width=12,
-            )
-        ),
-
-        # Top controls + season summary
-        dbc.Row(
-            [
+
+
+def _build_layout():
+    mlb = get_mlb_data()
+
+    # Predefine headers so tables show structure before selection
+    season_cols = cols_from_df(mlb.df, drop=KEY_COLS)
+    gamelog_cols = cols_from_df(mlb.dfGameLogs, drop=["Name", *KEY_COLS])          # you drop Name in callback
+    hitter_cols = cols_from_df(mlb.dfHittersFinal, drop=["Pitcher", *KEY_COLS])    # you drop Pitcher in callback
+
+    return dbc.Container(
+        [
+            # Title
+            dbc.Row(
                 dbc.Col(
-                    dcc.Dropdown(
-                        id="mlb-pitcher-dropdown",
-                        options=[
-                            {"label": x, "value": x}
-                            for x in sorted(dfPitchers["Baseball_Savant_Name"].unique())
-                        ],
-                        placeholder="Select a pitcher...",
-                        clearable=True,
+                    html.H1("MLB Matchup Analysis", className="text-center my-3"),
+                    width=12,
+                )
+            ),
+
+            # Top controls + season summary
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dcc.Dropdown(
+                            id="mlb-pitcher-dropdown",
+                            options=[
+                                {"label": x, "value": x}
+                                for x in sorted(mlb.dfPitchers["Baseball_Savant_Name"].unique())
+                            ],
+                            placeholder="Select a pitcher...",
+                            clearable=True,
+                        ),
+                        xs=12, md=4, lg=3,
                     ),
-                    xs=12, md=4, lg=3,
-                ),
 
-                dbc.Col(
-                    html.Img(
-                        id="mlb-pitcher-picture",
-                        src="",
-                        alt="pitcher image",
-                        style={"display": "none"},
+                    dbc.Col(
+                        html.Img(
+                            id="mlb-pitcher-picture",
+                            src="",
+                            alt="pitcher image",
+                            style={"display": "none"},
+                        ),
+                        xs="auto",
+                        style={"display": "flex", "alignItems": "center"},
                     ),
-                    xs="auto",
-                    style={"display": "flex", "alignItems": "center"},
-                ),
 
-                dbc.Col(
-                    dash_table.DataTable(
-                        id="mlb-pitcher-season-table",
-                        columns=SEASON_COLS,
-                        data=[],  # ✅ empty until selection
-                        **BASE_TABLE_STYLE,
+                    dbc.Col(
+                        dash_table.DataTable(
+                            id="mlb-pitcher-season-table",
+                            columns=season_cols,
+                            data=[],  # ✅ empty until selection
+                            **BASE_TABLE_STYLE,
+                        ),
+                        xs=12, md=7, lg=8,
                     ),
-                    xs=12, md=7, lg=8,
-                ),
-            ],
-            className="g-3 align-items-center mb-3",
-        ),
-
-        # Game log table
-        dbc.Row(
-            dbc.Col(
-                dash_table.DataTable(
-                    id="mlb-game-log-table",
-                    columns=GAMELOG_COLS,
-                    data=[],  # ✅ empty until selection
-                    page_size=10,
-                    **{
-                        **BASE_TABLE_STYLE,
-                        "style_cell": {
-                            **BASE_TABLE_STYLE["style_cell"],
-                            "fontWeight": "600",
-                            "fontSize": "14px",
-                        },
-                    },
-                ),
-                width=12,
+                ],
+                className="g-3 align-items-center mb-3",
             ),
-            className="mb-4",
-        ),
 
-        # Splits (left) + Percentiles chart (right)
-        dbc.Row(
-            [
+            # Game log table
+            dbc.Row(
                 dbc.Col(
                     dash_table.DataTable(
-                        id="mlb-splits-table",
-                        columns=SPLITS_COLS,
+                        id="mlb-game-log-table",
+                        columns=gamelog_cols,
                         data=[],  # ✅ empty until selection
-                        page_size=20,
-                        **BASE_TABLE_STYLE,
+                        page_size=10,
+                        **{
+                            **BASE_TABLE_STYLE,
+                            "style_cell": {
+                                **BASE_TABLE_STYLE["style_cell"],
+                                "fontWeight": "600",
+                                "fontSize": "14px",
+                            },
+                        },
                     ),
-                    xs=12, lg=6,
+                    width=12,
                 ),
+                className="mb-4",
+            ),
 
+            # Splits (left) + Percentiles chart (right)
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dash_table.DataTable(
+                            id="mlb-splits-table",
+                            columns=SPLITS_COLS,
+                            data=[],  # ✅ empty until selection
+                            page_size=20,
+                            **BASE_TABLE_STYLE,
+                        ),
+                        xs=12, lg=6,
+                    ),
+
+                    dbc.Col(
+                        dcc.Graph(
+                            id="mlb-pcts-graph",
+                            figure={},
+                            style={"display": "none"},
+                            config={"displayModeBar": False},
+                        ),
+                        xs=12, lg=6,
+                    ),
+                ],
+                className="g-3 mb-2",
+            ),
+
+            dbc.Row(
                 dbc.Col(
-                    dcc.Graph(
-                        id="mlb-pcts-graph",
-                        figure={},
-                        style={"display": "none"},
-                        config={"displayModeBar": False},
+                    html.P(
+                        "Splits data are from 2024 and 2025.",
+                        id="mlb-splits-note",
+                        style={"display": "none", "fontWeight": "700"},
+                        className="mb-0",
                     ),
-                    xs=12, lg=6,
-                ),
-            ],
-            className="g-3 mb-2",
-        ),
-
-        dbc.Row(
-            dbc.Col(
-                html.P(
-                    "Splits data are from 2024 and 2025.",
-                    id="mlb-splits-note",
-                    style={"display": "none", "fontWeight": "700"},
-                    className="mb-0",
+                    width=12,
                 ),
-                width=12,
+                className="mb-4",
             ),
-            className="mb-4",
-        ),
-
-        # Hitter table
-        dbc.Row(
-            dbc.Col(
-                dash_table.DataTable(
-                    id="mlb-hitter-table",
-                    columns=HITTER_COLS,
-                    data=[],  # ✅ empty until selection
-                    page_size=25,
-                    style_data_conditional=hitter_style,
-                    **BASE_TABLE_STYLE,
-                ),
-                width=12,
-            )
-        ),
-    ],
-    fluid=True,
-    className="py-2",
-)
 
-# -----------------------------
-# CALLBACKS
-# -----------------------------
-@callback(
-    Output("mlb-pitcher-picture", "style"),
-    Output("mlb-pcts-graph", "style"),
-    Output("mlb-splits-note", "style"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def show_visibility(chosen_value):
-    if chosen_value:
-        return (
-            {"display": "block", "height": "70px", "width": "70px", "borderRadius": "50%"},
-            {"display": "block"},
-            {"display": "block", "fontWeight": "bold"},
-        )
-    return {"display": "none"}, {"display": "none"}, {"display": "none"}
+            # Hitter table (left) + hitter percentiles (right)
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dash_table.DataTable(
+                            id="mlb-hitter-table",
+                            columns=hitter_cols,
+                            data=[],  # ✅ empty until selection
+                            page_size=25,
+                            style_data_conditional=hitter_style,
+                            **BASE_TABLE_STYLE,
+                        ),
+                        xs=12, xl=8,
+                    ),
 
+                    dbc.Col(
+                        dcc.Graph(
+                            id="mlb-hitter-pcts-graph",
+                            figure={},
+                            style={"display": "none"},
+                            config={"displayModeBar": False},
+                        ),
+                        xs=12, xl=4,
+                    ),
+                ],
+                className="g-3",
+            ),
+        ],
+        fluid=True,
+        className="py-2",
+    )
 
-@callback(
-    Output("mlb-pitcher-picture", "src"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def update_picture(chosen_value):
-    if not chosen_value:
-        return ""
-    dfpicture = df.loc[df["Baseball_Savant_Name"] == chosen_value]
-    if dfpicture.empty:
-        return ""
-    name = str(dfpicture["Name"].values[0])
-    filename = "%20".join(name.split()) + ".jpg"
-    return f"{MLB_IMAGE_BASE}/{filename}"
 
+def layout(**kwargs):
+    return mlb_page("mlb-matchup", _build_layout)
 
-@callback(
-    Output("mlb-pitcher-season-table", "data"),
-    Output("mlb-hitter-table", "data"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def update_pitcher_and_hitters(chosen_value):
-    if not chosen_value:
-        return [], []
 
-    dff = df.loc[df["Baseball_Savant_Name"] == chosen_value].copy()
+register_mlb_page("mlb-matchup", _build_layout)
 
-    dfh = dfHittersFinal.loc[dfHittersFinal["Baseball Savant Name"] == chosen_value].copy()
-    dfh = dfh.drop(columns=["Pitcher"], errors="ignore")
 
-    if "Batting Order" in dfh.columns:
-        dfh = dfh.sort_values(by="Batting Order")
+# -----------------------------
+# Per-pitcher bundles
+# -----------------------------
+# Everything the page shows for a pitcher, built once per MLB snapshot with
+# one groupby per frame, so selecting a pitcher is a dict lookup.
+# Statistic rows of the splits table, top to bottom; statistics not listed
+# follow alphabetically. MLB_SPLITS_STAT_ORDER (comma-separated) overrides it.
+DEFAULT_SPLITS_STAT_ORDER = [
+    "ERA", "FB%", "FIP", "wOBA", "SwStr%", "BABIP", "AVG", "BB%", "OBP", "GB%",
+    "K%", "OPS", "HR/9", "K/9", "WHIP", "SLG", "LD%", "HR/FB", "xFIP",
+]
+SPLITS_STAT_ORDER = [
+    s.strip() for s in os.getenv("MLB_SPLITS_STAT_ORDER", "").split(",") if s.strip()
+] or DEFAULT_SPLITS_STAT_ORDER
+# League percentiles ranked here from the season stat frames (percentiles.py):
+# pitchers against every pitcher in the season stats, hitters against every
+# hitter in the daily file. Comma-separated columns; a trailing "-" marks
+# lower-is-better.
+PITCHER_PCT_METRICS = parse_metrics(os.getenv("MLB_PITCHER_PCT_METRICS", "ERA-,WHIP-,K/IP,SO,IP"))
+HITTER_PCT_METRICS = parse_metrics(os.getenv("MLB_HITTER_PCT_METRICS", "Average,wOBA,ISO,K%-,BB%,Hard Contact %"))
+# Savant's pre-ranked statistics, then the ones ranked here
+PCT_ORDER = [
+    "Fastball Velo", "Avg Exit Velocity", "Chase %", "Whiff %", "K %", "BB %", "Barrel %", "Hard-Hit %",
+    *[m.column for m in PITCHER_PCT_METRICS],
+]
+# low percentiles blue, high red, as on the pitcher chart
+PCT_COLORSCALE = [[i / (len(px.colors.diverging.RdBu_r) - 1), c] for i, c in enumerate(px.colors.diverging.RdBu_r)]
+
+PICTURE_SHOWN = {"display": "block", "height": "70px", "width": "70px", "borderRadius": "50%"}
+GRAPH_SHOWN = {"display": "block"}
+NOTE_SHOWN = {"display": "block", "fontWeight": "bold"}
+HIDDEN = {"display": "none"}
+
+EMPTY_BUNDLE = {
+    "picture": "", "season": [], "game_logs": [], "splits": [], "figure": {}, "hitters": [], "hitter_figure": {},
+}
 
-    return dff.to_dict("records"), dfh.to_dict("records")
 
+def _picture_url(name) -> str:
+    return f"{MLB_IMAGE_BASE}/{'%20'.join(str(name).split())}.jpg"
 
-@callback(
-    Output("mlb-game-log-table", "data"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def update_game_logs(chosen_value):
-    if not chosen_value:
-        return []
 
-    # NOTE: if dfGameLogs["Name"] contains the *actual pitcher name* (not Baseball_Savant_Name),
-    # you may need to map chosen_value -> Name before filtering.
-    dffgame = dfGameLogs.loc[dfGameLogs["Name"] == chosen_value].copy()
-    dffgame = dffgame.drop(columns=["Name"], errors="ignore")
-    return dffgame.to_dict("records")
-
-
-@callback(
-    Output("mlb-splits-table", "data"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def show_pitcher_splits(chosen_value):
-    if not chosen_value:
-        return []
+def _records_by(dff, key: str, drop=()) -> dict:
+    """key value -> that group's rows as records, converting the frame to records once."""
+    records = dff.drop(columns=list(drop), errors="ignore").to_dict("records")
+    return {name: [records[i] for i in idx] for name, idx in dff.groupby(key, sort=False).indices.items()}
 
-    dffSplits = dfSplits.loc[dfSplits["Baseball Savant Name"] == chosen_value].copy()
 
+def _splits_by_pitcher(dfSplits) -> dict:
+    """
+    Pitcher -> splits table ("vs L", Statistic, "vs R", rows in
+    SPLITS_STAT_ORDER) from one pivot of every pitcher. A pitcher without
+    values on both sides gets its raw split rows, as does everyone if the
+    splits do not pivot.
+    """
+    raw = _records_by(dfSplits, "player_key", drop=KEY_COLS)
     try:
-        dfPivot = dffSplits.pivot_table("Value", index="Statistic", columns="Split").reset_index()
-        cols = ["vs L", "Statistic", "vs R"]
-        dfFinal = dfPivot[cols].reset_index(drop=True)
-
-        order = [3, 4, 5, 17, 15, 1, 0, 2, 12, 6, 9, 13, 7, 10, 16, 14, 11, 8, 18]
-        dfFinal = dfFinal.reindex(order).reset_index(drop=True)
-        return dfFinal.to_dict("records")
+        dfPivot = dfSplits.pivot_table("Value", index=["player_key", "Statistic"], columns="Split")
+        dfPivot = dfPivot[["vs L", "vs R"]].reset_index()[["player_key", "vs L", "Statistic", "vs R"]]
     except Exception:
-        # fallback to raw filtered splits if pivot fails
-        return dffSplits.to_dict("records")
+        return raw
 
+    both = dfPivot.groupby("player_key")[["vs L", "vs R"]].count().gt(0).all(axis=1)
+    dfPivot = dfPivot[dfPivot["player_key"].map(both)]
+    listed = list(dict.fromkeys(SPLITS_STAT_ORDER))
+    unlisted = sorted(set(dfPivot["Statistic"]) - set(listed))
+    order = pd.Categorical(dfPivot["Statistic"], categories=listed + unlisted, ordered=True)
+    dfPivot = dfPivot.assign(order=order).sort_values(["player_key", "order"], kind="stable")
 
-@callback(
-    Output("mlb-pcts-graph", "figure"),
-    Input("mlb-pitcher-dropdown", "value"),
-    prevent_initial_call=True,
-)
-def show_percentiles(chosen_value):
-    if not chosen_value:
-        return {}
+    tables = _records_by(dfPivot, "player_key", drop=["player_key", "order"])
+    return {key: tables.get(key, rows) for key, rows in raw.items()}
 
-    dfpcts = dfpct_reshaped.loc[dfpct_reshaped["converted_name"] == chosen_value].copy()
-    if dfpcts.empty:
-        return {}
 
+def _percentile_figure(dfpcts):
     fig = px.bar(
         dfpcts,
         x="Percentile",
         y="Statistic",
         title="2025 MLB Percentile Rankings",
-        category_orders={"Statistic": ["Fastball Velo", "Avg Exit Velocity", "Chase %", "Whiff %", "K %", "BB %", "Barrel %", "Hard-Hit %"]},
+        category_orders={"Statistic": PCT_ORDER},
         color="Percentile",
         orientation="h",
         color_continuous_scale="RdBu_r",
@@ -297,3 +287,151 @@ def show_percentiles(chosen_value):
     fig.update_xaxes(range=[0, 100])
     fig.update(layout_coloraxis_showscale=False)
     return fig
+
+
+def _percentile_figures(dfpct_reshaped) -> dict:
+    """
+    Percentile bar chart per pitcher. plotly express runs once; the other
+    pitchers reuse its trace and layout with their own values (one trace,
+    colored by the same values it plots).
+    """
+    groups = dfpct_reshaped.groupby("player_key", sort=False).indices
+    if not groups:
+        return {}
+    first = next(iter(groups.values()))
+    template = _percentile_figure(dfpct_reshaped.iloc[first]).to_plotly_json()
+    layout = template["layout"]
+    trace = {k: v for k, v in template["data"][0].items() if k not in ("x", "y", "text", "marker")}
+    marker = {k: v for k, v in template["data"][0]["marker"].items() if k != "color"}
+
+    pct = dfpct_reshaped["Percentile"].to_numpy()
+    stats = dfpct_reshaped["Statistic"].to_numpy()
+    figures = {}
+    for key, idx in groups.items():
+        values = pct[idx].tolist()
+        figures[key] = {
+            "data": [{
+                **trace,
+                "x": values,
+                "y": stats[idx].tolist(),
+                "text": pct[idx].astype(float).tolist(),
+                "marker": {**marker, "color": values},
+            }],
+            "layout": layout,
+        }
+    return figures
+
+
+def pitcher_percentiles(mlb) -> pd.DataFrame:
+    """(player_key, Statistic, Percentile) rows: Savant's rankings where it has the pitcher, plus the season metrics."""
+    season = long_percentiles(percentile_ranks(mlb.df, PITCHER_PCT_METRICS, "player_key"))
+    savant = mlb.dfpct_reshaped.dropna(subset=["player_key", "Percentile"])[["player_key", "Statistic", "Percentile"]]
+    return pd.concat([savant.astype({"player_key": "int64"}), season], ignore_index=True)
+
+
+def _hitter_percentile_figures(mlb, dfh) -> dict:
+    """
+    pitcher_key -> heatmap of the opposing hitters' league percentiles (one
+    row per hitter in batting order, one column per metric). Every hitter is
+    ranked in the same pass; a pitcher's figure only slices the lineup.
+    """
+    pct = percentile_ranks(mlb.dfDaily, HITTER_PCT_METRICS, "player_key")
+    if pct.empty or pct.columns.empty:
+        return {}
+    z = pct.reindex(mlb.player_keys(dfh["Savant Name"]).to_numpy()).to_numpy()
+    z = np.where(np.isnan(z), None, z).tolist()
+    labels = list(pct.columns)
+    names = dfh["Savant Name"].tolist()
+
+    figures = {}
+    for key, idx in dfh.groupby("pitcher_key", sort=False).indices.items():
+        rows = [z[i] for i in idx]
+        figures[key] = {
+            "data": [{
+                "type": "heatmap",
+                "x": labels,
+                "y": [names[i] for i in idx],
+                "z": rows,
+                "text": rows,
+                "texttemplate": "%{text:.0f}",
+                "colorscale": PCT_COLORSCALE,
+                "zmin": 1, "zmid": 40, "zmax": 100,
+                "showscale": False,
+                "hovertemplate": "%{y}<br>%{x}: %{z:.0f}<extra></extra>",
+            }],
+            "layout": {
+                "title": {"text": "Opposing Hitters: League Percentiles"},
+                "yaxis": {"autorange": "reversed"},
+                "xaxis": {"side": "top"},
+                "height": 120 + 32 * len(idx),
+                "margin": {"l": 130, "r": 10, "t": 90, "b": 10},
+            },
+        }
+    return figures
+
+
+def build_pitcher_bundles(mlb) -> dict:
+    """
+    Baseball_Savant_Name -> picture, season row, game logs, splits,
+    percentile figure, opposing hitters and their percentile figure.
+    """
+    season = _records_by(mlb.df, "player_key", drop=KEY_COLS)
+    logs = _records_by(mlb.dfGameLogs, "player_key", drop=["Name", *KEY_COLS])
+    dfh = mlb.dfHittersFinal
+    if "Batting Order" in dfh.columns:
+        dfh = dfh.sort_values(by="Batting Order", kind="stable")
+    hitters = _records_by(dfh, "pitcher_key", drop=["Pitcher", *KEY_COLS])
+    splits = _splits_by_pitcher(mlb.dfSplits)
+    figures = _percentile_figures(pitcher_percentiles(mlb))
+    hitter_figures = _hitter_percentile_figures(mlb, dfh)
+
+    bundles = {}
+    pitchers = mlb.dfPitchers.drop_duplicates("Baseball_Savant_Name")
+    for name, key in zip(pitchers["Baseball_Savant_Name"], pitchers["player_key"]):
+        rows = season.get(key, [])
+        bundles[name] = {
+            "picture": _picture_url(rows[0]["Name"]) if rows else "",
+            "season": rows,
+            "game_logs": logs.get(key, []),
+            "splits": splits.get(key, []),
+            "figure": figures.get(key, {}),
+            "hitters": hitters.get(key, []),
+            "hitter_figure": hitter_figures.get(key, {}),
+        }
+    print(f"[mlb_matchup] Built {len(bundles):,} pitcher bundles", flush=True)
+    return bundles
+
+
+def pitcher_bundles() -> dict:
+    return mlb_derived("pitcher_bundles", build_pitcher_bundles)
+
+
+# -----------------------------
+# CALLBACKS
+# -----------------------------
+@callback(
+    Output("mlb-pitcher-picture", "style"),
+    Output("mlb-pcts-graph", "style"),
+    Output("mlb-splits-note", "style"),
+    Output("mlb-pitcher-picture", "src"),
+    Output("mlb-pitcher-season-table", "data"),
+    Output("mlb-hitter-table", "data"),
+    Output("mlb-game-log-table", "data"),
+    Output("mlb-splits-table", "data"),
+    Output("mlb-pcts-graph", "figure"),
+    Output("mlb-hitter-pcts-graph", "figure"),
+    Output("mlb-hitter-pcts-graph", "style"),
+    Input("mlb-pitcher-dropdown", "value"),
+    prevent_initial_call=True,
+)
+def select_pitcher(chosen_value):
+    if not chosen_value:
+        return HIDDEN, HIDDEN, HIDDEN, "", [], [], [], [], {}, {}, HIDDEN
+
+    b = pitcher_bundles().get(chosen_value, EMPTY_BUNDLE)
+    return (
+        PICTURE_SHOWN, GRAPH_SHOWN, NOTE_SHOWN,
+        image_src("pitcher", b["picture"], wait=False),
+        b["season"], b["hitters"], b["game_logs"], b["splits"], b["figure"],
+        b["hitter_figure"], GRAPH_SHOWN if b["hitter_figure"] else HIDDEN,
+    )
@@ -1,127 +1,178 @@
 # pages/mlb_props.py
+from types import SimpleNamespace
+
 import dash
-from dash import html, dcc, Input, Output, State, callback, dash_table
+import numpy as np
+from dash import html, dcc
 import dash_bootstrap_components as dbc
 
-from mlb_data import df_daily_props, df_props_matchup
+from components.mlb_loader import mlb_page, register_mlb_page
+from components.server_table import register_server_table, server_table
+from mlb_data import KEY_COLS, get_mlb_data, mlb_derived, mlb_version
 
 dash.register_page(__name__, path="/mlb/props", name="MLB Player Props")
 
 
-layout = dbc.Container(
-    [
-        html.Div(html.H1("Player Props Analysis", style={"textAlign": "center"}), className="row"),
-        html.Br(),
-
-        html.Div(
-            [
-                html.Div(
-                    dcc.Dropdown(
-                        id="mlb-team-dropdown",
-                        multi=False,
-                        options=[{"label": x, "value": x} for x in sorted(df_daily_props["mlb_team_long"].unique())],
-                        placeholder="Team..."
+def _build_layout():
+    df_daily_props = get_mlb_data().df_daily_props
+
+    return dbc.Container(
+        [
+            html.Div(html.H1("Player Props Analysis", style={"textAlign": "center"}), className="row"),
+            html.Br(),
+
+            html.Div(
+                [
+                    html.Div(
+                        dcc.Dropdown(
+                            id="mlb-team-dropdown",
+                            multi=False,
+                            options=[{"label": x, "value": x} for x in sorted(df_daily_props["mlb_team_long"].unique())],
+                            placeholder="Team..."
+                        ),
+                        className="three columns",
                     ),
-                    className="three columns",
-                ),
 
-                html.Div(
-                    dcc.Dropdown(
-                        id="mlb-player-dropdown",
-                        multi=False,
-                        options=[{"label": x, "value": x} for x in sorted(df_daily_props["Player"].unique())],
-                        placeholder="Player..."
+                    html.Div(
+                        dcc.Dropdown(
+                            id="mlb-player-dropdown",
+                            multi=False,
+                            options=[{"label": x, "value": x} for x in sorted(df_daily_props["Player"].unique())],
+                            placeholder="Player..."
+                        ),
+                        className="three columns",
                     ),
-                    className="three columns",
-                ),
 
-                html.Div(
-                    dcc.Dropdown(
-                        id="mlb-market-dropdown",
-                        multi=False,
-                        options=[{"label": x, "value": x} for x in sorted(df_daily_props["market"].unique())],
-                        placeholder="Market..."
+                    html.Div(
+                        dcc.Dropdown(
+                            id="mlb-market-dropdown",
+                            multi=False,
+                            options=[{"label": x, "value": x} for x in sorted(df_daily_props["market"].unique())],
+                            placeholder="Market..."
+                        ),
+                        className="two columns",
                     ),
-                    className="two columns",
-                ),
 
-                html.Div(
-                    dcc.Dropdown(
-                        id="mlb-bookmaker-dropdown",
-                        multi=False,
-                        options=[{"label": x, "value": x} for x in sorted(df_daily_props["bookmakers"].unique())],
-                        placeholder="Book..."
+                    html.Div(
+                        dcc.Dropdown(
+                            id="mlb-bookmaker-dropdown",
+                            multi=False,
+                            options=[{"label": x, "value": x} for x in sorted(df_daily_props["bookmakers"].unique())],
+                            placeholder="Book..."
+                        ),
+                        className="two columns",
                     ),
-                    className="two columns",
-                ),
 
-                html.Div(html.Button("Apply Filters", id="mlb-props-filter-button"), className="two columns"),
-            ],
-            className="row",
-        ),
-
-        html.Div(
-            dash_table.DataTable(
-                id="mlb-props-data-table",
-                data=df_daily_props.to_dict("records"),
-                style_table={"marginTop": "15px"},
-                style_cell={"textAlign": "center"},
-                sort_action="native",
-                page_size=25,
+                    html.Div(html.Button("Apply Filters", id="mlb-props-filter-button"), className="two columns"),
+                ],
+                className="row",
             ),
-            className="row",
-        ),
-    ],
-    fluid=True,
-)
+
+            html.Div(
+                server_table(
+                    "mlb-props-data-table",
+                    page_size=25,
+                    style_table={"marginTop": "15px"},
+                    style_cell={"textAlign": "center"},
+                ),
+                className="row",
+            ),
+        ],
+        fluid=True,
+    )
+
+
+def layout(**kwargs):
+    return mlb_page("mlb-props", _build_layout)
+
+
+register_mlb_page("mlb-props", _build_layout)
+
+
+# -----------------------------
+# Per-market props views
+# -----------------------------
+# Built once per MLB snapshot: the matchup frame without the columns the
+# table never shows, split into one narrow frame per market column set and
+# indexed by the filter columns (players by player_key), so a search
+# intersects row positions.
+PROPS_DROP_COLS = [
+    "commence_time", "Props Name", "home_team", "away_team", "fg_name", "Savant Name",
+    "Split Hitter", "HR Hitter", "SB", "CS", "Bats", "GB%", "Fly Ball %", "wOBA",
+    "Weighted OBP", "Weighted Slugging", "Weighted OBPS", "Team", "Handedness",
+    "Opposing Team", "Baseball Savant Name", "Split Pitcher", "Weighted FIP",
+    "Weighted GB% Pitcher", "Weighted FB% Pitcher", "Weighted HR/FB",
+    "player_name_hitter", "player_name_pitcher", "player_id_pitcher"
+]
+
+MARKET_COLUMNS = {
+    "hits": ["Player", "market", "bookmakers", "Line", "Over Price", "Under Price",
+             "Consensus Over", "Over EV", "Under EV", "Batting Order", "Average", "K%", "BB%", "Pitcher Average", "Pitcher K%",
+             "Weighted BB% Pitcher", "Expected Batting Avg_hitter", "Expected Batting Avg_pitcher"],
+    "strikeouts": ["Player", "market", "bookmakers", "Line", "Over Price", "Under Price",
+                   "Consensus Over", "Over EV", "Under EV", "Batting Order", "Average", "K%", "BB%", "Whiff %_hitter", "Chase %_hitter",
+                   "Pitcher K%", "Weighted BB% Pitcher", "Whiff %_pitcher", "Chase %_pitcher"],
+}
+
+INDEXED_COLS = ["mlb_team_long", "player_key", "bookmakers", "market"]
+
+_NO_ROWS = np.array([], dtype=np.intp)
+
+
+def _props_view(rows, columns):
+    """rows[columns], with value -> row positions for each filter column of rows."""
+    rows = rows.reset_index(drop=True)
+    return SimpleNamespace(
+        frame=rows[[c for c in columns if c not in KEY_COLS]],
+        index={c: rows.groupby(c, sort=False).indices for c in INDEXED_COLS if c in rows.columns},
+    )
+
+
+def build_props_views(mlb) -> dict:
+    """Market -> narrow view; None is every market with the default columns."""
+    pruned = mlb.df_props_matchup.drop(columns=PROPS_DROP_COLS, errors="ignore")
+    views = {None: _props_view(pruned, list(pruned.columns))}
+    for market, keep in MARKET_COLUMNS.items():
+        views[market] = _props_view(pruned[pruned["market"] == market], [c for c in keep if c in pruned.columns])
+    return views
+
 
 # -----------------------------
 # CALLBACKS (props page only)
 # -----------------------------
-@callback(
-    Output("mlb-props-data-table", "data"),
-    Input("mlb-props-filter-button", "n_clicks"),
-    State("mlb-team-dropdown", "value"),
-    State("mlb-player-dropdown", "value"),
-    State("mlb-market-dropdown", "value"),
-    State("mlb-bookmaker-dropdown", "value"),
+def props_frame(filtered, chosen_team, chosen_player, chosen_market, chosen_bookmaker):
+    mlb = get_mlb_data()
+    if not filtered:  # the filter button was never clicked
+        return mlb.df_daily_props.drop(columns=KEY_COLS, errors="ignore")
+
+    views = mlb_derived("props_views", build_props_views, mlb=mlb)
+    view = views.get(chosen_market, views[None])
+    player_key = mlb.player_keys(chosen_player) if chosen_player else None
+    if chosen_player and player_key is None:
+        return view.frame.iloc[_NO_ROWS]
+    filters = {"mlb_team_long": chosen_team, "player_key": player_key, "bookmakers": chosen_bookmaker}
+    if chosen_market not in views:
+        filters["market"] = chosen_market
+
+    positions = None
+    for col, value in filters.items():
+        if value is None or value == "":
+            continue
+        hit = view.index.get(col, {}).get(value, _NO_ROWS)
+        positions = hit if positions is None else np.intersect1d(positions, hit, assume_unique=True)
+    return view.frame if positions is None else view.frame.iloc[positions]
+
+
+update_props_table = register_server_table(
+    "mlb-props-data-table",
+    props_frame,
+    snapshot=mlb_version,
+    triggers=[("mlb-props-filter-button", "n_clicks")],
+    state=[
+        ("mlb-team-dropdown", "value"),
+        ("mlb-player-dropdown", "value"),
+        ("mlb-market-dropdown", "value"),
+        ("mlb-bookmaker-dropdown", "value"),
+    ],
+    name="update_props_table",
 )
-def update_props_table(n_clicks, chosen_team, chosen_player, chosen_market, chosen_bookmaker):
-    if not n_clicks:
-        return df_daily_props.to_dict("records")
-
-    dff_props = df_props_matchup.copy()
-
-    drop_cols = [
-        "commence_time", "Props Name", "home_team", "away_team", "fg_name", "Savant Name",
-        "Split Hitter", "HR Hitter", "SB", "CS", "Bats", "GB%", "Fly Ball %", "wOBA",
-        "Weighted OBP", "Weighted Slugging", "Weighted OBPS", "Team", "Handedness",
-        "Opposing Team", "Baseball Savant Name", "Split Pitcher", "Weighted FIP",
-        "Weighted GB% Pitcher", "Weighted FB% Pitcher", "Weighted HR/FB",
-        "player_name_hitter", "player_name_pitcher", "player_id_pitcher"
-    ]
-    dff_props = dff_props.drop(columns=drop_cols, errors="ignore")
-
-    if chosen_team:
-        dff_props = dff_props.loc[dff_props["mlb_team_long"] == chosen_team]
-    if chosen_player:
-        dff_props = dff_props.loc[dff_props["Player"] == chosen_player]
-    if chosen_market:
-        dff_props = dff_props.loc[dff_props["market"] == chosen_market]
-
-        if chosen_market == "hits":
-            keep = ["Player", "market", "bookmakers", "Line", "Over Price", "Under Price",
-                    "Batting Order", "Average", "K%", "BB%", "Pitcher Average", "Pitcher K%",
-                    "Weighted BB% Pitcher", "Expected Batting Avg_hitter", "Expected Batting Avg_pitcher"]
-            dff_props = dff_props[[c for c in keep if c in dff_props.columns]]
-
-        elif chosen_market == "strikeouts":
-            keep = ["Player", "market", "bookmakers", "Line", "Over Price", "Under Price",
-                    "Batting Order", "Average", "K%", "BB%", "Whiff %_hitter", "Chase %_hitter",
-                    "Pitcher K%", "Weighted BB% Pitcher", "Whiff %_pitcher", "Chase %_pitcher"]
-            dff_props = dff_props[[c for c in keep if c in dff_props.columns]]
-
-    if chosen_bookmaker:
-        dff_props = dff_props.loc[dff_props["bookmakers"] == chosen_bookmaker]
-
-    return dff_props.to_dict("records")
@@ -5,6 +5,8 @@ from functools import lru_cache
 import pandas as pd
 from dash import html, dcc, register_page
 
+from schedule_features import REST_DAYS_MAX
+
 # -------------------------------------------------
 # Register Dash Page
 # -------------------------------------------------
@@ -47,6 +49,11 @@ def stats_stat_options():
     return [{"label": k.upper(), "value": v} for k, v in available_stats.items()]
 
 
+def rest_days_options():
+    labels = {1: "1 (back-to-back)", REST_DAYS_MAX: f"{REST_DAYS_MAX}+"}
+    return [{"label": labels.get(n, str(n)), "value": n} for n in range(1, REST_DAYS_MAX + 1)]
+
+
 def _first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
     for c in candidates:
         if c in df.columns:
@@ -169,29 +176,6 @@ def apply_with_without_filters(
     return df_main, suffix
 
 
-def apply_schedule_filters(df_main: pd.DataFrame, b2b_values: list, in3in4_values: list) -> pd.DataFrame:
-    """
-    Applies optional schedule toggles if corresponding columns exist.
-    """
-    df_out = df_main.copy()
-
-    if "b2b2" in (b2b_values or []):
-        b2b_col = _first_existing_col(df_out, ["back_to_back", "b2b", "b2b_2nd", "b2b2"])
-        if b2b_col:
-            df_out = df_out[df_out[b2b_col] == 1]
-        else:
-            return df_out.iloc[0:0]
-
-    if "3in4" in (in3in4_values or []):
-        in3in4_col = _first_existing_col(df_out, ["third_in_four", "third_in_4", "three_in_four", "3in4"])
-        if in3in4_col:
-            df_out = df_out[df_out[in3in4_col] == 1]
-        else:
-            return df_out.iloc[0:0]
-
-    return df_out
-
-
 # -------------------------------------------------
 # Data loader (safe: runs only when called)
 # -------------------------------------------------
@@ -226,157 +210,203 @@ def get_df_stats() -> pd.DataFrame:
 # - WITH/WITHOUT dropdowns are AFTER slider and range note
 #   but BEFORE the schedule options block.
 # -------------------------------------------------
-layout = html.Div([
-
-    # ---------- Sidebar ----------
-    html.Div([
-        html.H2("Player Stats Filters", style={"marginBottom": "20px"}),
-
-        html.Label("Player"),
-        dcc.Dropdown(
-            id="nba-stats-player-dropdown",
-            options=[],  # populated by callback in callbacks file
-            placeholder="Select a player",
-            style={"marginBottom": "12px"},
-            persistence=True,
-            persistence_type="session",
-        ),
-
-        html.Label("Statistic"),
-        dcc.Dropdown(
-            id="nba-stats-stat-dropdown",
-            options=stats_stat_options(),
-            placeholder="Select a statistic",
-            style={"marginBottom": "12px"},
-            persistence=True,
-            persistence_type="session",
-        ),
-
-        # Threshold block
-        html.Label("Threshold (set using the slider)"),
-
-        html.Div(
-            id="nba-threshold-display",
-            style={
-                "marginBottom": "8px",
-                "padding": "6px 12px",
-                "border": "1px solid #ccc",
-                "borderRadius": "4px",
-                "backgroundColor": "#f8f9fa",
-                "fontSize": "14px",
-                "color": "#333",
-            }
-        ),
-
-        dcc.Slider(
-            id="nba-stats-threshold-slider",
-            min=0,
-            max=50,
-            step=1,
-            value=10,
-            tooltip={"placement": "bottom"},
-            updatemode="drag",
-            marks=None,
-            persistence=True,
-            persistence_type="session",
-        ),
-
-        html.Div(
-            id="nba-stats-range-note",
-            style={"marginTop": "8px", "color": "#666", "fontSize": "12px"},
-        ),
-
-        # ✅ NEW DROPDOWNS (moved here)
-        html.Label("Games With:"),
-        dcc.Dropdown(
-            id="nba-stats-with-dropdown",
-            options=[],  # populated by callback
-            value=None,
-            placeholder="Select a teammate.",
-            style={"marginBottom": "12px"},
-            persistence=True,
-            persistence_type="session",
-            clearable=True,
-        ),
-
-        html.Label("Games Without:"),
-        dcc.Dropdown(
-            id="nba-stats-without-dropdown",
-            options=[],  # populated by callback
-            value=None,
-            placeholder="Select a teammate.",
-            style={"marginBottom": "12px"},
-            persistence=True,
-            persistence_type="session",
-            clearable=True,
-        ),
-
-        # Schedule block (below WITH/WITHOUT)
-        html.Div(
-            [
-                html.Label("Schedule Filters", style={"marginTop": "10px"}),
-
-                dcc.Checklist(
-                    id="nba-b2b-toggle",
-                    options=[{"label": "2nd night of back-to-back only", "value": "b2b2"}],
-                    value=[],
-                    style={"marginBottom": "8px"},
-                    inputStyle={"marginRight": "8px"},
-                    persistence=True,
-                    persistence_type="session",
-                ),
-
-                dcc.Checklist(
-                    id="nba-3in4-toggle",
-                    options=[{"label": "3rd game in 4 nights only", "value": "3in4"}],
-                    value=[],
-                    style={"marginBottom": "12px"},
-                    inputStyle={"marginRight": "8px"},
-                    persistence=True,
-                    persistence_type="session",
-                ),
-            ],
-            style={"marginTop": "6px"},
-        ),
-
-        # Status / errors
-        html.Div(
-            id="nba-data-load-status",
-            style={"marginTop": "12px", "color": "#b00020", "fontSize": "12px"},
-        ),
-
-        # Initial load trigger (used by callbacks file)
-        dcc.Interval(id="nba-init", interval=500, n_intervals=0, max_intervals=1),
-    ],
-    style={
-        "width": "22%",
-        "padding": "20px",
-        "backgroundColor": "#f8f9fa",
-        "borderRight": "2px solid #dee2e6",
-        "height": "100vh",
-        "position": "fixed",
-        "overflowY": "auto",
-    }),
-
-    # ---------- Main Content ----------
-    html.Div([
-        html.H2("Game-by-Game Chart", style={"marginTop": "20px"}),
-
-        dcc.Loading(
-            dcc.Graph(id="nba-stats-game-chart", config={"displayModeBar": True}),
-            type="default",
-        ),
-
-        html.Div(id="nba-stats-summary-stats", style={"marginTop": "12px"}),
-
-        html.H3("Over Counts (counts of games ≥ threshold)", style={"marginTop": "20px"}),
-
-        html.Div(id="nba-stats-rates-table", style={"marginTop": "8px"}),
-
-        html.Div(
-            id="nba-stats-rates-footnote",
-            style={"marginTop": "8px", "color": "#666", "fontSize": "12px"},
-        ),
-    ],
-    style={"marginLeft": "24%", "padding": "20px"}),
-])
+def layout(**kwargs):
+    return html.Div([
+
+        # ---------- Sidebar ----------
+        html.Div([
+            html.H2("Player Stats Filters", style={"marginBottom": "20px"}),
+
+            html.Label("Season"),
+            dcc.Dropdown(
+                id="nba-season-dropdown",
+                options=[],  # populated by callback in callbacks file
+                placeholder="Select a season",
+                clearable=False,
+                style={"marginBottom": "12px"},
+                persistence=True,
+                persistence_type="session",
+            ),
+
+            html.Label("Player"),
+            dcc.Dropdown(
+                id="nba-stats-player-dropdown",
+                options=[],  # populated by callback in callbacks file
+                placeholder="Select a player",
+                style={"marginBottom": "12px"},
+                persistence=True,
+                persistence_type="session",
+            ),
+
+            html.Label("Statistic"),
+            dcc.Dropdown(
+                id="nba-stats-stat-dropdown",
+                options=stats_stat_options(),
+                placeholder="Select a statistic",
+                style={"marginBottom": "12px"},
+                persistence=True,
+                persistence_type="session",
+            ),
+
+            # Threshold block
+            html.Label("Threshold (set using the slider)"),
+
+            html.Div(
+                id="nba-threshold-display",
+                style={
+                    "marginBottom": "8px",
+                    "padding": "6px 12px",
+                    "border": "1px solid #ccc",
+                    "borderRadius": "4px",
+                    "backgroundColor": "#f8f9fa",
+                    "fontSize": "14px",
+                    "color": "#333",
+                }
+            ),
+
+            dcc.Slider(
+                id="nba-stats-threshold-slider",
+                min=0,
+                max=50,
+                step=1,
+                value=10,
+                tooltip={"placement": "bottom"},
+                updatemode="drag",
+                marks=None,
+                persistence=True,
+                persistence_type="session",
+            ),
+
+            html.Div(
+                id="nba-stats-range-note",
+                style={"marginTop": "8px", "color": "#666", "fontSize": "12px"},
+            ),
+
+            # ✅ NEW DROPDOWNS (moved here)
+            html.Label("Games With:"),
+            dcc.Dropdown(
+                id="nba-stats-with-dropdown",
+                options=[],  # populated by callback
+                value=None,
+                placeholder="Select a teammate.",
+                style={"marginBottom": "12px"},
+                persistence=True,
+                persistence_type="session",
+                clearable=True,
+            ),
+
+            html.Label("Games Without:"),
+            dcc.Dropdown(
+                id="nba-stats-without-dropdown",
+                options=[],  # populated by callback
+                value=None,
+                placeholder="Select a teammate.",
+                style={"marginBottom": "12px"},
+                persistence=True,
+                persistence_type="session",
+                clearable=True,
+            ),
+
+            # Schedule block (below WITH/WITHOUT)
+            html.Div(
+                [
+                    html.Label("Schedule Filters", style={"marginTop": "10px"}),
+
+                    dcc.Checklist(
+                        id="nba-b2b-toggle",
+                        options=[{"label": "2nd night of back-to-back only", "value": "b2b2"}],
+                        value=[],
+                        style={"marginBottom": "8px"},
+                        inputStyle={"marginRight": "8px"},
+                        persistence=True,
+                        persistence_type="session",
+                    ),
+
+                    dcc.Checklist(
+                        id="nba-3in4-toggle",
+                        options=[{"label": "3rd game in 4 nights only", "value": "3in4"}],
+                        value=[],
+                        style={"marginBottom": "8px"},
+                        inputStyle={"marginRight": "8px"},
+                        persistence=True,
+                        persistence_type="session",
+                    ),
+
+                    dcc.Checklist(
+                        id="nba-4in6-toggle",
+                        options=[{"label": "4th game in 6 nights only", "value": "4in6"}],
+                        value=[],
+                        style={"marginBottom": "12px"},
+                        inputStyle={"marginRight": "8px"},
+                        persistence=True,
+                        persistence_type="session",
+                    ),
+
+                    html.Label("Days since player's last game"),
+                    dcc.Dropdown(
+                        id="nba-rest-dropdown",
+                        options=rest_days_options(),
+                        value=None,
+                        placeholder="Any",
+                        style={"marginBottom": "12px"},
+                        persistence=True,
+                        persistence_type="session",
+                        clearable=True,
+                    ),
+
+                    html.Label("Team games in last 7 nights"),
+                    dcc.Dropdown(
+                        id="nba-games-last-7-dropdown",
+                        options=[{"label": f"{n} or more", "value": n} for n in (2, 3, 4)],
+                        value=None,
+                        placeholder="Any",
+                        style={"marginBottom": "12px"},
+                        persistence=True,
+                        persistence_type="session",
+                        clearable=True,
+                    ),
+                ],
+                style={"marginTop": "6px"},
+            ),
+
+            # Status / errors
+            html.Div(
+                id="nba-data-load-status",
+                style={"marginTop": "12px", "color": "#b00020", "fontSize": "12px"},
+            ),
+
+            # Initial load trigger (used by callbacks file)
+            dcc.Interval(id="nba-init", interval=500, n_intervals=0, max_intervals=1),
+        ],
+        style={
+            "width": "22%",
+            "padding": "20px",
+            "backgroundColor": "#f8f9fa",
+            "borderRight": "2px solid #dee2e6",
+            "height": "100vh",
+            "position": "fixed",
+            "overflowY": "auto",
+        }),
+
+        # ---------- Main Content ----------
+        html.Div([
+            html.H2("Game-by-Game Chart", style={"marginTop": "20px"}),
+
+            dcc.Loading(
+                dcc.Graph(id="nba-stats-game-chart", config={"displayModeBar": True}),
+                type="default",
+            ),
+
+            html.Div(id="nba-stats-summary-stats", style={"marginTop": "12px"}),
+
+            html.H3("Over Counts (counts of games ≥ threshold)", style={"marginTop": "20px"}),
+
+            html.Div(id="nba-stats-rates-table", style={"marginTop": "8px"}),
+
+            html.Div(
+                id="nba-stats-rates-footnote",
+                style={"marginTop": "8px", "color": "#666", "fontSize": "12px"},
+            ),
+        ],
+        style={"marginLeft": "24%", "padding": "20px"}),
+    ])
@@ -1,6 +1,8 @@
-import pandas as pd
 from dash import html, dcc, register_page
 
+from background import CANCEL_HIDDEN
+from query_backend import get_backend
+
 # -------------------------------------------------
 # Register Dash Page
 # -------------------------------------------------
@@ -11,78 +13,58 @@ register_page(
     title="NBA In/Out Analysis"
 )
 
-# -------------------------------------------------
-# Load data ONCE
-# -------------------------------------------------
-stats_file = r"https://raw.githubusercontent.com/mtdewrocks/sports_analysis/main/data/NBA_Player_Stats.parquet"
-df_stats = pd.read_parquet(stats_file)
-
-df_stats.columns = (
-    df_stats.columns
-    .str.strip()
-    .str.lower()
-    .str.replace(" ", "_")
-)
-
-df_impact = df_stats.copy()
-
-# -------------------------------------------------
-# Columns to exclude from impact stats
-# -------------------------------------------------
-exclude_stats = {
-    "fg%", "3p%", "ft%", "gameid", "fp", "+/-", "ftm", "fta",
-    "oreb", "dreb", "date", "dbldbl", "trpldbl", "fgm"
-}
-
-impact_stat_cols = [
-    c for c in df_impact.columns
-    if c not in [
-        "player", "team", "match_up", "game_date", "w/l",
-        "location", "opponent", "season", "played"
-    ]
-    and c not in exclude_stats
-]
-
 # -------------------------------------------------
 # Page Layout
 # -------------------------------------------------
-layout = html.Div([
+def layout(**kwargs):
+    return html.Div([
+
+        html.H2("Player Absence Impact", style={"marginBottom": "20px"}),
 
-    html.H2("Player Absence Impact", style={"marginBottom": "20px"}),
+        # Player A selection
+        html.Label("Select Player A"),
+        dcc.Dropdown(
+            id="nba-impact-player-a",
+            options=[{"label": p, "value": p} for p in get_backend().impact_players()],
+            placeholder="Choose Player A",
+            style={"marginBottom": "12px"},
+            persistence=True,
+            persistence_type="session",
+        ),
 
-    # Player A selection
-    html.Label("Select Player A"),
-    dcc.Dropdown(
-        id="nba-impact-player-a",
-        options=[{"label": p, "value": p} for p in sorted(df_impact["player"].unique())],
-        placeholder="Choose Player A",
-        style={"marginBottom": "12px"},
-        persistence=True,
-        persistence_type="session",
-    ),
+        # Exclude teammates
+        html.Label("Exclude up to two teammates"),
+        dcc.Dropdown(
+            id="nba-impact-exclude-players",
+            options=[],  # dynamically updated via callback
+            value=[],
+            multi=True,
+            style={"marginBottom": "20px"},
+            persistence=True,
+            persistence_type="session",
+        ),
 
-    # Exclude teammates
-    html.Label("Exclude up to two teammates"),
-    dcc.Dropdown(
-        id="nba-impact-exclude-players",
-        options=[],  # dynamically updated via callback
-        value=[],
-        multi=True,
-        style={"marginBottom": "20px"},
-        persistence=True,
-        persistence_type="session",
-    ),
+        html.Hr(),
 
-    html.Hr(),
+        # Buttons for selecting which stat to analyze
+        html.Div(
+            id="nba-impact-stat-buttons",
+            style={"marginBottom": "20px"}
+        ),
 
-    # Buttons for selecting which stat to analyze
-    html.Div(
-        id="nba-impact-stat-buttons",
-        style={"marginBottom": "20px"}
-    ),
+        html.Hr(),
 
-    html.Hr(),
+        # Progress + cancel for the background chart job
+        html.Div(
+            [
+                html.Span(id="nba-impact-progress", style={"fontSize": "13px", "color": "#555"}),
+                html.Button("Cancel", id="nba-impact-cancel", n_clicks=0, style=CANCEL_HIDDEN),
+            ],
+            style={"marginBottom": "8px"},
+        ),
 
-    # Chart container
-    html.Div(id="nba-impact-chart-container"),
-])
+        # Chart container; charts with exclusions are computed by a
+        # background job started through the store
+        dcc.Store(id="nba-impact-job"),
+        html.Div(id="nba-impact-chart-container"),
+    ])
@@ -1,13 +1,25 @@
 import os
-from functools import lru_cache
+import time
 from io import BytesIO
 from pathlib import Path
 
 import dash
-from dash import html, dcc, Input, Output, callback, get_asset_url
+from dash import html, dcc, Input, Output, callback
 import pandas as pd
 import requests
 
+from background import (
+    BACKGROUND_POLL_MS,
+    CANCEL_HIDDEN,
+    CANCEL_SHOWN,
+    background_manager,
+    bump_generation,
+    generation,
+)
+from caching import shared_cache, single_flight
+from data_store import _forget_version, _record_version, source_version
+from images import logo_src
+
 # -------------------------------------------------
 # REGISTER PAGE
 # -------------------------------------------------
@@ -92,13 +104,15 @@ def _read_excel_anywhere(path_or_url: str) -> pd.DataFrame:
     """
     if _is_url(path_or_url):
         content = _fetch_bytes(path_or_url)
+        _record_version(path_or_url, content)
         return pd.read_excel(BytesIO(content), engine="openpyxl")
+    _record_version(path_or_url)
     return pd.read_excel(path_or_url, engine="openpyxl")
 
 # -------------------------------------------------
 # Cached loader
 # -------------------------------------------------
-@lru_cache(maxsize=1)
+@single_flight(maxsize=1)
 def get_data():
     """
     Loads team stats + schedule once per process.
@@ -130,6 +144,40 @@ def get_data():
 
 def invalidate_cache():
     get_data.cache_clear()
+    _forget_version(TEAM_STATS_FILE, SCHEDULE_FILE)
+
+
+# Reloads run in background job processes; they bump this generation so
+# every worker drops its copy on the next read. Workers read the shared
+# counter at most once per NFL_GENERATION_CHECK_S (and never at import).
+NFL_GENERATION_CHECK_S = float(os.getenv("NFL_GENERATION_CHECK_S", "5"))
+
+_seen = {"generation": None, "value": None, "checked": 0.0}
+
+
+def _generation() -> int:
+    now = time.monotonic()
+    if _seen["value"] is None or now - _seen["checked"] >= NFL_GENERATION_CHECK_S:
+        _seen["value"] = generation("nfl_matchup")
+        _seen["checked"] = now
+    return _seen["value"]
+
+
+def current_data():
+    gen = _generation()
+    if _seen["generation"] is None:
+        _seen["generation"] = gen
+    elif gen != _seen["generation"]:
+        invalidate_cache()
+        _seen["generation"] = gen
+    return get_data()
+
+
+def data_version() -> str:
+    """Snapshot token for results built from the matchup data."""
+    # load first, so URL sources carry their content hash in every worker
+    current_data()
+    return "|".join(source_version(p) for p in (TEAM_STATS_FILE, SCHEDULE_FILE))
 
 # -------------------------------------------------
 # TABLE BUILDER
@@ -172,58 +220,63 @@ def build_team_table(df: pd.DataFrame, rank_cols: list[str], team: str):
 # -------------------------------------------------
 # PAGE LAYOUT
 # -------------------------------------------------
-layout = html.Div(
-    [
-        html.H1("NFL Matchup Breakdown", style={"textAlign": "center"}),
-
-        # init trigger to populate dropdown after page renders
-        dcc.Interval(id="nfl-matchups-init", interval=300, n_intervals=0, max_intervals=1),
-
-        # optional reload button
-        html.Div(
-            html.Button("Reload data", id="nfl-matchups-reload", n_clicks=0),
-            style={"textAlign": "center", "marginBottom": "8px"},
-        ),
-
-        # status/errors shown here
-        html.Div(
-            id="nfl-matchups-status",
-            style={"textAlign": "center", "fontSize": "12px", "color": "#b00020", "marginBottom": "8px"},
-        ),
-
-        dcc.Dropdown(
-            id="matchup-dropdown",
-            options=[],      # ✅ populated by callback
-            value=None,      # ✅ set by callback
-            clearable=False,
-            style={"width": "400px", "margin": "auto"},
-        ),
-
-        html.Br(),
-
-        html.Div(
-            [
-                html.Div(
-                    [
-                        html.Img(id="away-logo", className="team-logo"),
-                        html.H3(id="away-team"),
-                        html.Div(id="away-table"),
-                    ],
-                    className="team-panel",
-                ),
-                html.Div(
-                    [
-                        html.Img(id="home-logo", className="team-logo"),
-                        html.H3(id="home-team"),
-                        html.Div(id="home-table"),
-                    ],
-                    className="team-panel",
-                ),
-            ],
-            className="matchup-container",
-        ),
-    ]
-)
+def layout(**kwargs):
+    return html.Div(
+        [
+            html.H1("NFL Matchup Breakdown", style={"textAlign": "center"}),
+
+            # init trigger to populate dropdown after page renders
+            dcc.Interval(id="nfl-matchups-init", interval=300, n_intervals=0, max_intervals=1),
+
+            # optional reload button (+ cancel while a load is running)
+            html.Div(
+                [
+                    html.Button("Reload data", id="nfl-matchups-reload", n_clicks=0),
+                    html.Button("Cancel", id="nfl-matchups-cancel", n_clicks=0, style=CANCEL_HIDDEN),
+                    html.Div(id="nfl-matchups-progress", style={"fontSize": "12px", "color": "#555"}),
+                ],
+                style={"textAlign": "center", "marginBottom": "8px"},
+            ),
+
+            # status/errors shown here
+            html.Div(
+                id="nfl-matchups-status",
+                style={"textAlign": "center", "fontSize": "12px", "color": "#b00020", "marginBottom": "8px"},
+            ),
+
+            dcc.Dropdown(
+                id="matchup-dropdown",
+                options=[],      # ✅ populated by callback
+                value=None,      # ✅ set by callback
+                clearable=False,
+                style={"width": "400px", "margin": "auto"},
+            ),
+
+            html.Br(),
+
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Img(id="away-logo", className="team-logo"),
+                            html.H3(id="away-team"),
+                            html.Div(id="away-table"),
+                        ],
+                        className="team-panel",
+                    ),
+                    html.Div(
+                        [
+                            html.Img(id="home-logo", className="team-logo"),
+                            html.H3(id="home-team"),
+                            html.Div(id="home-table"),
+                        ],
+                        className="team-panel",
+                    ),
+                ],
+                className="matchup-container",
+            ),
+        ]
+    )
 
 # -------------------------------------------------
 # INIT: populate dropdown options + default value
@@ -234,13 +287,29 @@ layout = html.Div(
     Output("nfl-matchups-status", "children"),
     Input("nfl-matchups-init", "n_intervals"),
     Input("nfl-matchups-reload", "n_clicks"),
+    background=True,
+    manager=background_manager,
+    interval=BACKGROUND_POLL_MS,
+    running=[
+        (Output("nfl-matchups-reload", "disabled"), True, False),
+        (Output("nfl-matchups-cancel", "style"), CANCEL_SHOWN, CANCEL_HIDDEN),
+    ],
+    progress=[Output("nfl-matchups-progress", "children")],
+    progress_default=[""],
+    cancel=[Input("nfl-matchups-cancel", "n_clicks")],
 )
-def init_matchup_dropdown(_ticks, reload_clicks):
+def init_matchup_dropdown(set_progress, _ticks, reload_clicks):
+    # runs in a background job process: reading the Excel files (or
+    # downloading them) no longer holds a request thread
     if reload_clicks and reload_clicks > 0:
+        set_progress(("Reloading team stats and schedule...",))
         invalidate_cache()
+        bump_generation("nfl_matchup")
+    else:
+        set_progress(("Loading matchups...",))
 
     try:
-        _df, _sch, matchups, _rank_cols = get_data()
+        _df, _sch, matchups, _rank_cols = current_data()
         opts = [{"label": m, "value": m} for m in matchups]
         default_val = matchups[0] if matchups else None
         status = "" if matchups else "No matchups found (check schedule week / columns)."
@@ -261,18 +330,19 @@ def init_matchup_dropdown(_ticks, reload_clicks):
     Output("home-table", "children"),
     Input("matchup-dropdown", "value"),
 )
+@shared_cache(snapshot=data_version)
 def update_matchup(matchup):
     if not matchup:
         return "", "", "", "", "", ""
 
-    df, _sch, _matchups, rank_cols = get_data()
+    df, _sch, _matchups, rank_cols = current_data()
     away, home = matchup.split(" @ ")
 
     return (
         away,
         home,
-        get_asset_url(f"logos/{away}.jpg"),
-        get_asset_url(f"logos/{home}.jpg"),
+        logo_src(away),
+        logo_src(home),
         build_team_table(df, rank_cols, away),
         build_team_table(df, rank_cols, home),
     )
@@ -0,0 +1,48 @@
+# -----------------------------
+# League percentile ranks
+# -----------------------------
+# Percentiles of any set of metrics for every player of a stat frame in one
+# rank pass: lower-is-better metrics are negated, then a single
+# DataFrame.rank ranks all columns at once. Results use Baseball Savant's
+# scale: 1 (worst in the frame) to 100 (best), missing values stay missing.
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Metric = namedtuple("Metric", ["column", "higher_is_better"])
+
+
+def parse_metrics(spec: str) -> list[Metric]:
+    """"ERA-,K/IP,SO" -> metrics; a trailing "-" marks lower-is-better."""
+    metrics = []
+    for part in spec.split(","):
+        part = part.strip()
+        if part:
+            metrics.append(Metric(part.rstrip("-").strip(), not part.endswith("-")))
+    return metrics
+
+
+def percentile_ranks(frame: pd.DataFrame, metrics: list[Metric], key: str) -> pd.DataFrame:
+    """
+    One row per `key` (first row of each), one column per metric present in
+    the frame, holding the 1-100 league percentile of the player's value.
+    """
+    metrics = [m for m in metrics if m.column in frame.columns]
+    frame = frame.dropna(subset=[key]).drop_duplicates(key)
+    cols = [m.column for m in metrics]
+    signs = np.array([1.0 if m.higher_is_better else -1.0 for m in metrics])
+
+    values = frame[cols].apply(pd.to_numeric, errors="coerce") * signs
+    rank = values.rank(method="average")
+    spread = (values.count() - 1).clip(lower=1)
+    pct = ((rank - 1) / spread * 99 + 1).round()
+    pct.index = pd.Index(frame[key].tolist(), name=key)
+    return pct
+
+
+def long_percentiles(pct: pd.DataFrame) -> pd.DataFrame:
+    """percentile_ranks output -> rows of (key, Statistic, Percentile), missing ones dropped."""
+    key = pct.index.name
+    out = pct.stack().dropna().astype("int64").rename("Percentile").reset_index()
+    return out.rename(columns={out.columns[1]: "Statistic"})[[key, "Statistic", "Percentile"]]
@@ -0,0 +1,218 @@
+# -----------------------------
+# On-demand callback profiling
+# -----------------------------
+# Opt-in only. Arm a callback for its next N invocations with either
+#
+#   PROFILE_CALLBACKS="update_impact_chart:5,props_update_table"   (env, at boot)
+#   X-Profile-Callback: update_impact_chart:5                      (request header,
+#       needs X-Admin-Token == ADMIN_TOKEN)
+#
+# Each profiled invocation writes to PROFILE_DIR:
+#   <stamp>_<callback>.pstats     cProfile stats (python -m pstats / snakeviz)
+#   <stamp>_<callback>.collapsed  sampled stacks, "frame;frame;frame count"
+#                                 (flamegraph.pl / speedscope)
+#
+# When nothing is armed the wrapper costs one dict lookup per callback.
+import cProfile
+import hmac
+import os
+import sys
+import tempfile
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "sports_profiles")))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# callback function name -> invocations left to profile
+_ARMED: dict[str, int] = {}
+_ARMED_LOCK = threading.Lock()
+
+
+def _reset_armed_lock():
+    global _ARMED_LOCK
+    _ARMED_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_armed_lock)
+
+
+def _parse_spec(spec: str) -> dict[str, int]:
+    armed = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, n = part.partition(":")
+        armed[name.strip()] = int(n) if n.strip() else 1
+    return armed
+
+
+def arm(callback_name: str, n: int = 1):
+    with _ARMED_LOCK:
+        _ARMED[callback_name] = _ARMED.get(callback_name, 0) + max(1, int(n))
+    print(f"[profiling] Armed {callback_name} for {n} invocation(s)", flush=True)
+
+
+def armed() -> dict[str, int]:
+    with _ARMED_LOCK:
+        return dict(_ARMED)
+
+
+def _take(callback_name: str) -> bool:
+    with _ARMED_LOCK:
+        left = _ARMED.get(callback_name, 0)
+        if left <= 0:
+            return False
+        if left == 1:
+            del _ARMED[callback_name]
+        else:
+            _ARMED[callback_name] = left - 1
+        return True
+
+
+for _name, _n in _parse_spec(os.getenv("PROFILE_CALLBACKS", "")).items():
+    _ARMED[_name] = _n
+
+
+# -----------------------------
+# Stack sampler (collapsed-stack output)
+# -----------------------------
+class _StackSampler:
+    """Samples one thread's Python stack on a background thread."""
+
+    def __init__(self, thread_id: int, interval_s: float):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.counts: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _profile_call(callback_name: str, func, args, kwargs):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+    base = PROFILE_DIR / f"{stamp}_{callback_name}"
+
+    profiler = cProfile.Profile()
+    sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+    t0 = time.perf_counter()
+    try:
+        with sampler:
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+    finally:
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        profiler.dump_stats(str(base) + ".pstats")
+        with open(str(base) + ".collapsed", "w") as fh:
+            for stack, n in sorted(sampler.counts.items()):
+                fh.write(f"{stack} {n}\n")
+        print(f"[profiling] {callback_name}: {elapsed_ms:.1f} ms -> {base}.pstats/.collapsed", flush=True)
+
+
+# -----------------------------
+# Dash / Flask integration
+# -----------------------------
+def _wrap(func):
+    if getattr(func, "_profiling_wrapped", False):
+        return func
+    callback_name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _ARMED or callback_name not in _ARMED or not _take(callback_name):
+            return func(*args, **kwargs)
+        return _profile_call(callback_name, func, args, kwargs)
+
+    wrapper._profiling_wrapped = True
+    return wrapper
+
+
+def instrument_callbacks(dash_app) -> int:
+    """Makes every registered Dash callback armable by function name."""
+    from dash import _callback
+
+    wrapped = 0
+    for callback_map in (_callback.GLOBAL_CALLBACK_MAP, dash_app.callback_map):
+        for spec in callback_map.values():
+            func = spec.get("callback")
+            if func is None or getattr(func, "_profiling_wrapped", False):
+                continue
+            spec["callback"] = _wrap(func)
+            wrapped += 1
+    return wrapped
+
+
+def is_admin(request) -> bool:
+    """
+    True when ADMIN_TOKEN is set and the request presents it in the
+    X-Admin-Token header (never the query string, which access logs keep).
+    """
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get("X-Admin-Token", "")
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def register_admin_routes(server):
+    """
+    Adds the X-Profile-Callback header hook and the admin routes:
+      GET /admin/profiles          list captured files (JSON)
+      GET /admin/profiles/<name>   download one file
+    Admin routes answer 404 unless ADMIN_TOKEN is set and presented.
+    """
+    from flask import abort, jsonify, request, send_from_directory
+
+    @server.before_request
+    def _arm_from_header():
+        spec = request.headers.get("X-Profile-Callback")
+        if spec and is_admin(request):
+            for name, n in _parse_spec(spec).items():
+                arm(name, n)
+
+    @server.route("/admin/profiles")
+    def list_profiles():
+        if not is_admin(request):
+            abort(404)
+        files = []
+        if PROFILE_DIR.is_dir():
+            for p in sorted(PROFILE_DIR.iterdir(), reverse=True):
+                if p.suffix in (".pstats", ".collapsed"):
+                    st = p.stat()
+                    files.append({"name": p.name, "bytes": st.st_size, "modified": int(st.st_mtime)})
+        return jsonify({"dir": str(PROFILE_DIR), "armed": armed(), "files": files})
+
+    @server.route("/admin/profiles/<path:name>")
+    def get_profile(name):
+        if not is_admin(request):
+            abort(404)
+        if not name.endswith((".pstats", ".collapsed")):
+            abort(404)
+        return send_from_directory(PROFILE_DIR, name, as_attachment=True)
@@ -0,0 +1,833 @@
+# query_backend.py
+# -----------------------------
+# Pluggable query engine for the game log callbacks
+# -----------------------------
+# GAMELOG_BACKEND=pandas (default) filters the cached in-memory frames from
+# data_store. GAMELOG_BACKEND=duckdb runs the same with/without, schedule and
+# impact logic as SQL over the parquet files in place (duckdb is an optional
+# dependency, only imported when that backend is selected).
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from caching import single_flight
+from data_store import (
+    _normalize_name,
+    get_nba_df,
+    get_nba_impact_df,
+    get_nba_impact_stat_cols,
+    get_nfl_player_df,
+    get_nfl_team_weeks,
+    has_partitioned_store,
+    local_copy,
+    nba_seasons,
+    GAMELOG_DATASET_ROOT,
+    NBA_DATE_COL,
+    NBA_IMPACT_FILE,
+    NBA_PLAYER_COL,
+    NBA_SEASON_START_MONTH,
+    NBA_STATS_FILE,
+    NFL_DATE_COL,
+    NFL_PLAYER_COL,
+    NFL_STATS_FILE,
+)
+from schedule_features import (
+    NBA_PLAYER_SCHEDULE_COLS,
+    NBA_SCHEDULE_COLS,
+    PLAYER_PREFIX,
+    REST_DAYS_MAX,
+    add_nfl_schedule_features,
+)
+
+GAMELOG_BACKEND = os.getenv("GAMELOG_BACKEND", "pandas").strip().lower()
+
+player_col = NBA_PLAYER_COL
+date_col = NBA_DATE_COL
+
+TEAM_COL_CANDIDATES = ["team", "team_abbreviation", "tm", "team_name", "team_id"]
+
+
+# -------------------------------------------------
+# Pandas helpers (shared by the pandas backend and the callbacks)
+# -------------------------------------------------
+def schedule_conditions(b2b_toggle=None, three_in_four_toggle=None, four_in_six_toggle=None,
+                        rest_days=None, min_games_last_7=None) -> list[tuple[str, str, int]]:
+    """
+    The NBA schedule filters as (column, "=" or ">=", value), shared by both
+    backends. Toggles come from the page's checklists ([] or [value]);
+    rest_days filters on days since the player's own last game.
+    """
+    conditions = []
+    if b2b_toggle and "b2b2" in b2b_toggle:
+        conditions.append(("back_to_back", "=", 1))
+    if three_in_four_toggle and "3in4" in three_in_four_toggle:
+        conditions.append(("third_in_four", "=", 1))
+    if four_in_six_toggle and "4in6" in four_in_six_toggle:
+        conditions.append(("fourth_in_six", "=", 1))
+    if rest_days is not None:
+        rest_days = int(rest_days)
+        conditions.append((PLAYER_PREFIX + "rest_days", ">=" if rest_days >= REST_DAYS_MAX else "=", rest_days))
+    if min_games_last_7:
+        conditions.append(("games_last_7", ">=", int(min_games_last_7)))
+    return conditions
+
+
+def apply_schedule_filters(sub: pd.DataFrame, b2b_toggle, three_in_four_toggle, four_in_six_toggle=None,
+                           rest_days=None, min_games_last_7=None) -> pd.DataFrame:
+    """
+    Rows matching every schedule filter (schedule_conditions). The columns
+    are derived at load (schedule_features); a frame without them (no game
+    dates) has no matching rows.
+    """
+    for col, op, value in schedule_conditions(
+        b2b_toggle, three_in_four_toggle, four_in_six_toggle, rest_days, min_games_last_7
+    ):
+        if col not in sub.columns:
+            return sub.iloc[0:0]
+        sub = sub[sub[col] >= value] if op == ">=" else sub[sub[col] == value]
+    return sub
+
+
+def apply_nfl_schedule_filters(sub: pd.DataFrame, schedule_toggle) -> pd.DataFrame:
+    """
+    schedule_toggle comes from id='nfl-schedule-toggle' -> a subset of
+    ['short', 'bye']: short weeks only / games off a bye only.
+    """
+    for value, col in (("short", "short_week"), ("bye", "off_bye")):
+        if schedule_toggle and value in schedule_toggle:
+            if col not in sub.columns:
+                return sub.iloc[0:0]
+            sub = sub[sub[col] == 1]
+    return sub
+
+
+def _first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    for c in candidates:
+        if c in df.columns:
+            return c
+    return None
+
+
+def _latest_team_for_player(df: pd.DataFrame, team_col: str, player: str) -> str | None:
+    """
+    For traded players, choose team based on most recent game_date.
+    Prefer played==1 rows if available.
+    """
+    if not player or team_col not in df.columns or date_col not in df.columns:
+        return None
+
+    tmp = df[df[player_col] == player].copy()
+    if tmp.empty:
+        return None
+
+    tmp[date_col] = pd.to_datetime(tmp[date_col], errors="coerce")
+    tmp = tmp.dropna(subset=[date_col, team_col])
+    if tmp.empty:
+        return None
+
+    if "played" in tmp.columns:
+        tmp_played = tmp[tmp["played"] == 1]
+        if not tmp_played.empty:
+            tmp = tmp_played
+
+    tmp = tmp.sort_values(date_col)
+    return str(tmp.iloc[-1][team_col])
+
+
+def teammates_for_player(df: pd.DataFrame, player: str) -> list[str]:
+    """
+    Returns other players on the same team as `player` (based on latest team).
+    Falls back to all other players if no team column exists.
+    """
+    if not player:
+        return []
+
+    team_col = _first_existing_col(df, TEAM_COL_CANDIDATES)
+    if not team_col:
+        return sorted([p for p in df[player_col].dropna().unique() if p != player])
+
+    team_val = _latest_team_for_player(df, team_col, player)
+    if not team_val:
+        return sorted([p for p in df[player_col].dropna().unique() if p != player])
+
+    team_mask = df[team_col].astype(str) == str(team_val)
+    teammates = df.loc[team_mask, player_col].dropna().unique().tolist()
+    return sorted([p for p in teammates if p != player])
+
+
+def apply_with_without_filters(
+    df: pd.DataFrame,
+    main_player: str,
+    with_player: str | None,
+    without_player: str | None,
+) -> tuple[pd.DataFrame, str]:
+    """
+    Returns:
+      - MAIN PLAYER rows only, filtered by with/without logic
+      - suffix label for chart title / notes
+
+    Requires 'played' column.
+    """
+    if not main_player:
+        return df.iloc[0:0].copy(), ""
+
+    if "played" not in df.columns:
+        raise ValueError("Missing required column 'played' in NBA dataset.")
+
+    # main player rows
+    sub = df[df[player_col] == main_player].copy()
+
+    # default: show games where main played
+    if not with_player and not without_player:
+        sub = sub[sub["played"] == 1]
+        return sub, ""
+
+    suffix_parts = []
+
+    # WITH: dates where both players played => sum(played) across those two players == 2
+    if with_player:
+        pair = df[df[player_col].isin([main_player, with_player])].copy()
+        g = pair.groupby(date_col, dropna=False)["played"].sum()
+        with_dates = set(g[g == 2].index.tolist())
+        sub = sub[sub[date_col].isin(with_dates)]
+        suffix_parts.append(f"WITH: {with_player}")
+
+    # WITHOUT: dates where main played and other did not (missing row or played==0)
+    if without_player:
+        # keep the datetime array (Series.unique().tolist() yields ints on older pandas)
+        without_played_dates = (
+            df.loc[(df[player_col] == without_player) & (df["played"] == 1), date_col]
+            .dropna()
+            .unique()
+        )
+        sub = sub[(sub["played"] == 1) & (~sub[date_col].isin(without_played_dates))]
+        suffix_parts.append(f"WITHOUT: {without_player}")
+
+    suffix = " | " + " & ".join(suffix_parts) if suffix_parts else ""
+    return sub, suffix
+
+
+def with_without_suffix(with_player: str | None, without_player: str | None) -> str:
+    parts = []
+    if with_player:
+        parts.append(f"WITH: {with_player}")
+    if without_player:
+        parts.append(f"WITHOUT: {without_player}")
+    return " | " + " & ".join(parts) if parts else ""
+
+
+# -------------------------------------------------
+# Backend interface
+# -------------------------------------------------
+class GameLogBackend:
+    """
+    Query interface used by the NBA/NFL game log and NBA impact callbacks.
+    Implementations must return the same frames for the same inputs.
+    """
+
+    name = "base"
+
+    def nba_seasons(self) -> list[int]:
+        raise NotImplementedError
+
+    def nba_players(self, season: int | None = None) -> list[str]:
+        raise NotImplementedError
+
+    def nba_teammates(self, player: str, season: int | None = None) -> list[str]:
+        raise NotImplementedError
+
+    def nba_player_games(
+        self,
+        player: str,
+        with_player: str | None = None,
+        without_player: str | None = None,
+        b2b_toggle=None,
+        three_in_four_toggle=None,
+        season: int | None = None,
+        four_in_six_toggle=None,
+        rest_days: int | None = None,
+        min_games_last_7: int | None = None,
+    ) -> tuple[pd.DataFrame, str]:
+        """Main player's rows after WITH/WITHOUT then schedule filters, plus title suffix."""
+        raise NotImplementedError
+
+    def nfl_player_games(self, player: str, stat_col: str, season: int | None = None,
+                         schedule_toggle=None) -> pd.DataFrame:
+        """One player's weekly rows (lookup columns, stat, schedule features) after the schedule filters."""
+        raise NotImplementedError
+
+    def impact_players(self) -> list[str]:
+        raise NotImplementedError
+
+    def impact_teammates(self, player_a: str) -> list[str]:
+        raise NotImplementedError
+
+    def impact_stat_cols(self) -> list[str]:
+        raise NotImplementedError
+
+    def impact_table(self, player_a: str, excluded: list[str], stat: str) -> tuple[pd.DataFrame, str]:
+        """
+        Per-teammate averages of `stat` in games With/Without player_a (and the
+        excluded teammates). Returns (frame with player/With/Without/Difference
+        sorted by Difference desc, error message or "").
+        """
+        raise NotImplementedError
+
+
+# -------------------------------------------------
+# Pandas backend (in-memory frames from data_store)
+# -------------------------------------------------
+class PandasBackend(GameLogBackend):
+    name = "pandas"
+
+    def nba_seasons(self):
+        return nba_seasons()
+
+    def nba_players(self, season=None):
+        df = get_nba_df(season)
+        if df is None or df.empty or player_col not in df.columns:
+            return []
+        return sorted(df[player_col].dropna().unique().tolist())
+
+    def nba_teammates(self, player, season=None):
+        df = get_nba_df(season)
+        if df is None or df.empty:
+            return []
+        return teammates_for_player(df, player)
+
+    def nba_player_games(self, player, with_player=None, without_player=None,
+                         b2b_toggle=None, three_in_four_toggle=None, season=None,
+                         four_in_six_toggle=None, rest_days=None, min_games_last_7=None):
+        df = get_nba_df(season)
+        sub, suffix = apply_with_without_filters(df, player, with_player, without_player)
+        sub = apply_schedule_filters(
+            sub, b2b_toggle, three_in_four_toggle, four_in_six_toggle, rest_days, min_games_last_7
+        )
+        return sub, suffix
+
+    def nfl_player_games(self, player, stat_col, season=None, schedule_toggle=None):
+        return apply_nfl_schedule_filters(get_nfl_player_df(player, stat_col, season), schedule_toggle)
+
+    def impact_players(self):
+        df_impact = get_nba_impact_df()
+        if "player" not in df_impact.columns:
+            return []
+        return sorted(df_impact["player"].dropna().unique().tolist())
+
+    def impact_teammates(self, player_a):
+        df_impact = get_nba_impact_df()
+
+        team_series = df_impact.loc[df_impact["player"] == player_a, "team"]
+        if team_series.empty:
+            return []
+
+        team = team_series.mode()[0]
+
+        teammates = sorted(df_impact[df_impact["team"] == team]["player"].dropna().unique())
+        return [p for p in teammates if p != player_a]
+
+    def impact_stat_cols(self):
+        return get_nba_impact_stat_cols(get_nba_impact_df())
+
+    def impact_table(self, player_a, excluded, stat):
+        df_impact = get_nba_impact_df()
+
+        # Basic validation for expected columns
+        required_cols = {"player", "team", "game_date", "played"}
+        missing = required_cols - set(df_impact.columns)
+        if missing:
+            return pd.DataFrame(), f"Impact dataset missing columns: {', '.join(sorted(missing))}"
+
+        team_series = df_impact.loc[df_impact["player"] == player_a, "team"]
+        if team_series.empty:
+            return pd.DataFrame(), f"No team found for {player_a}."
+        team = team_series.mode()[0]
+
+        team_games = df_impact[df_impact["team"] == team]["game_date"].dropna().unique()
+        team_rows = df_impact[df_impact["team"] == team][["player", "game_date", "played"]].copy()
+
+        game_status = {}
+        for game in team_games:
+            a_played = bool(
+                team_rows[
+                    (team_rows["player"] == player_a) &
+                    (team_rows["game_date"] == game)
+                ]["played"].sum()
+            )
+
+            excluded_played = []
+            for p in excluded:
+                played = bool(
+                    team_rows[
+                        (team_rows["player"] == p) &
+                        (team_rows["game_date"] == game)
+                    ]["played"].sum()
+                )
+                excluded_played.append(played)
+
+            if a_played and all(excluded_played):
+                game_status[game] = "With"
+            elif (not a_played) and all(not x for x in excluded_played):
+                game_status[game] = "Without"
+            else:
+                game_status[game] = "Exclude"
+
+        df_team = df_impact[df_impact["team"] == team].copy()
+        df_team["WithOrWithout"] = df_team["game_date"].map(game_status)
+        df_team = df_team[df_team["WithOrWithout"].isin(["With", "Without"])]
+        df_team = df_team[df_team["player"] != player_a]
+
+        if df_team.empty:
+            return pd.DataFrame(), "No teammate data available after filtering games."
+
+        if stat not in df_team.columns:
+            return pd.DataFrame(), f"Stat '{stat}' not found in dataset."
+
+        df_team[stat] = pd.to_numeric(df_team[stat], errors="coerce")
+        df_team = df_team.dropna(subset=[stat])
+
+        if df_team.empty:
+            return pd.DataFrame(), "No valid values for this stat after cleaning."
+
+        df_grouped = (
+            df_team.groupby(["player", "WithOrWithout"])[stat]
+            .mean()
+            .reset_index()
+        )
+
+        if df_grouped.empty:
+            return pd.DataFrame(), "No grouped data available."
+
+        df_pivot = df_grouped.pivot(
+            index="player",
+            columns="WithOrWithout",
+            values=stat
+        ).reset_index()
+
+        if "With" not in df_pivot.columns or "Without" not in df_pivot.columns:
+            return pd.DataFrame(), "Insufficient With/Without data to compute differences."
+
+        df_pivot = df_pivot.dropna(subset=["With", "Without"])
+        if df_pivot.empty:
+            return pd.DataFrame(), "No players have both With and Without data."
+
+        df_pivot["Difference"] = df_pivot["Without"] - df_pivot["With"]
+        df_pivot = df_pivot.sort_values("Difference", ascending=False)
+        df_pivot.columns.name = None
+        return df_pivot[["player", "With", "Without", "Difference"]].reset_index(drop=True), ""
+
+
+# -------------------------------------------------
+# DuckDB backend (SQL over the parquet files in place)
+# -------------------------------------------------
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _nba_season_sql(raw_by_norm: dict) -> str | None:
+    """data_store.nba_season_of in SQL: the year the season of game_date starts in."""
+    raw = raw_by_norm.get(NBA_DATE_COL)
+    if raw is None:
+        return None
+    d = f"TRY_CAST({_quote_ident(raw)} AS DATE)"
+    return f"CAST(year({d}) - CASE WHEN month({d}) < {NBA_SEASON_START_MONTH} THEN 1 ELSE 0 END AS INTEGER)"
+
+
+class DuckDBBackend(GameLogBackend):
+    name = "duckdb"
+
+    def __init__(self):
+        import duckdb
+
+        self._con = duckdb.connect(database=":memory:")
+        self._lock = threading.Lock()
+        self._columns = {}
+
+        partitioned = has_partitioned_store()
+        if partitioned:
+            nba_src = self._scan_sql(str(Path(GAMELOG_DATASET_ROOT) / "sport=nba" / "**" / "*.parquet"), hive=True)
+            nfl_src = self._scan_sql(str(Path(GAMELOG_DATASET_ROOT) / "sport=nfl" / "**" / "*.parquet"), hive=True)
+        else:
+            nba_src = self._scan_sql(local_copy(NBA_STATS_FILE))
+            nfl_src = self._scan_sql(local_copy(NFL_STATS_FILE))
+        impact_src = self._scan_sql(local_copy(NBA_IMPACT_FILE))
+
+        # partitions already carry the date-derived season (partition_game_logs)
+        self._create_view("nba_log", nba_src, derived=None if partitioned else {"season": _nba_season_sql})
+        self._create_schedule_view("nba", "nba_log")
+        self._create_view("nfl", nfl_src)
+        self._create_view("nba_impact", impact_src)
+
+    @staticmethod
+    def _scan_sql(path: str, hive: bool = False) -> str:
+        path_sql = "'" + path.replace("'", "''") + "'"
+        if hive:
+            return f"read_parquet({path_sql}, hive_partitioning = true)"
+        return f"read_parquet({path_sql})"
+
+    def _create_view(self, name: str, source_sql: str, derived: dict | None = None):
+        # Expose normalized column names, matching data_store._normalize_cols;
+        # `derived` replaces a column by a SQL expression over the raw columns
+        described = self._con.execute(f"DESCRIBE SELECT * FROM {source_sql}").fetchall()
+        raw_by_norm = {_normalize_name(raw): raw for raw, *_ in described}
+        select = []
+        types = {}
+        for raw, col_type, *_ in described:
+            norm = _normalize_name(raw)
+            if norm == "month":
+                continue
+            if norm in (derived or {}):
+                continue
+            select.append(f"{_quote_ident(raw)} AS {_quote_ident(norm)}")
+            types[norm] = col_type
+        for norm, expr in (derived or {}).items():
+            sql = expr(raw_by_norm)
+            if sql is not None:
+                select.append(f"{sql} AS {_quote_ident(norm)}")
+                types[norm] = "INTEGER"
+        self._con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT {', '.join(select)} FROM {source_sql}")
+        self._columns[name] = types
+
+    def _create_schedule_view(self, name: str, log_view: str):
+        """
+        View `name`: `log_view` plus the schedule features of
+        schedule_features.add_nba_schedule_features. The features of each
+        team and player game day are window functions computed once into
+        small tables at startup; the view only joins them to the log rows.
+        """
+        cols = self._columns[log_view]
+        if NBA_DATE_COL not in cols or NBA_PLAYER_COL not in cols:
+            self._create_view(name, log_view)
+            return
+
+        season = ["season"] if "season" in cols else []
+        played = "played = 1" if "played" in cols else "TRUE"
+        self._con.execute(
+            f"CREATE OR REPLACE TABLE {name}_player_days AS "
+            + self._game_density_sql(log_view, season + [NBA_PLAYER_COL], PLAYER_PREFIX, played)
+        )
+        joins = [f"LEFT JOIN {name}_player_days p ON {self._game_day_join('p', season + [NBA_PLAYER_COL])}"]
+
+        def features(alias, prefix, out_prefix, gate=None):
+            # gating in the select (not the join condition) keeps the joins hash joins
+            out = []
+            for c in NBA_SCHEDULE_COLS:
+                value = f"{alias}.{prefix}{c}"
+                if gate:
+                    value = f"CASE WHEN {gate} THEN {value} END"
+                if c != "rest_days":
+                    value = f"CAST(coalesce({value}, 0) AS TINYINT)"
+                out.append(f"{value} AS {out_prefix}{c}")
+            return out
+
+        gate = "l.played = 1" if "played" in cols else None
+        if "team" in cols:
+            self._con.execute(
+                f"CREATE OR REPLACE TABLE {name}_team_days AS "
+                + self._game_density_sql(log_view, season + ["team"], "", "TRUE")
+            )
+            joins.append(f"LEFT JOIN {name}_team_days t ON {self._game_day_join('t', season + ['team'])}")
+            selected = features("t", "", "")
+        else:  # no team column: the player's own games, like the pandas side
+            selected = features("p", PLAYER_PREFIX, "", gate)
+        selected += features("p", PLAYER_PREFIX, PLAYER_PREFIX, gate)
+
+        derived = [c for c in NBA_SCHEDULE_COLS + NBA_PLAYER_SCHEDULE_COLS if c in cols]
+        exclude = f" EXCLUDE ({', '.join(_quote_ident(c) for c in derived)})" if derived else ""
+        self._con.execute(
+            f"CREATE OR REPLACE VIEW {name} AS SELECT l.*{exclude}, {', '.join(selected)} "
+            f"FROM {log_view} l {' '.join(joins)}"
+        )
+        described = self._con.execute(f"DESCRIBE SELECT * FROM {name}").fetchall()
+        self._columns[name] = {col: col_type for col, col_type, *_ in described}
+
+    @staticmethod
+    def _game_day_join(alias: str, keys: list[str]) -> str:
+        on = " AND ".join(f"l.{_quote_ident(k)} = {alias}.{_quote_ident(k)}" for k in keys)
+        return f"{on} AND CAST(l.{NBA_DATE_COL} AS DATE) = {alias}.d"
+
+    @staticmethod
+    def _game_density_sql(log_view: str, keys: list[str], prefix: str, where: str) -> str:
+        """One row per entity game day with NBA_SCHEDULE_COLS (named with `prefix`)."""
+        part = ", ".join(_quote_ident(k) for k in keys)
+        window = f"PARTITION BY {part} ORDER BY d"
+
+        def games_in(nights):
+            return f"count(*) OVER ({window} RANGE BETWEEN INTERVAL {nights - 1} DAYS PRECEDING AND CURRENT ROW)"
+
+        not_null = " AND ".join(f"{_quote_ident(k)} IS NOT NULL" for k in keys)
+        return f"""
+            SELECT {part}, d,
+                CAST(date_diff('day', lag(d) OVER ({window}), d) AS FLOAT) AS {prefix}rest_days,
+                CAST({games_in(2)} >= 2 AS TINYINT) AS {prefix}back_to_back,
+                CAST({games_in(4)} >= 3 AS TINYINT) AS {prefix}third_in_four,
+                CAST({games_in(6)} >= 4 AS TINYINT) AS {prefix}fourth_in_six,
+                CAST({games_in(7)} AS TINYINT) AS {prefix}games_last_7
+            FROM (
+                SELECT DISTINCT {part}, CAST({NBA_DATE_COL} AS DATE) AS d FROM {log_view}
+                WHERE {NBA_DATE_COL} IS NOT NULL AND {not_null} AND {where}
+            )
+        """
+
+    def _query(self, sql: str, params: list | None = None) -> pd.DataFrame:
+        # one cursor per call: cursors are independent connections to the same db
+        with self._lock:
+            cur = self._con.cursor()
+        try:
+            return cur.execute(sql, params or []).df()
+        finally:
+            cur.close()
+
+    def _season_clause(self, view: str, season) -> tuple[str, list]:
+        if season is None or "season" not in self._columns[view]:
+            return "TRUE", []
+        return "season = ?", [int(season)]
+
+    def nba_seasons(self):
+        if "season" not in self._columns["nba_log"]:
+            return []
+        df = self._query("SELECT DISTINCT season FROM nba_log WHERE season IS NOT NULL ORDER BY season")
+        return [int(s) for s in df["season"]]
+
+    def nba_players(self, season=None):
+        where, params = self._season_clause("nba_log", season)
+        df = self._query(
+            f"SELECT DISTINCT player FROM nba_log WHERE player IS NOT NULL AND {where} ORDER BY player",
+            params,
+        )
+        return df["player"].tolist()
+
+    def nba_teammates(self, player, season=None):
+        if not player:
+            return []
+        where, params = self._season_clause("nba_log", season)
+        team_col = next((c for c in TEAM_COL_CANDIDATES if c in self._columns["nba_log"]), None)
+        if team_col is None:
+            df = self._query(
+                f"SELECT DISTINCT player FROM nba_log WHERE player IS NOT NULL AND player <> ? AND {where} ORDER BY player",
+                [player] + params,
+            )
+            return df["player"].tolist()
+
+        team = _quote_ident(team_col)
+        played_order = "(played = 1) DESC, " if "played" in self._columns["nba_log"] else ""
+        df = self._query(
+            f"""
+            WITH latest AS (
+                SELECT CAST({team} AS VARCHAR) AS team_val
+                FROM nba_log
+                WHERE player = ? AND game_date IS NOT NULL AND {team} IS NOT NULL AND {where}
+                ORDER BY {played_order}game_date DESC
+                LIMIT 1
+            )
+            SELECT DISTINCT player FROM nba_log
+            WHERE player IS NOT NULL AND player <> ? AND {where}
+              AND (
+                NOT EXISTS (SELECT 1 FROM latest)
+                OR CAST({team} AS VARCHAR) = (SELECT team_val FROM latest)
+              )
+            ORDER BY player
+            """,
+            [player] + params + [player] + params,
+        )
+        return df["player"].tolist()
+
+    def nba_player_games(self, player, with_player=None, without_player=None,
+                         b2b_toggle=None, three_in_four_toggle=None, season=None,
+                         four_in_six_toggle=None, rest_days=None, min_games_last_7=None):
+        cols = self._columns["nba"]
+        if not player:
+            return pd.DataFrame(columns=list(cols)), ""
+        if "played" not in cols:
+            raise ValueError("Missing required column 'played' in NBA dataset.")
+
+        season_where, season_params = self._season_clause("nba_log", season)
+        conditions = ["player = ?"]
+        params = [player]
+
+        if not with_player and not without_player:
+            conditions.append("played = 1")
+
+        # WITH: dates where sum(played) across the pair == 2
+        if with_player:
+            conditions.append(
+                f"""game_date IN (
+                    SELECT game_date FROM nba_log
+                    WHERE player IN (?, ?) AND {season_where}
+                    GROUP BY game_date
+                    HAVING sum(played) = 2
+                )"""
+            )
+            params += [player, with_player] + season_params
+
+        # WITHOUT: main played and the other player did not play that date
+        if without_player:
+            conditions.append(
+                f"""played = 1 AND game_date NOT IN (
+                    SELECT game_date FROM nba_log
+                    WHERE player = ? AND played = 1 AND game_date IS NOT NULL AND {season_where}
+                )"""
+            )
+            params += [without_player] + season_params
+
+        # Schedule filters: no matching column => no rows (same as pandas)
+        for col, op, value in schedule_conditions(
+            b2b_toggle, three_in_four_toggle, four_in_six_toggle, rest_days, min_games_last_7
+        ):
+            if col not in cols:
+                conditions.append("FALSE")
+                continue
+            conditions.append(f"{_quote_ident(col)} {op} ?")
+            params.append(value)
+
+        conditions.append(season_where)
+        params += season_params
+
+        sub = self._query(f"SELECT * FROM nba WHERE {' AND '.join(conditions)}", params)
+        return sub, with_without_suffix(with_player, without_player)
+
+    def nfl_player_games(self, player, stat_col, season=None, schedule_toggle=None):
+        cols = self._columns["nfl"]
+        wanted = [NFL_PLAYER_COL, NFL_DATE_COL, "season", "team", stat_col]
+        select = ", ".join(_quote_ident(c) for c in dict.fromkeys(wanted) if c in cols)
+        where, params = self._season_clause("nfl", season)
+        sub = self._query(
+            f"SELECT {select} FROM nfl WHERE {_quote_ident(NFL_PLAYER_COL)} = ? AND {where}",
+            [player] + params,
+        )
+        # weekly features come from the schedule, so one player's rows are enough
+        sub = add_nfl_schedule_features(sub, get_nfl_team_weeks(), NFL_DATE_COL)
+        return apply_nfl_schedule_filters(sub, schedule_toggle)
+
+    def _impact_team(self, player_a) -> str | None:
+        # Same tie-break as Series.mode()[0]: most rows, then smallest team
+        df = self._query(
+            """
+            SELECT team FROM nba_impact
+            WHERE player = ? AND team IS NOT NULL
+            GROUP BY team
+            ORDER BY count(*) DESC, team
+            LIMIT 1
+            """,
+            [player_a],
+        )
+        return None if df.empty else df["team"].iloc[0]
+
+    def impact_players(self):
+        if "player" not in self._columns["nba_impact"]:
+            return []
+        df = self._query("SELECT DISTINCT player FROM nba_impact WHERE player IS NOT NULL ORDER BY player")
+        return df["player"].tolist()
+
+    def impact_teammates(self, player_a):
+        team = self._impact_team(player_a)
+        if team is None:
+            return []
+        df = self._query(
+            "SELECT DISTINCT player FROM nba_impact WHERE team = ? AND player IS NOT NULL AND player <> ? ORDER BY player",
+            [team, player_a],
+        )
+        return df["player"].tolist()
+
+    def impact_stat_cols(self):
+        exclude = {"player", "team", "game_date", "played", "withorwithout"}
+        numeric_prefixes = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE", "DECIMAL", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT")
+        return [
+            c for c, t in self._columns["nba_impact"].items()
+            if c not in exclude and str(t).upper().startswith(numeric_prefixes)
+        ]
+
+    def impact_table(self, player_a, excluded, stat):
+        cols = self._columns["nba_impact"]
+        missing = {"player", "team", "game_date", "played"} - set(cols)
+        if missing:
+            return pd.DataFrame(), f"Impact dataset missing columns: {', '.join(sorted(missing))}"
+        if stat not in cols:
+            return pd.DataFrame(), f"Stat '{stat}' not found in dataset."
+
+        team = self._impact_team(player_a)
+        if team is None:
+            return pd.DataFrame(), f"No team found for {player_a}."
+
+        excluded = list(dict.fromkeys(excluded or []))
+        excl_sql = ", ".join("?" for _ in excluded) or "NULL"
+        stat_sql = _quote_ident(stat)
+
+        df_pivot = self._query(
+            f"""
+            WITH team_rows AS (
+                SELECT * FROM nba_impact WHERE team = ?
+            ),
+            per_player AS (
+                SELECT game_date, player, sum(played) AS s
+                FROM team_rows WHERE game_date IS NOT NULL
+                GROUP BY game_date, player
+            ),
+            status AS (
+                SELECT g.game_date,
+                       coalesce(max(CASE WHEN pp.player = ? AND pp.s <> 0 THEN 1 END), 0) AS a_played,
+                       count(DISTINCT CASE WHEN pp.player IN ({excl_sql}) AND pp.s <> 0 THEN pp.player END) AS n_excl_played
+                FROM (SELECT DISTINCT game_date FROM team_rows WHERE game_date IS NOT NULL) g
+                LEFT JOIN per_player pp ON pp.game_date = g.game_date
+                GROUP BY g.game_date
+            ),
+            labeled AS (
+                SELECT game_date,
+                       CASE
+                           WHEN a_played = 1 AND n_excl_played = ? THEN 'With'
+                           WHEN a_played = 0 AND n_excl_played = 0 THEN 'Without'
+                       END AS with_or_without
+                FROM status
+            ),
+            vals AS (
+                SELECT t.player, l.with_or_without, TRY_CAST(t.{stat_sql} AS DOUBLE) AS v
+                FROM team_rows t JOIN labeled l ON t.game_date = l.game_date
+                WHERE l.with_or_without IS NOT NULL AND t.player <> ?
+            )
+            SELECT player,
+                   avg(v) FILTER (WHERE with_or_without = 'With') AS "With",
+                   avg(v) FILTER (WHERE with_or_without = 'Without') AS "Without"
+            FROM vals
+            WHERE v IS NOT NULL AND NOT isnan(v)
+            GROUP BY player
+            HAVING "With" IS NOT NULL AND "Without" IS NOT NULL
+            """,
+            [team, player_a] + excluded + [len(excluded), player_a],
+        )
+
+        if df_pivot.empty:
+            return pd.DataFrame(), "No players have both With and Without data."
+
+        df_pivot["Difference"] = df_pivot["Without"] - df_pivot["With"]
+        df_pivot = df_pivot.sort_values("Difference", ascending=False)
+        return df_pivot[["player", "With", "Without", "Difference"]].reset_index(drop=True), ""
+
+
+# -------------------------------------------------
+# Backend selection
+# -------------------------------------------------
+BACKENDS = {
+    "pandas": PandasBackend,
+    "duckdb": DuckDBBackend,
+}
+
+
+@single_flight(maxsize=None)
+def get_backend(name: str | None = None) -> GameLogBackend:
+    name = (name or GAMELOG_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown GAMELOG_BACKEND '{name}' (expected one of: {', '.join(sorted(BACKENDS))})")
+    print(f"[query_backend] Using {name} backend", flush=True)
+    return BACKENDS[name]()
+
+
+# A background job is a forked process: DuckDB's connection and its threads
+# do not survive the fork, so a job builds its own backend.
+os.register_at_fork(after_in_child=get_backend.cache_clear)
+
+
+def clear_backend_cache():
+    get_backend.cache_clear()
+    local_copy.cache_clear()
@@ -0,0 +1,193 @@
+# -----------------------------
+# Rest and schedule-density features
+# -----------------------------
+# Derived at load from the game dates alone, so every dataset has them and
+# the schedule filters never depend on precomputed columns. Each team's (or
+# player's) games are put in one sorted array of integer keys; rest is the
+# difference to the previous key and "n games in m nights" a searchsorted
+# count over the same array, for every team at once.
+#
+#   rest_days      days since the previous game (NaN for the first game of a
+#                  season); the second night of a back-to-back has 1
+#   back_to_back   second night of a back-to-back
+#   third_in_four  third game in four nights
+#   fourth_in_six  fourth game in six nights
+#   games_last_7   games in the seven nights ending with this one
+#
+# NBA rows get these for the team and, prefixed player_, for the player's own
+# games (played ones). NFL games are a week apart: rows get rest_days (from
+# the schedule's game days), short_week and off_bye (from the weeks) instead.
+import numpy as np
+import pandas as pd
+
+NBA_SCHEDULE_COLS = ["rest_days", "back_to_back", "third_in_four", "fourth_in_six", "games_last_7"]
+PLAYER_PREFIX = "player_"
+NBA_PLAYER_SCHEDULE_COLS = [PLAYER_PREFIX + c for c in NBA_SCHEDULE_COLS]
+
+# the rest filter's last choice: this many days since the last game or more
+REST_DAYS_MAX = 4
+
+NFL_SCHEDULE_COLS = ["rest_days", "short_week", "off_bye"]
+# fewer days than this since the previous game is a short week
+# (Thursday after Sunday, Sunday after Monday night)
+NFL_SHORT_WEEK_DAYS = 7
+
+# (games, nights) for the "n in m" flags
+_DENSITY = {"back_to_back": (2, 2), "third_in_four": (3, 4), "fourth_in_six": (4, 6)}
+_LAST_NIGHTS = 7
+
+
+def _codes(df: pd.DataFrame, by: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """One int64 code per row for its combination of `by` values, and whether none is missing."""
+    codes = np.zeros(len(df), dtype=np.int64)
+    ok = np.ones(len(df), dtype=bool)
+    for col in by:
+        c, uniques = pd.factorize(df[col])
+        ok &= c >= 0
+        codes = codes * (len(uniques) + 1) + c
+    return codes, ok
+
+
+def _days(values) -> tuple[np.ndarray, np.ndarray]:
+    """Dates -> integer days since the epoch, and whether the date is present."""
+    dates = pd.to_datetime(pd.Series(values), errors="coerce")
+    present = dates.notna().to_numpy()
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+    return np.where(present, days, 0), present
+
+
+def _by_season(df: pd.DataFrame, col: str) -> list[str]:
+    return (["season"] if "season" in df.columns else []) + [col]
+
+
+def game_density(entity: np.ndarray, day: np.ndarray, valid: np.ndarray) -> dict:
+    """
+    NBA_SCHEDULE_COLS for rows of `entity` codes played on integer `day`s.
+    Rows of one entity on one day are one game. Invalid rows get NaN rest
+    and zeros.
+    """
+    n = len(entity)
+    out = {
+        "rest_days": np.full(n, np.nan, dtype=np.float32),
+        **{col: np.zeros(n, dtype=np.int8) for col in _DENSITY},
+        "games_last_7": np.zeros(n, dtype=np.int8),
+    }
+    if not valid.any():
+        return out
+
+    day0 = day[valid].min()
+    # spacing between entities wider than any window, so no count crosses one
+    span = int(day[valid].max() - day0) + _LAST_NIGHTS + 1
+    games, inverse = np.unique(entity[valid] * span + (day[valid] - day0), return_inverse=True)
+
+    position = np.arange(len(games))
+
+    def games_in(nights):  # this game and the entity's others in the last `nights` nights
+        return position - np.searchsorted(games, games - (nights - 1), side="left") + 1
+
+    same = np.r_[False, games[1:] // span == games[:-1] // span]
+    rest = np.where(same, np.r_[0, np.diff(games)], np.nan)
+
+    out["rest_days"][valid] = rest[inverse]
+    for col, (count, nights) in _DENSITY.items():
+        out[col][valid] = (games_in(nights) >= count)[inverse]
+    out["games_last_7"][valid] = games_in(_LAST_NIGHTS)[inverse]
+    return out
+
+
+def add_nba_schedule_features(df: pd.DataFrame, date_col: str = "game_date", team_col: str = "team",
+                              player_col: str = "player") -> pd.DataFrame:
+    """
+    Adds NBA_SCHEDULE_COLS (team schedule; the player's own without a team
+    column) and NBA_PLAYER_SCHEDULE_COLS to a game log frame, in place.
+    """
+    if date_col not in df.columns:
+        return df
+    day, valid = _days(df[date_col])
+
+    player = {}
+    if player_col in df.columns:
+        code, ok = _codes(df, _by_season(df, player_col))
+        played = df["played"].to_numpy() == 1 if "played" in df.columns else True
+        player = game_density(code, day, valid & ok & played)
+        for col, values in player.items():
+            df[PLAYER_PREFIX + col] = values
+
+    if team_col in df.columns:
+        code, ok = _codes(df, _by_season(df, team_col))
+        team = game_density(code, day, valid & ok)
+    else:
+        team = player
+    for col, values in team.items():
+        df[col] = values
+    return df
+
+
+def nfl_team_weeks(games: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per (season,) team and week of `games` (one row per team game:
+    season, team, week and, if known, gameday) with NFL_SCHEDULE_COLS. A week
+    gap of two or more follows a bye; rest is NaN without game days.
+    """
+    keys = _by_season(games, "team") + ["week"]
+    code, ok = _codes(games, keys[:-1])
+    week = pd.to_numeric(games["week"], errors="coerce").to_numpy(dtype="float64")
+    ok &= ~np.isnan(week)
+    if "gameday" in games.columns:
+        day, has_day = _days(games["gameday"])
+    else:
+        day, has_day = np.zeros(len(games), dtype=np.int64), np.zeros(len(games), dtype=bool)
+
+    # one sorted key per team week (weeks < 1000)
+    rows = np.flatnonzero(ok)
+    team_weeks, first = np.unique(code[rows] * 1000 + week[rows].astype(np.int64), return_index=True)
+    rows = rows[first]
+
+    same = np.r_[False, team_weeks[1:] // 1000 == team_weeks[:-1] // 1000]
+    game_day = np.where(has_day[rows], day[rows], np.nan)
+    rest = np.where(same, np.r_[np.nan, np.diff(game_day)], np.nan)
+
+    out = games.iloc[rows][keys].reset_index(drop=True)
+    out["week"] = week[rows]
+    out["rest_days"] = rest.astype(np.float32)
+    out["short_week"] = (rest < NFL_SHORT_WEEK_DAYS).astype(np.int8)
+    out["off_bye"] = (same & (np.r_[0, np.diff(team_weeks)] >= 2)).astype(np.int8)
+    return out
+
+
+def schedule_team_weeks(schedule: pd.DataFrame | None) -> pd.DataFrame | None:
+    """nfl_team_weeks of a schedule (nflverse layout: season, week, gameday, home_team, away_team), or None."""
+    needed = {"week", "gameday", "home_team", "away_team"}
+    if schedule is None or not needed <= set(schedule.columns):
+        return None
+    sides = []
+    for side in ("home_team", "away_team"):
+        part = schedule[[c for c in ("season", "week", "gameday") if c in schedule.columns]]
+        sides.append(part.assign(team=schedule[side].to_numpy()))
+    return nfl_team_weeks(pd.concat(sides, ignore_index=True))
+
+
+def add_nfl_schedule_features(df: pd.DataFrame, team_weeks: pd.DataFrame | None = None,
+                              week_col: str = "week", team_col: str = "team") -> pd.DataFrame:
+    """
+    Adds NFL_SCHEDULE_COLS to weekly rows, in place. With `team_weeks`
+    (schedule_team_weeks) every feature comes from the schedule, so one
+    player's rows get the same values as the whole league's, and weeks it
+    does not cover (postseason) get NaN rest and zeros. Without it, byes are
+    read from the weeks each team appears in and rest is unknown.
+    """
+    if week_col not in df.columns or team_col not in df.columns:
+        return df
+    rows = pd.DataFrame({
+        **({"season": df["season"].to_numpy()} if "season" in df.columns else {}),
+        "team": df[team_col].to_numpy(dtype=object),
+        "week": pd.to_numeric(df[week_col], errors="coerce").to_numpy(dtype="float64"),
+    })
+    if team_weeks is None or ("season" in team_weeks.columns) != ("season" in rows.columns):
+        team_weeks = nfl_team_weeks(rows)
+
+    found = rows.merge(team_weeks, how="left", on=list(rows.columns))
+    df["rest_days"] = found["rest_days"].to_numpy(dtype=np.float32)
+    df["short_week"] = found["short_week"].fillna(0).to_numpy(dtype=np.int8)
+    df["off_bye"] = found["off_bye"].fillna(0).to_numpy(dtype=np.int8)
+    return df
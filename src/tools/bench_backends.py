@@ -0,0 +1,210 @@
+# tools/bench_backends.py
+"""
+Compares the pandas and DuckDB query backends (query_backend.py) on
+
+  - bundled:   the single-season files in data/
+  - synthetic: game logs from tools.synth_data, 10 seasons by default
+
+For every backend/dataset pair a fresh subprocess runs the game log and
+impact queries the callbacks issue, so cold start, warm latency and peak
+RSS are measured in isolation. Runs fully offline.
+
+Usage (from src/):
+    python -m tools.bench_backends --out ../bench_backends.json
+    python -m tools.bench_backends --seasons 10 --repeat 5
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data"
+SRC_DIR = PROJECT_ROOT / "src"
+
+BUNDLED_FILES = {
+    "nba": DATA_DIR / "NBA_Player_Stats.parquet",
+    "nfl": DATA_DIR / "Player_Stats_Weekly.parquet",
+}
+
+N_PLAYERS = 15
+
+
+# -------------------------------------------------
+# Datasets
+# -------------------------------------------------
+def build_synthetic(out_dir: Path, n_seasons: int, props: bool = False) -> dict:
+    from tools.synth_data import write_synthetic
+
+    return write_synthetic(out_dir, n_seasons, props=props)
+
+
+def _dataset_env(files: dict) -> dict:
+    return {
+        "NBA_STATS_FILE": str(files["nba"]),
+        "NBA_IMPACT_FILE": str(files["nba"]),
+        "NFL_STATS_FILE": str(files["nfl"]),
+        "GAMELOG_DATASET_ROOT": "",
+    }
+
+
+# -------------------------------------------------
+# Child: run the query mix against one backend
+# -------------------------------------------------
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def run_child(backend_name: str, repeat: int) -> dict:
+    from query_backend import get_backend
+
+    t0 = time.perf_counter()
+    backend = get_backend(backend_name)
+    seasons = backend.nba_seasons()
+    setup_ms = (time.perf_counter() - t0) * 1000.0
+
+    # latest season, like the page default
+    season = seasons[-1] if seasons else None
+    all_players = backend.nba_players(season)
+    players = all_players[:: max(1, len(all_players) // N_PLAYERS)][:N_PLAYERS]
+
+    cases = []
+    for p in players:
+        mates = backend.nba_teammates(p, season)
+        w = mates[0] if mates else None
+        wo = mates[1] if len(mates) > 1 else None
+        cases.append((p, w, wo))
+
+    nfl_players = sorted(
+        pd.read_parquet(os.environ["NFL_STATS_FILE"], columns=["player_display_name"])["player_display_name"]
+        .dropna().unique().tolist()
+    )[:N_PLAYERS]
+
+    queries = {
+        "nba_player_games": lambda p, w, wo: backend.nba_player_games(p, None, None, [], [], season),
+        "nba_with_without": lambda p, w, wo: backend.nba_player_games(p, w, wo, [], [], season),
+        "nba_schedule_toggle": lambda p, w, wo: backend.nba_player_games(p, None, None, ["b2b2"], ["3in4"], season),
+        "nba_rest_density": lambda p, w, wo: backend.nba_player_games(p, None, None, [], [], season, ["4in6"], 2, 3),
+        "nba_teammates": lambda p, w, wo: backend.nba_teammates(p, season),
+        "impact_table": lambda p, w, wo: backend.impact_table(p, [w] if w else [], "pts"),
+    }
+
+    results = {"setup_ms": round(setup_ms, 2)}
+    for name, fn in queries.items():
+        first = _timed(fn, *cases[0])
+        samples = [_timed(fn, *case) for _ in range(repeat) for case in cases]
+        results[name] = _summarize(first, samples)
+
+    first = _timed(backend.nfl_player_games, nfl_players[0], "passing_yards", None)
+    samples = [_timed(backend.nfl_player_games, p, "passing_yards", None) for _ in range(repeat) for p in nfl_players]
+    results["nfl_player_games"] = _summarize(first, samples)
+
+    first = _timed(backend.nfl_player_games, nfl_players[0], "passing_yards", None, ["short"])
+    samples = [
+        _timed(backend.nfl_player_games, p, "passing_yards", None, ["short"]) for _ in range(repeat) for p in nfl_players
+    ]
+    results["nfl_short_weeks"] = _summarize(first, samples)
+
+    results["peak_rss_mb"] = _peak_rss_mb()
+    return results
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM belongs to this process image; ru_maxrss would carry over the
+    # parent's high-water mark across exec on Linux.
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024.0, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+
+
+def _summarize(first_ms: float, samples: list[float]) -> dict:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+    return {
+        "first_ms": round(first_ms, 2),
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(p95, 2),
+        "n": len(samples),
+    }
+
+
+# -------------------------------------------------
+# Parent
+# -------------------------------------------------
+def run_pair(backend_name: str, env_overrides: dict, repeat: int) -> dict:
+    env = {**os.environ, **env_overrides}
+    proc = subprocess.run(
+        [sys.executable, "-m", "tools.bench_backends", "--child", backend_name, "--repeat", str(repeat)],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # last stdout line is the JSON result (loaders print progress above it)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def print_report(report: dict):
+    for dataset, by_backend in report["results"].items():
+        print(f"\n== {dataset} ==")
+        names = sorted({k for r in by_backend.values() for k, v in r.items() if isinstance(v, dict)})
+        header = f"{'query':<22}" + "".join(f"{b + ' p50/p95 ms':>26}" for b in by_backend)
+        print(header)
+        for q in names:
+            row = f"{q:<22}"
+            for b, r in by_backend.items():
+                row += f"{r[q]['p50_ms']:>15.2f} / {r[q]['p95_ms']:<8.2f}"
+            print(row)
+        for key in ("setup_ms", "peak_rss_mb"):
+            print(f"{key:<22}" + "".join(f"{r[key]:>26}" for r in by_backend.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pandas and DuckDB game log backends.")
+    parser.add_argument("--backends", default="pandas,duckdb")
+    parser.add_argument("--seasons", type=int, default=10, help="Seasons in the synthetic dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.repeat)))
+        return
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    report = {"repeat": args.repeat, "results": {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets = {
+            "bundled": BUNDLED_FILES,
+            f"synthetic_{args.seasons}_seasons": build_synthetic(Path(tmp), args.seasons),
+        }
+        for dataset, files in datasets.items():
+            report["results"][dataset] = {
+                b: run_pair(b, _dataset_env(files), args.repeat) for b in backends
+            }
+
+    print_report(report)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\n[bench] wrote {args.out}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+# tools/bench_callbacks.py
+"""
+Benchmark suite for the Dash callbacks and data loaders.
+
+Calls every callback function directly (no HTTP) with inputs sampled from
+the data, plus a cold load of each cached loader, on two datasets:
+
+  - bundled:   the files in data/ and a default-size MLB fixture
+  - synthetic: tools.synth_data game logs and props for --seasons seasons
+               and a larger MLB fixture (--mlb-pitchers)
+
+Each dataset runs in a fresh subprocess with sockets disabled, so the suite
+is fully offline and one dataset's caches never leak into the next.
+
+Results are written as JSON (--out). Passing a previous run as --baseline
+prints per-case deltas and flags regressions whose p50 grew by more than
+--threshold (relative) and --min-delta-ms (absolute); --fail-on-regression
+turns flagged regressions into a non-zero exit code for CI.
+
+Usage (from src/):
+    python -m tools.bench_callbacks --out ../bench/callbacks.json
+    python -m tools.bench_callbacks --baseline ../bench/callbacks.json --fail-on-regression
+    python -m tools.bench_callbacks --datasets bundled --only nba_ --repeat 5
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data"
+SRC_DIR = PROJECT_ROOT / "src"
+
+N_INPUTS = 8
+
+
+# -------------------------------------------------
+# Child: run every case against one dataset
+# -------------------------------------------------
+def _refuse_network():
+    import socket
+
+    def refuse(*args, **kwargs):
+        raise OSError("bench_callbacks runs offline; network access is disabled")
+
+    socket.socket.connect = refuse
+    socket.socket.connect_ex = refuse
+    socket.create_connection = refuse
+    socket.getaddrinfo = refuse
+
+
+def _spread(items: list, n: int = N_INPUTS) -> list:
+    items = list(items)
+    if not items:
+        return []
+    return items[:: max(1, len(items) // n)][:n]
+
+
+def _with_context(fn, prop_id: str):
+    """Runs fn inside a minimal Dash callback context (for callback_context.triggered)."""
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+
+    def run(*args):
+        token = context_value.set(AttributeDict(triggered_inputs=[{"prop_id": prop_id, "value": 1}]))
+        try:
+            return fn(*args)
+        finally:
+            context_value.reset(token)
+
+    return run
+
+
+def _table_pages(fn, table_id: str, values: tuple, sort_column: str) -> list:
+    """Page turns of a server-side table (components.server_table), sorted by one column."""
+    turn = _with_context(fn, f"{table_id}.page_current")
+    sort_by = [{"column_id": sort_column, "direction": "desc"}]
+    return [(lambda page=page: turn(page, 25, sort_by, "", *values)) for page in range(N_INPUTS)]
+
+
+def build_cases() -> dict:
+    """name -> (kind, list of zero-arg callables)."""
+    import app  # noqa: F401  (registers pages so page callbacks import)
+    import data_store
+    import mlb_data
+    from callbacks import nba_absence_cb, nba_cb, nba_props_lines_cb, nfl_cb
+    from pages import mlb_hot_hitters, mlb_matchup, mlb_props, nfl_matchup
+    from query_backend import get_backend
+
+    backend = get_backend()
+    cases = {}
+
+    def loader(name, fn, clear):
+        def cold():
+            clear()
+            return fn()
+        cases[name] = ("loader", [cold])
+
+    loader("load_nba_df", data_store.get_nba_df, data_store.clear_nba_cache)
+    loader("load_nfl_df", data_store.get_nfl_df, data_store.clear_nfl_cache)
+    loader("load_nba_impact_df", data_store.get_nba_impact_df, data_store.clear_nba_impact_cache)
+    loader("load_nba_props_df", data_store.get_nba_props_df, data_store.clear_nba_props_cache)
+    loader("load_nfl_matchup_data", nfl_matchup.get_data, nfl_matchup.invalidate_cache)
+    loader("load_mlb_data", mlb_data.get_mlb_data, mlb_data.clear_mlb_cache)
+    loader("build_mlb_pitcher_bundles", mlb_matchup.pitcher_bundles, lambda: mlb_data.get_mlb_data().derived.clear())
+    loader("build_mlb_hitting_windows", mlb_hot_hitters.hitting_windows, lambda: mlb_data.get_mlb_data().derived.clear())
+
+    # warm everything once so callback timings exclude cold loads
+    for _, fns in list(cases.values()):
+        fns[0]()
+
+    # ---------- NBA game logs ----------
+    season = (backend.nba_seasons() or [None])[-1]
+    players = _spread(backend.nba_players(season))
+    mates = {p: backend.nba_teammates(p, season) for p in players}
+    chart = inspect.unwrap(nba_cb.stats_update_chart_and_counts)
+    slider = inspect.unwrap(nba_cb.stats_update_slider_props)
+
+    cases["nba_stats_update_chart_and_counts"] = ("callback", [
+        (lambda p=p: chart(p, "pts", None, None, 15, [], [], season)) for p in players
+    ])
+    cases["nba_stats_update_chart_with_without"] = ("callback", [
+        (lambda p=p, m=mates[p]: chart(p, "pra", m[0] if m else None, m[1] if len(m) > 1 else None, 20, ["b2b2"], [], season))
+        for p in players
+    ])
+    cases["nba_stats_update_slider_props"] = ("callback", [
+        (lambda p=p: slider(p, "pts", None, None, [], [], season)) for p in players
+    ])
+    cases["nba_update_with_without_dropdowns"] = ("callback", [
+        (lambda p=p: nba_cb.update_with_without_dropdowns(p, None, None, season)) for p in players
+    ])
+    cases["nba_populate_player_dropdown"] = ("callback", [lambda: nba_cb.populate_player_dropdown(1, season)])
+
+    # ---------- NBA impact ----------
+    impact_players = _spread(backend.impact_players())
+    impact_chart = _with_context(
+        nba_absence_cb.update_impact_chart, '{"index":"pts","type":"nba-impact-stat-button"}.n_clicks'
+    )
+    cases["nba_update_impact_chart"] = ("callback", [
+        (lambda p=p: impact_chart([1], p, [])) for p in impact_players
+    ])
+    cases["nba_update_exclude_dropdown"] = ("callback", [
+        (lambda p=p: nba_absence_cb.update_exclude_dropdown(p)) for p in impact_players
+    ])
+    cases["nba_build_stat_buttons"] = ("callback", [
+        (lambda p=p: nba_absence_cb.build_stat_buttons(p)) for p in impact_players
+    ])
+
+    # ---------- NBA props ----------
+    props = data_store.get_nba_props_df()
+    prop_players = _spread(props["player"].dropna().unique()) if "player" in props.columns else []
+    cases["nba_props_odds_frame"] = ("callback", [
+        (lambda p=p: nba_props_lines_cb.props_odds_frame(p, None, "over")) for p in prop_players
+    ] + [lambda: nba_props_lines_cb.props_odds_frame(None, None, "under")])
+    cases["nba_props_update_table"] = ("callback", _table_pages(
+        nba_props_lines_cb.props_update_table, "props-odds-table", (None, None, "over"), "line_id"
+    ))
+
+    # ---------- NFL ----------
+    nfl_df = data_store.get_nfl_df()
+    nfl_players = _spread(sorted(nfl_df[data_store.NFL_PLAYER_COL].dropna().unique()))
+    cases["nfl_update_chart_and_counts"] = ("callback", [
+        (lambda p=p: nfl_cb.nfl_update_chart_and_counts(p, "fantasy_points", 10, None)) for p in nfl_players
+    ])
+    cases["nfl_update_slider_props"] = ("callback", [
+        (lambda p=p: nfl_cb.nfl_update_slider_props(p, "fantasy_points", None)) for p in nfl_players
+    ])
+    matchups = _spread(nfl_matchup.get_data()[2])
+    cases["nfl_update_matchup"] = ("callback", [
+        (lambda m=m: nfl_matchup.update_matchup(m)) for m in matchups
+    ])
+
+    # ---------- MLB ----------
+    mlb = mlb_data.get_mlb_data()
+    pitchers = _spread(sorted(mlb.dfPitchers["Baseball_Savant_Name"].unique()))
+    cases["mlb_select_pitcher"] = ("callback", [(lambda p=p: mlb_matchup.select_pitcher(p)) for p in pitchers])
+
+    markets = sorted(mlb.df_props_matchup["market"].dropna().unique())
+    cases["mlb_props_frame"] = ("callback", [
+        (lambda m=m: mlb_props.props_frame(1, None, None, m, None)) for m in markets
+    ] + [lambda: mlb_props.props_frame(0, None, None, None, None)])
+    cases["mlb_update_props_table"] = ("callback", _table_pages(
+        mlb_props.update_props_table, "mlb-props-data-table", (0, None, None, None, None), "Over EV"
+    ))
+
+    cases["mlb_hot_hitters_frame"] = ("callback", [
+        (lambda w=w, st=st: mlb_hot_hitters.hot_hitters_frame(w, st, 0.3, 10))
+        for w in mlb_hot_hitters.HOT_WINDOWS for st in ("BA", "K%")
+    ])
+
+    cases["mlb_matchup_layout"] = ("layout", [lambda: mlb_matchup.layout()])
+    cases["mlb_props_layout"] = ("layout", [lambda: mlb_props.layout()])
+    cases["mlb_hot_hitters_layout"] = ("layout", [lambda: mlb_hot_hitters.layout()])
+
+    return cases
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _summarize(samples: list[float], first_ms: float) -> dict:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+    return {
+        "first_ms": round(first_ms, 3),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(p95, 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "n": len(samples),
+    }
+
+
+def run_child(repeat: int, only: str | None) -> dict:
+    _refuse_network()
+    cases = build_cases()
+
+    results = {}
+    for name, (kind, fns) in cases.items():
+        if only and not any(name.startswith(o) for o in only.split(",")):
+            continue
+        if not fns:
+            results[name] = {"kind": kind, "skipped": "no inputs in dataset"}
+            continue
+        first = _timed(fns[0])
+        n_rounds = repeat if kind != "loader" else max(1, repeat // 2)
+        samples = [_timed(fn) for _ in range(n_rounds) for fn in fns]
+        results[name] = {"kind": kind, **_summarize(samples, first)}
+        print(f"[bench] {name:<40} p50={results[name]['p50_ms']:>9.2f} ms", file=sys.stderr, flush=True)
+    return results
+
+
+# -------------------------------------------------
+# Parent: datasets, comparison, report
+# -------------------------------------------------
+def _dataset_env(nba: Path, nfl: Path, props: Path, mlb_dir: Path) -> dict:
+    return {
+        "NBA_STATS_FILE": str(nba),
+        "NBA_IMPACT_FILE": str(nba),
+        "NFL_STATS_FILE": str(nfl),
+        "NBA_PROPS_FILE": str(props),
+        "NFL_TEAM_STATS_FILE": str(DATA_DIR / "2025_Team_Stats.xlsx"),
+        "NFL_SCHEDULE_FILE": str(DATA_DIR / "schedule.xlsx"),
+        "MLB_DATA_BASE_RAW": str(mlb_dir),
+        "GAMELOG_DATASET_ROOT": "",
+        "CALLBACK_LOG_SAMPLE_RATE": "0",
+    }
+
+
+def build_datasets(tmp: Path, names: list[str], seasons: int, mlb_pitchers: int) -> dict:
+    from tools.bench_backends import build_synthetic
+    from tools.mlb_fixtures import write_mlb_fixtures
+
+    datasets = {}
+    if "bundled" in names:
+        mlb_dir = write_mlb_fixtures(tmp / "mlb_bundled")
+        datasets["bundled"] = _dataset_env(
+            DATA_DIR / "NBA_Player_Stats.parquet",
+            DATA_DIR / "Player_Stats_Weekly.parquet",
+            DATA_DIR / "Basketball_Props.xlsx",
+            mlb_dir,
+        )
+    if "synthetic" in names:
+        files = build_synthetic(tmp / "synthetic", seasons, props=True)
+        mlb_dir = write_mlb_fixtures(tmp / "mlb_synthetic", n_pitchers=mlb_pitchers)
+        datasets["synthetic"] = _dataset_env(files["nba"], files["nfl"], files["props"], mlb_dir)
+    return datasets
+
+
+def run_dataset(env_overrides: dict, repeat: int, only: str | None) -> dict:
+    cmd = [sys.executable, "-m", "tools.bench_callbacks", "--child", "--repeat", str(repeat)]
+    if only:
+        cmd += ["--only", only]
+    proc = subprocess.run(
+        cmd,
+        cwd=SRC_DIR,
+        # time the computation, not the cross-worker result cache; benchmark
+        # calls are not user views
+        env={**os.environ, **env_overrides, "RESULT_CACHE_SIZE_MB": "0", "VIEW_LOG_DIR": ""},
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    # last stdout line is the JSON result (loaders print progress above it)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(report: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[dict]:
+    """Cases whose p50 regressed against the baseline by more than both limits."""
+    regressions = []
+    for dataset, cases in report["results"].items():
+        base_cases = baseline.get("results", {}).get(dataset, {})
+        for name, r in cases.items():
+            b = base_cases.get(name)
+            if not b or "p50_ms" not in b or "p50_ms" not in r:
+                continue
+            delta = r["p50_ms"] - b["p50_ms"]
+            ratio = r["p50_ms"] / b["p50_ms"] if b["p50_ms"] > 0 else float("inf")
+            r["baseline_p50_ms"] = b["p50_ms"]
+            r["change"] = round(ratio - 1.0, 3)
+            if ratio > 1.0 + threshold and delta > min_delta_ms:
+                r["regression"] = True
+                regressions.append({"dataset": dataset, "case": name, "baseline_p50_ms": b["p50_ms"],
+                                    "p50_ms": r["p50_ms"], "change": r["change"]})
+    return regressions
+
+
+def print_report(report: dict):
+    for dataset, cases in report["results"].items():
+        print(f"\n== {dataset} ==")
+        print(f"{'case':<40}{'kind':>9}{'first ms':>11}{'p50 ms':>11}{'p95 ms':>11}{'vs base':>10}")
+        for name, r in cases.items():
+            if "p50_ms" not in r:
+                print(f"{name:<40}{r['kind']:>9}  skipped: {r.get('skipped', '')}")
+                continue
+            change = f"{r['change']:+.0%}" if "change" in r else ""
+            flag = "  REGRESSION" if r.get("regression") else ""
+            print(f"{name:<40}{r['kind']:>9}{r['first_ms']:>11.2f}{r['p50_ms']:>11.2f}{r['p95_ms']:>11.2f}{change:>10}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every Dash callback and data loader offline.")
+    parser.add_argument("--datasets", default="bundled,synthetic")
+    parser.add_argument("--seasons", type=int, default=10, help="Seasons in the synthetic NBA/NFL game logs")
+    parser.add_argument("--mlb-pitchers", type=int, default=300, help="Pitchers in the synthetic MLB fixture")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="Comma-separated case name prefixes to run")
+    parser.add_argument("--out", help="Write the JSON results here")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative p50 growth that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore regressions smaller than this")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.repeat, args.only)))
+        return
+
+    import pandas as pd
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "seasons": args.seasons,
+            "mlb_pitchers": args.mlb_pitchers,
+        },
+        "results": {},
+    }
+
+    names = [d.strip() for d in args.datasets.split(",") if d.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        for dataset, env in build_datasets(Path(tmp), names, args.seasons, args.mlb_pitchers).items():
+            print(f"[bench] dataset {dataset}", flush=True)
+            report["results"][dataset] = run_dataset(env, args.repeat, args.only)
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        report["regressions"] = regressions
+
+    print_report(report)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\n[bench] wrote {args.out}", flush=True)
+
+    if regressions:
+        print(f"\n[bench] {len(regressions)} regression(s) over +{args.threshold:.0%} / {args.min_delta_ms} ms", flush=True)
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# tools/bench_splits.py
+"""
+Split-table latency on the MLB matchup page, for every pitcher in the data.
+
+Compares the current path -- one pivot of every pitcher's splits per MLB
+snapshot, after which selecting a pitcher only looks up its table -- with
+the pivot the page used to run on each selection (pivot_table on that
+pitcher's rows, then a positional reorder). Also checks that both give the
+same rows for every pitcher.
+
+Uses the MLB data in MLB_DATA_BASE_RAW when set, otherwise an offline
+tools.mlb_fixtures directory with --pitchers pitchers.
+
+Usage (from src/):
+    python -m tools.bench_splits
+    python -m tools.bench_splits --pitchers 1500 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# The per-selection pivot the page ran before splits were precomputed
+LEGACY_ORDER = [3, 4, 5, 17, 15, 1, 0, 2, 12, 6, 9, 13, 7, 10, 16, 14, 11, 8, 18]
+
+
+def legacy_split_table(dfSplits, name: str) -> list[dict]:
+    dffSplits = dfSplits.loc[dfSplits["Baseball Savant Name"] == name].copy()
+    try:
+        dfPivot = dffSplits.pivot_table("Value", index="Statistic", columns="Split").reset_index()
+        dfFinal = dfPivot[["vs L", "Statistic", "vs R"]].reset_index(drop=True)
+        return dfFinal.reindex(LEGACY_ORDER).reset_index(drop=True).to_dict("records")
+    except Exception:
+        return dffSplits.to_dict("records")
+
+
+def _rows(records: list[dict]) -> set:
+    """A split table's rows without its order (or padding rows)."""
+    return {
+        (r["Statistic"], round(float(r["vs L"]), 9), round(float(r["vs R"]), 9))
+        for r in records if isinstance(r.get("Statistic"), str) and "vs L" in r
+    }
+
+
+def _timed_ms(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _summary(ms: list[float]) -> str:
+    ms = sorted(ms)
+    return (
+        f"n={len(ms)} p50={statistics.median(ms):.3f} ms "
+        f"p95={ms[int(0.95 * (len(ms) - 1))]:.3f} ms max={ms[-1]:.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MLB split tables across all pitchers.")
+    parser.add_argument("--pitchers", type=int, default=400, help="Fixture pitchers when MLB_DATA_BASE_RAW is unset")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed builds of the precomputed tables")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CALLBACK_LOG_SAMPLE_RATE", "0")
+    with tempfile.TemporaryDirectory() as tmp:
+        if not os.getenv("MLB_DATA_BASE_RAW"):
+            from tools.mlb_fixtures import write_mlb_fixtures
+
+            os.environ["MLB_DATA_BASE_RAW"] = str(write_mlb_fixtures(Path(tmp) / "mlb", n_pitchers=args.pitchers))
+
+        import app  # noqa: F401  (registers pages so page modules import)
+        import mlb_data
+        from pages import mlb_matchup
+
+        mlb = mlb_data.get_mlb_data()
+        dfSplits = mlb.dfSplits
+        pitchers = list(mlb.dfPitchers["Baseball_Savant_Name"].unique())
+
+        build_ms = [_timed_ms(lambda: mlb_matchup._splits_by_pitcher(dfSplits)) for _ in range(args.repeat)]
+        mlb_matchup.pitcher_bundles()
+
+        current_ms, legacy_ms, mismatched = [], [], []
+        for name in pitchers:
+            current_ms.append(_timed_ms(lambda: mlb_matchup.select_pitcher(name)))
+            legacy_ms.append(_timed_ms(lambda: legacy_split_table(dfSplits, name)))
+            if _rows(mlb_matchup.select_pitcher(name)[7]) != _rows(legacy_split_table(dfSplits, name)):
+                mismatched.append(name)
+
+    print(f"[splits] {len(pitchers):,} pitchers, {len(dfSplits):,} split rows", flush=True)
+    print(f"[splits] build all tables (one pivot): p50={statistics.median(build_ms):.1f} ms", flush=True)
+    print(f"[splits] select_pitcher (lookup):      {_summary(current_ms)}", flush=True)
+    print(f"[splits] per-selection pivot (before): {_summary(legacy_ms)}", flush=True)
+    saved_ms = statistics.median(legacy_ms) - statistics.median(current_ms)
+    if saved_ms > 0:
+        print(f"[splits] the build pays for itself after {statistics.median(build_ms) / saved_ms:.0f} selections", flush=True)
+    print(json.dumps({"mismatched": mismatched[:10], "n_mismatched": len(mismatched)}), flush=True)
+    if mismatched:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# tools/check_background_callbacks.py
+"""
+Latency check for the background callbacks (background.py).
+
+Starts gunicorn with one worker and a few threads on offline fixtures, then
+measures the fast NBA/NFL stats callbacks (slider labels, slider ranges,
+charts) over HTTP twice:
+
+  - baseline: fast callbacks only
+  - loaded:   the same, while --slow-users clients keep starting the slow
+              jobs -- the NBA impact chart with exclusions, the NFL matchup
+              reload and the MLB page load -- and polling them to completion
+
+The check asserts that the slow jobs really ran in the background (each
+request returned a job handle and the jobs finished) and that the fast
+callbacks' p95 under load stays within --max-ratio of the baseline p95 (or
+within --slack-ms of it, for baselines of a few milliseconds). Before the
+slow paths were background callbacks they each held a request thread for
+the whole computation, so with --threads slow users the fast callbacks
+queued behind them.
+
+Usage (from src/):
+    python -m tools.check_background_callbacks
+    python -m tools.check_background_callbacks --seasons 10 --duration 30
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from tools.load_test import (
+    UPDATE_PATH,
+    CallbackSpecs,
+    Recorder,
+    _pct,
+    build_sessions,
+    fetch_end_id,
+    fixture_env,
+    post_callback,
+    spawn_gunicorn,
+    stop_gunicorn,
+)
+
+FAST_FLOWS = ("nba_stats", "nfl_stats")
+SLOW_TIMEOUT_S = 120.0
+
+
+def _check(cond: bool, msg: str):
+    status = "ok  " if cond else "FAIL"
+    print(f"[background] {status} {msg}", flush=True)
+    if not cond:
+        sys.exit(1)
+
+
+def _slow_requests(specs: CallbackSpecs, sessions: list[dict]):
+    """Endless (name, body) stream of slow background callback requests."""
+    impact = [
+        step for s in sessions if s["flow"] == "nba_impact" for step in s["steps"]
+        if step["callback"] == "update_impact_chart_job"
+    ]
+    for i in itertools.count(1):
+        yield "update_impact_chart_job", impact[i % len(impact)]["body"]
+        yield "init_matchup_dropdown", specs.body(
+            "init_matchup_dropdown",
+            {"nfl-matchups-init.n_intervals": 1, "nfl-matchups-reload.n_clicks": i},
+            ["nfl-matchups-reload.n_clicks"],
+        )
+        yield "load_mlb_matchup", specs.body(
+            "load_mlb_matchup",
+            {"mlb-matchup-load.data": 1},
+            ["mlb-matchup-load.data"],
+        )
+
+
+def _started_as_job(http: requests.Session, base_url: str, body: dict, end_id: str) -> bool:
+    resp = http.post(base_url + UPDATE_PATH, params={"endId": end_id}, data=json.dumps(body), timeout=30)
+    return resp.status_code == 200 and "cacheKey" in resp.json()
+
+
+def _fast_user(base_url, steps, recorder, stop, user_idx):
+    http = requests.Session()
+    http.headers["Content-Type"] = "application/json"
+    end_id = fetch_end_id(http, base_url)
+    for step in itertools.islice(itertools.cycle(steps), user_idx, None):
+        if stop.is_set():
+            return
+        t0 = time.perf_counter()
+        status = post_callback(http, base_url, step["body"], end_id, 30.0)
+        recorder.add(step["callback"], (time.perf_counter() - t0) * 1000.0, status)
+
+
+def _slow_user(base_url, requests_iter, lock, recorder, stop):
+    http = requests.Session()
+    http.headers["Content-Type"] = "application/json"
+    end_id = fetch_end_id(http, base_url)
+    while not stop.is_set():
+        with lock:
+            name, body = next(requests_iter)
+        t0 = time.perf_counter()
+        status = post_callback(http, base_url, body, end_id, SLOW_TIMEOUT_S)
+        recorder.add(name, (time.perf_counter() - t0) * 1000.0, status)
+
+
+def _measure(base_url, fast_steps, fast_users, duration_s, slow=None) -> tuple[Recorder, Recorder]:
+    fast, slow_rec, stop = Recorder(), Recorder(), threading.Event()
+    threads = [
+        threading.Thread(target=_fast_user, args=(base_url, fast_steps, fast, stop, u), daemon=True)
+        for u in range(fast_users)
+    ]
+    if slow:
+        requests_iter, slow_users = slow
+        lock = threading.Lock()
+        threads += [
+            threading.Thread(target=_slow_user, args=(base_url, requests_iter, lock, slow_rec, stop), daemon=True)
+            for _ in range(slow_users)
+        ]
+    fast.measuring = slow_rec.measuring = True
+    for t in threads:
+        t.start()
+    time.sleep(duration_s)
+    fast.measuring = False
+    stop.set()
+    for t in threads:
+        t.join(timeout=SLOW_TIMEOUT_S + 5)
+    slow_rec.measuring = False
+    return fast, slow_rec
+
+
+def _latencies(recorder: Recorder) -> list[float]:
+    return sorted(ms for samples in recorder.samples.values() for ms, _ in samples)
+
+
+def _statuses(recorder: Recorder) -> dict:
+    out = {}
+    for name, samples in recorder.samples.items():
+        for _, status in samples:
+            out.setdefault(name, {}).setdefault(status, 0)
+            out[name][status] += 1
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert fast callbacks keep their latency while slow jobs run.")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads (one worker)")
+    parser.add_argument("--seasons", type=int, default=0, help="Use tools.synth_data game logs; 0 = data/")
+    parser.add_argument("--mlb-pitchers", type=int, default=30)
+    parser.add_argument("--fast-users", type=int, default=2)
+    parser.add_argument("--slow-users", type=int, default=0, help="Clients starting slow jobs (default: --threads)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per phase")
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    parser.add_argument("--slack-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    slow_users = args.slow_users or args.threads
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = fixture_env(Path(tmp), args.seasons, args.mlb_pitchers)
+        os.environ.update(env)
+        proc, base_url = spawn_gunicorn(env, 1, args.threads, Path(tmp) / "gunicorn.log")
+        try:
+            sessions = build_sessions()
+            specs = CallbackSpecs()
+            fast_steps = [step for s in sessions if s["flow"] in FAST_FLOWS for step in s["steps"]]
+            slow_iter = _slow_requests(specs, sessions)
+
+            # every slow path must hand back a job handle instead of a result
+            http = requests.Session()
+            http.headers["Content-Type"] = "application/json"
+            end_id = fetch_end_id(http, base_url)
+            for name, body in itertools.islice(_slow_requests(specs, sessions), 3):
+                _check(_started_as_job(http, base_url, body, end_id), f"{name} starts a background job")
+
+            # warm the worker so neither phase pays for the first data load
+            _measure(base_url, fast_steps, args.fast_users, 3.0)
+
+            base, _ = _measure(base_url, fast_steps, args.fast_users, args.duration)
+            loaded, slow = _measure(base_url, fast_steps, args.fast_users, args.duration, (slow_iter, slow_users))
+        finally:
+            stop_gunicorn(proc)
+
+    base_ms, loaded_ms = _latencies(base), _latencies(loaded)
+    slow_status = _statuses(slow)
+    for name, samples in sorted(slow.samples.items()):
+        ms = sorted(m for m, _ in samples)
+        print(f"[background] slow {name}: {slow_status[name]} p50={statistics.median(ms):.0f} ms max={ms[-1]:.0f} ms", flush=True)
+    for label, ms in (("baseline", base_ms), ("with slow jobs", loaded_ms)):
+        print(
+            f"[background] fast callbacks {label}: n={len(ms)} p50={statistics.median(ms):.1f} ms "
+            f"p95={_pct(ms, 0.95):.1f} ms max={ms[-1]:.1f} ms",
+            flush=True,
+        )
+
+    _check(all(set(s) == {"ok"} for s in slow_status.values()), "every slow job finished without error")
+    _check(
+        all(slow_status.get(name, {}).get("ok") for name in ("update_impact_chart_job", "init_matchup_dropdown", "load_mlb_matchup")),
+        "each slow path completed at least once during the loaded phase",
+    )
+    _check(not any(s != "ok" and s != "no_update" for st in _statuses(loaded).values() for s in st),
+           "fast callbacks had no errors under load")
+    base_p95, loaded_p95 = _pct(base_ms, 0.95), _pct(loaded_ms, 0.95)
+    limit = max(base_p95 * args.max_ratio, base_p95 + args.slack_ms)
+    _check(loaded_p95 <= limit, f"fast p95 {loaded_p95:.1f} ms <= {limit:.1f} ms (baseline {base_p95:.1f} ms)")
+    print("[background] OK", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# tools/check_import_budget.py
+"""
+Import-time budget check for the web app.
+
+Imports `app` in a fresh interpreter under `python -X importtime` with the
+socket layer patched so that any connect / DNS lookup is recorded and
+refused. Fails (exit 1) if
+
+  - importing app takes longer than --budget-ms (wall clock), or
+  - anything tried to open a network connection during import.
+
+Page layouts and loaders must stay lazy for this to pass; it mirrors what
+gunicorn does when it boots a worker.
+
+Usage (from src/):
+    python -m tools.check_import_budget
+    python -m tools.check_import_budget --budget-ms 3000 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "4000"))
+
+# Runs in the child interpreter. Patches socket before anything else is
+# imported, then imports app and prints one JSON line with the result.
+_CHILD = r"""
+import json, socket, sys, time
+
+attempts = []
+
+def _refuse(kind):
+    def _inner(*args, **kwargs):
+        target = args[1] if kind == "connect" and len(args) > 1 else (args[0] if args else None)
+        attempts.append({"call": kind, "target": repr(target)})
+        raise OSError(f"network access during import: {kind} {target!r}")
+    return _inner
+
+socket.socket.connect = _refuse("connect")
+socket.socket.connect_ex = _refuse("connect")
+socket.create_connection = _refuse("create_connection")
+socket.getaddrinfo = _refuse("getaddrinfo")
+
+t0 = time.perf_counter()
+error = None
+try:
+    import app  # noqa: F401
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+sys.stdout.write(json.dumps({"elapsed_ms": elapsed_ms, "sockets": attempts, "error": error}) + "\n")
+"""
+
+
+def _parse_importtime(stderr: str, top: int) -> list[tuple[int, str]]:
+    """(cumulative_us, module) for the slowest imports up to one level below the top."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        # nesting is two spaces per level after the single separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth > 1:
+            continue
+        rows.append((cumulative, name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def run_check(budget_ms: float, top: int = 10) -> dict:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    result_line = next(
+        (l for l in reversed(proc.stdout.strip().splitlines()) if l.startswith("{")),
+        None,
+    )
+    if result_line is None:
+        return {
+            "ok": False,
+            "error": f"child exited with {proc.returncode}",
+            "stderr_tail": proc.stderr.splitlines()[-20:],
+        }
+
+    result = json.loads(result_line)
+    result["budget_ms"] = budget_ms
+    result["slowest"] = [
+        {"module": m, "cumulative_ms": round(us / 1000.0, 1)} for us, m in _parse_importtime(proc.stderr, top)
+    ]
+    result["ok"] = (
+        result["error"] is None
+        and not result["sockets"]
+        and result["elapsed_ms"] <= budget_ms
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if importing app is slow or touches the network.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports")
+    args = parser.parse_args()
+
+    result = run_check(args.budget_ms, args.top)
+
+    if "elapsed_ms" in result:
+        print(f"[import_budget] import app: {result['elapsed_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)", flush=True)
+        for row in result["slowest"]:
+            print(f"[import_budget]   {row['cumulative_ms']:>8.1f} ms  {row['module']}", flush=True)
+    if result.get("error"):
+        print(f"[import_budget] FAIL: import raised {result['error']}", flush=True)
+    for s in result.get("sockets", []):
+        print(f"[import_budget] FAIL: {s['call']} -> {s['target']}", flush=True)
+    if "stderr_tail" in result:
+        print("\n".join(result["stderr_tail"]), flush=True)
+    if result.get("elapsed_ms", 0) > args.budget_ms:
+        print("[import_budget] FAIL: over budget", flush=True)
+
+    if not result["ok"]:
+        sys.exit(1)
+    print("[import_budget] OK", flush=True)
+
+
+if __name__ == "__main__":
+    main()
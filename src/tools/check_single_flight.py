@@ -0,0 +1,153 @@
+# tools/check_single_flight.py
+"""
+Concurrency check for the single-flight loaders (caching.single_flight).
+
+For each cached loader the callbacks hit on a cold worker -- get_nba_df,
+get_nfl_df, get_nba_impact_df and nfl_matchup.get_data -- 50 threads are
+released at once against an empty cache. The underlying file read is
+wrapped with a counter (and slowed down to widen the race window), and the
+check asserts exactly one fetch per file happened and every caller got the
+same object.
+
+A second scenario checks failure handling: a loader that raises must raise
+in all 50 callers after one attempt, keep failing fast during the backoff
+window without calling the loader again, and load normally once the window
+has passed.
+
+Runs offline against the bundled files in data/ unless the *_FILE env vars
+point elsewhere. Exits non-zero on the first failed assertion.
+
+Usage (from src/):
+    python -m tools.check_single_flight
+    python -m tools.check_single_flight --callers 200
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+os.environ.setdefault("NBA_STATS_FILE", str(DATA_DIR / "NBA_Player_Stats.parquet"))
+os.environ.setdefault("NBA_IMPACT_FILE", str(DATA_DIR / "NBA_Player_Stats.parquet"))
+os.environ.setdefault("NFL_STATS_FILE", str(DATA_DIR / "Player_Stats_Weekly.parquet"))
+os.environ.setdefault("GAMELOG_DATASET_ROOT", "")
+
+FETCH_DELAY_S = 0.2
+
+
+def _stampede(fn, callers: int) -> tuple[list, list]:
+    """Releases `callers` threads at fn() together; returns (results, errors)."""
+    barrier = threading.Barrier(callers)
+    results, errors = [None] * callers, [None] * callers
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def _counting(fn, counter: Counter):
+    def wrapped(path, *args, **kwargs):
+        counter[str(path)] += 1
+        time.sleep(FETCH_DELAY_S)
+        return fn(path, *args, **kwargs)
+    return wrapped
+
+
+def _check(cond: bool, msg: str):
+    status = "ok  " if cond else "FAIL"
+    print(f"[single_flight] {status} {msg}", flush=True)
+    if not cond:
+        sys.exit(1)
+
+
+def check_loaders(callers: int):
+    import app  # noqa: F401  (registers pages so nfl_matchup can be imported)
+    import data_store
+    from pages import nfl_matchup
+
+    fetches = Counter()
+    data_store._read_parquet_anywhere = _counting(data_store._read_parquet_anywhere, fetches)
+    nfl_matchup._read_excel_anywhere = _counting(nfl_matchup._read_excel_anywhere, fetches)
+
+    loaders = {
+        "get_nba_df": (data_store.get_nba_df, data_store.clear_nba_cache, [data_store.NBA_STATS_FILE]),
+        "get_nfl_df": (data_store.get_nfl_df, data_store.clear_nfl_cache, [data_store.NFL_STATS_FILE]),
+        "get_nba_impact_df": (data_store.get_nba_impact_df, data_store.clear_nba_impact_cache, [data_store.NBA_IMPACT_FILE]),
+        "nfl_matchup.get_data": (
+            nfl_matchup.get_data,
+            nfl_matchup.invalidate_cache,
+            [nfl_matchup.TEAM_STATS_FILE, nfl_matchup.SCHEDULE_FILE],
+        ),
+    }
+
+    for name, (fn, clear, paths) in loaders.items():
+        clear()
+        fetches.clear()
+        t0 = time.perf_counter()
+        results, errors = _stampede(fn, callers)
+        elapsed = (time.perf_counter() - t0) * 1000.0
+
+        _check(not any(errors), f"{name}: no caller raised ({[e for e in errors if e][:1]})")
+        for path in paths:
+            _check(fetches[str(path)] == 1, f"{name}: {callers} cold callers -> {fetches[str(path)]} fetch of {Path(path).name}")
+        _check(all(r is results[0] for r in results), f"{name}: all callers share one result ({elapsed:.0f} ms)")
+
+
+def check_failure_backoff(callers: int):
+    from caching import single_flight
+
+    calls = Counter()
+    state = {"fail": True}
+
+    @single_flight(maxsize=1, backoff_base=0.5, backoff_max=0.5)
+    def flaky():
+        calls["n"] += 1
+        time.sleep(FETCH_DELAY_S)
+        if state["fail"]:
+            raise ConnectionError("simulated download failure")
+        return object()
+
+    results, errors = _stampede(flaky, callers)
+    _check(calls["n"] == 1, f"failure: {callers} cold callers -> {calls['n']} attempt")
+    _check(all(isinstance(e, ConnectionError) for e in errors), "failure: every caller saw the error")
+
+    state["fail"] = False
+    try:
+        flaky()
+        raised = False
+    except ConnectionError:
+        raised = True
+    _check(raised and calls["n"] == 1, "failure: call inside backoff window fails fast without a retry")
+
+    time.sleep(0.6)
+    results, errors = _stampede(flaky, callers)
+    _check(not any(errors) and calls["n"] == 2, f"failure: after backoff one retry serves all callers (attempts={calls['n']})")
+    _check(all(r is results[0] for r in results), "failure: retried result is shared")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert cold concurrent loads trigger exactly one fetch.")
+    parser.add_argument("--callers", type=int, default=50)
+    args = parser.parse_args()
+
+    check_loaders(args.callers)
+    check_failure_backoff(args.callers)
+    print("[single_flight] OK", flush=True)
+
+
+if __name__ == "__main__":
+    main()
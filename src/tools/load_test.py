@@ -0,0 +1,649 @@
+# tools/load_test.py
+"""
+HTTP load test for the Dash callback endpoint (POST /dash/_dash-update-component).
+
+Replays user sessions (ordered callback requests with think times) from
+--users concurrent virtual users against app.py's `server` and reports
+p50/p95/p99 latency, throughput and errors per callback, which is what we
+need to size gunicorn workers and threads.
+
+Sessions come from one of:
+  - built from the data (default): scripted NBA stats (player pick, slider
+    drag, with/without, b2b and rest filters), NBA impact (player, stat clicks,
+    exclusions), NBA props, NFL stats/matchups and MLB pitcher flows with
+    inputs sampled from the dataset the server is using
+  - --sessions FILE: sessions saved earlier with --save-sessions
+  - --har FILE: a browser HAR recording; its _dash-update-component POSTs
+    become one session
+
+With --spawn the tool starts gunicorn itself on a local port with offline
+fixtures (the files in data/ or tools.synth_data output via --seasons, and a
+tools.mlb_fixtures MLB directory), so it needs no external network. Without
+--spawn it targets --url.
+
+Usage (from src/):
+    python -m tools.load_test --spawn --workers 2 --threads 4 --users 16 --duration 60
+    python -m tools.load_test --spawn --seasons 10 --users 32 --out ../bench/load.json
+    python -m tools.load_test --url http://127.0.0.1:8050 --sessions sessions.json --users 8
+    python -m tools.load_test --spawn --save-sessions sessions.json --duration 0
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data"
+SRC_DIR = PROJECT_ROOT / "src"
+
+DASH_PREFIX = "/dash/"
+UPDATE_PATH = DASH_PREFIX + "_dash-update-component"
+
+N_SESSIONS_PER_FLOW = 6
+SPAWN_READY_TIMEOUT_S = 180
+# How often a virtual user polls a background callback job (the browser uses
+# the callback's `interval`)
+BACKGROUND_POLL_S = 0.25
+
+
+# -------------------------------------------------
+# Dash request bodies
+# -------------------------------------------------
+def _split_prop(s: str) -> dict:
+    cid, prop = s.rsplit(".", 1)
+    if cid.startswith("{"):
+        cid = json.loads(cid)
+    return {"id": cid, "property": prop}
+
+
+def _outputs_of(output_key: str):
+    if output_key.startswith("..") and output_key.endswith(".."):
+        return [_split_prop(p) for p in output_key[2:-2].split("...")]
+    return _split_prop(output_key)
+
+
+def _prop_id(cid, prop: str) -> str:
+    if isinstance(cid, dict):
+        cid = json.dumps(cid, sort_keys=True, separators=(",", ":"))
+    return f"{cid}.{prop}"
+
+
+class CallbackSpecs:
+    """Dash callback specs by function name, read from the registered callback map."""
+
+    def __init__(self):
+        from dash import _callback
+
+        self.by_name = {}
+        for output_key, spec in _callback.GLOBAL_CALLBACK_MAP.items():
+            name = getattr(spec.get("callback"), "__name__", output_key)
+            self.by_name[name] = (output_key, spec)
+
+    def body(self, name: str, values: dict, changed: list[str]) -> dict:
+        """
+        Request body for callback `name`. `values` maps "id.prop" to a value;
+        pattern-matching inputs take a list of (id dict, value) pairs under
+        their wildcard "id.prop" key. `changed` lists the triggering "id.prop"s.
+        """
+        output_key, spec = self.by_name[name]
+
+        def entries(deps):
+            out = []
+            for dep in deps:
+                key = _prop_id(dep["id"], dep["property"])
+                if dep["id"].startswith("{"):
+                    out.append([
+                        {"id": cid, "property": dep["property"], "value": v}
+                        for cid, v in values.get(key, [])
+                    ])
+                else:
+                    out.append({"id": dep["id"], "property": dep["property"], "value": values.get(key)})
+            return out
+
+        body = {
+            "output": output_key,
+            "outputs": _outputs_of(output_key),
+            "inputs": entries(spec["inputs"]),
+            "changedPropIds": changed,
+        }
+        if spec.get("state"):
+            body["state"] = entries(spec["state"])
+        return body
+
+
+def _step(specs: CallbackSpecs, name: str, values: dict, changed: list[str], think_ms: int = 0) -> dict:
+    return {"callback": name, "think_ms": think_ms, "body": specs.body(name, values, changed)}
+
+
+# -------------------------------------------------
+# Session building (scripted user flows)
+# -------------------------------------------------
+def _nba_stats_session(specs, rng, season, player, mates) -> list[dict]:
+    v = {
+        "nba-season-dropdown.value": season,
+        "nba-stats-player-dropdown.value": player,
+        "nba-stats-stat-dropdown.value": "pts",
+        "nba-stats-with-dropdown.value": None,
+        "nba-stats-without-dropdown.value": None,
+        "nba-stats-threshold-slider.value": 15,
+        "nba-b2b-toggle.value": [],
+        "nba-3in4-toggle.value": [],
+        "nba-4in6-toggle.value": [],
+        "nba-rest-dropdown.value": None,
+        "nba-games-last-7-dropdown.value": None,
+        "nba-init.n_intervals": 1,
+    }
+    steps = [
+        _step(specs, "populate_player_dropdown", v, ["nba-init.n_intervals"]),
+        _step(specs, "update_with_without_dropdowns", v, ["nba-stats-player-dropdown.value"], 800),
+        _step(specs, "stats_update_slider_props", v, ["nba-stats-player-dropdown.value"]),
+        _step(specs, "stats_update_chart_and_counts", v, ["nba-stats-player-dropdown.value"]),
+    ]
+    # slider drag: a burst of threshold changes
+    for threshold in rng.choice(range(5, 40), size=5, replace=False):
+        v = {**v, "nba-stats-threshold-slider.value": int(threshold)}
+        steps.append(_step(specs, "show_threshold", v, ["nba-stats-threshold-slider.value"], 120))
+        steps.append(_step(specs, "stats_update_chart_and_counts", v, ["nba-stats-threshold-slider.value"]))
+    # stat change
+    v = {**v, "nba-stats-stat-dropdown.value": rng.choice(["reb", "ast", "pra"])}
+    steps.append(_step(specs, "stats_update_slider_props", v, ["nba-stats-stat-dropdown.value"], 1500))
+    steps.append(_step(specs, "stats_update_chart_and_counts", v, ["nba-stats-stat-dropdown.value"]))
+    # with / without toggles
+    if mates:
+        for key in ("nba-stats-with-dropdown.value", "nba-stats-without-dropdown.value"):
+            v = {**v, "nba-stats-with-dropdown.value": None, "nba-stats-without-dropdown.value": None,
+                 key: rng.choice(mates)}
+            for name in ("update_with_without_dropdowns", "stats_update_slider_props", "stats_update_chart_and_counts"):
+                steps.append(_step(specs, name, v, [key], 1000 if name == "update_with_without_dropdowns" else 0))
+    # back-to-back filter
+    v = {**v, "nba-b2b-toggle.value": ["b2b2"]}
+    steps.append(_step(specs, "stats_update_slider_props", v, ["nba-b2b-toggle.value"], 1200))
+    steps.append(_step(specs, "stats_update_chart_and_counts", v, ["nba-b2b-toggle.value"]))
+    # rest days instead
+    v = {**v, "nba-b2b-toggle.value": [], "nba-rest-dropdown.value": int(rng.choice([2, 3, 4]))}
+    steps.append(_step(specs, "stats_update_slider_props", v, ["nba-rest-dropdown.value"], 1200))
+    steps.append(_step(specs, "stats_update_chart_and_counts", v, ["nba-rest-dropdown.value"]))
+    return steps
+
+
+def _nba_impact_session(specs, rng, player, mates, stats) -> list[dict]:
+    v = {"nba-impact-player-a.value": player, "nba-impact-exclude-players.value": []}
+    steps = [
+        _step(specs, "update_exclude_dropdown", v, ["nba-impact-player-a.value"]),
+        _step(specs, "build_stat_buttons", v, ["nba-impact-player-a.value"]),
+    ]
+    pattern = '{"index":["ALL"],"type":"nba-impact-stat-button"}.n_clicks'
+    clicks = {s: 0 for s in stats}
+
+    def click(stat, think_ms):
+        clicks[stat] += 1
+        v[pattern] = [({"type": "nba-impact-stat-button", "index": s}, clicks[s]) for s in stats]
+        changed = _prop_id({"type": "nba-impact-stat-button", "index": stat}, "n_clicks")
+        steps.append(_step(specs, "update_impact_chart", dict(v), [changed], think_ms))
+
+    for stat in rng.choice(stats, size=min(3, len(stats)), replace=False):
+        click(str(stat), 1500)
+    if mates:
+        excluded = [str(m) for m in rng.choice(mates, size=min(2, len(mates)), replace=False)]
+        v["nba-impact-exclude-players.value"] = excluded
+        click(stats[0], 2000)
+        # the click hands charts with exclusions to the background job
+        job = {"player_a": player, "excluded": excluded, "stat": str(stats[0])}
+        steps.append(_step(specs, "update_impact_chart_job", {"nba-impact-job.data": job}, ["nba-impact-job.data"]))
+    return steps
+
+
+def _nba_props_session(specs, rng, players, markets) -> list[dict]:
+    v = {"main-tabs.value": "props", "props-player-dropdown.value": None,
+         "props-market-dropdown.value": None, "props-side-radio.value": "over",
+         "props-odds-table.page_current": 0, "props-odds-table.page_size": 50,
+         "props-odds-table.sort_by": [], "props-odds-table.filter_query": ""}
+    steps = [
+        _step(specs, "props_update_options", v, ["main-tabs.value"]),
+        _step(specs, "props_update_table", v, ["props-side-radio.value"]),
+    ]
+    # server-side table: sort, then page through the sorted lines
+    v = {**v, "props-odds-table.sort_by": [{"column_id": "line_id", "direction": "desc"}]}
+    steps.append(_step(specs, "props_update_table", v, ["props-odds-table.sort_by"], 800))
+    for page in range(1, 3):
+        v = {**v, "props-odds-table.page_current": page}
+        steps.append(_step(specs, "props_update_table", v, ["props-odds-table.page_current"], 600))
+    v = {**v, "props-odds-table.page_current": 0, "props-odds-table.sort_by": []}
+    for player in rng.choice(players, size=min(3, len(players)), replace=False):
+        v = {**v, "props-player-dropdown.value": str(player)}
+        steps.append(_step(specs, "props_update_table", v, ["props-player-dropdown.value"], 1500))
+    if markets:
+        v = {**v, "props-market-dropdown.value": str(rng.choice(markets))}
+        steps.append(_step(specs, "props_update_table", v, ["props-market-dropdown.value"], 1000))
+    return steps
+
+
+def _nfl_session(specs, rng, season, player) -> list[dict]:
+    v = {
+        "nfl-init.n_intervals": 1,
+        "nfl-season-dropdown.value": season,
+        "nfl-stats-player-dropdown.value": player,
+        "nfl-stats-stat-dropdown.value": "fantasy_points",
+        "nfl-stats-threshold-slider.value": 10,
+        "nfl-schedule-toggle.value": [],
+    }
+    steps = [
+        _step(specs, "nfl_init_dropdowns", v, ["nfl-init.n_intervals"]),
+        _step(specs, "nfl_update_slider_props", v, ["nfl-stats-player-dropdown.value"], 800),
+        _step(specs, "nfl_update_chart_and_counts", v, ["nfl-stats-player-dropdown.value"]),
+    ]
+    for threshold in rng.choice(range(2, 30), size=4, replace=False):
+        v = {**v, "nfl-stats-threshold-slider.value": int(threshold)}
+        steps.append(_step(specs, "nfl_show_threshold", v, ["nfl-stats-threshold-slider.value"], 120))
+        steps.append(_step(specs, "nfl_update_chart_and_counts", v, ["nfl-stats-threshold-slider.value"]))
+    # short weeks only
+    v = {**v, "nfl-schedule-toggle.value": ["short"]}
+    steps.append(_step(specs, "nfl_update_slider_props", v, ["nfl-schedule-toggle.value"], 1000))
+    steps.append(_step(specs, "nfl_update_chart_and_counts", v, ["nfl-schedule-toggle.value"]))
+    return steps
+
+
+def _nfl_matchup_session(specs, rng, matchups) -> list[dict]:
+    steps = []
+    for m in rng.choice(matchups, size=min(3, len(matchups)), replace=False):
+        steps.append(_step(specs, "update_matchup", {"matchup-dropdown.value": str(m)},
+                           ["matchup-dropdown.value"], 1500))
+    return steps
+
+
+def _mlb_session(specs, rng, pitchers) -> list[dict]:
+    steps = []
+    for pitcher in rng.choice(pitchers, size=min(2, len(pitchers)), replace=False):
+        steps.append(_step(specs, "select_pitcher", {"mlb-pitcher-dropdown.value": str(pitcher)},
+                           ["mlb-pitcher-dropdown.value"], 2000))
+    return steps
+
+
+def build_sessions(seed: int = 0, per_flow: int = N_SESSIONS_PER_FLOW) -> list[dict]:
+    """Scripted sessions for every page, with inputs sampled from the configured data."""
+    import numpy as np
+
+    import app  # noqa: F401  (registers every page and callback)
+    import data_store
+    import mlb_data
+    from pages import nfl_matchup
+    from query_backend import get_backend
+
+    rng = np.random.default_rng(seed)
+    specs = CallbackSpecs()
+    backend = get_backend()
+    sessions = []
+
+    def add(flow, steps):
+        if steps:
+            sessions.append({"name": f"{flow}-{len(sessions)}", "flow": flow, "steps": steps})
+
+    season = (backend.nba_seasons() or [None])[-1]
+    nba_players = list(backend.nba_players(season))
+    for player in rng.choice(nba_players, size=min(per_flow, len(nba_players)), replace=False):
+        add("nba_stats", _nba_stats_session(specs, rng, season, str(player), list(backend.nba_teammates(player, season))))
+
+    impact_players = list(backend.impact_players())
+    stats = list(backend.impact_stat_cols())
+    for player in rng.choice(impact_players, size=min(per_flow, len(impact_players)), replace=False):
+        add("nba_impact", _nba_impact_session(specs, rng, str(player), list(backend.impact_teammates(player)), stats))
+
+    props = data_store.get_nba_props_df()
+    prop_players = list(props["player"].dropna().unique()) if "player" in props.columns else []
+    markets = list(props["market"].dropna().unique()) if "market" in props.columns else []
+    if prop_players:
+        for _ in range(per_flow):
+            add("nba_props", _nba_props_session(specs, rng, prop_players, markets))
+
+    nfl_df = data_store.get_nfl_df()
+    nfl_season = int(nfl_df["season"].max()) if "season" in nfl_df.columns else None
+    nfl_players = sorted(nfl_df[data_store.NFL_PLAYER_COL].dropna().unique())
+    for player in rng.choice(nfl_players, size=min(per_flow, len(nfl_players)), replace=False):
+        add("nfl_stats", _nfl_session(specs, rng, nfl_season, str(player)))
+
+    matchups = list(nfl_matchup.get_data()[2])
+    if matchups:
+        for _ in range(per_flow):
+            add("nfl_matchup", _nfl_matchup_session(specs, rng, matchups))
+
+    pitchers = sorted(mlb_data.get_mlb_data().dfPitchers["Baseball_Savant_Name"].unique())
+    for _ in range(per_flow):
+        add("mlb", _mlb_session(specs, rng, pitchers))
+
+    # numpy scalars -> plain JSON values, so sessions replay and save as-is
+    return json.loads(json.dumps(sessions, default=lambda o: o.item() if hasattr(o, "item") else str(o)))
+
+
+def sessions_from_har(path: str) -> list[dict]:
+    """One session from a browser HAR recording, keeping the recorded gaps as think times."""
+    entries = json.loads(Path(path).read_text())["log"]["entries"]
+    steps = []
+    last_start = None
+    for e in entries:
+        req = e["request"]
+        if req.get("method") != "POST" or not req.get("url", "").endswith("_dash-update-component"):
+            continue
+        body = json.loads(req["postData"]["text"])
+        start = time.mktime(time.strptime(e["startedDateTime"][:19], "%Y-%m-%dT%H:%M:%S"))
+        think_ms = int((start - last_start) * 1000) if last_start is not None else 0
+        last_start = start
+        steps.append({"callback": body["output"], "think_ms": max(0, think_ms), "body": body})
+    return [{"name": Path(path).stem, "flow": "har", "steps": steps}]
+
+
+# -------------------------------------------------
+# Load generation
+# -------------------------------------------------
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}  # callback -> list of (latency_ms, status)
+        self.started = None
+        self.measuring = False
+
+    def add(self, callback: str, latency_ms: float, status: str):
+        if not self.measuring:
+            return
+        with self.lock:
+            self.samples.setdefault(callback, []).append((latency_ms, status))
+
+
+def fetch_end_id(http: requests.Session, base_url: str) -> str | None:
+    """The per-page-load token Dash expects on background callback requests."""
+    html_text = http.get(base_url + DASH_PREFIX, timeout=30).text
+    start = html_text.find('id="_dash-config"')
+    if start < 0:
+        return None
+    start = html_text.index(">", start) + 1
+    config = json.loads(html_text[start:html_text.index("</script>", start)])
+    return config.get("end_id")
+
+
+def post_callback(http: requests.Session, base_url: str, body: dict, end_id: str | None, timeout: float) -> str:
+    """
+    POSTs one callback request like the renderer does and returns its status.
+    Background callbacks answer with a job handle; the job is polled until
+    its result arrives, so the latency covers the whole job.
+    """
+    params = {"endId": end_id} if end_id else {}
+    data = json.dumps(body)
+    deadline = time.monotonic() + timeout
+    resp = http.post(base_url + UPDATE_PATH, params=params, data=data, timeout=timeout)
+    while resp.status_code == 200:
+        payload = resp.json()
+        if "response" in payload:
+            return "ok"
+        if "cacheKey" in payload:
+            params = {**params, "cacheKey": payload["cacheKey"], "job": payload["job"]}
+        elif "cacheKey" not in params:
+            return "ok"
+        if time.monotonic() > deadline:
+            return "job_timeout"
+        time.sleep(BACKGROUND_POLL_S)
+        resp = http.post(base_url + UPDATE_PATH, params=params, data=data, timeout=timeout)
+    return "no_update" if resp.status_code == 204 else f"http_{resp.status_code}"
+
+
+def _virtual_user(base_url, sessions, recorder, stop, think_scale, timeout, user_idx):
+    http = requests.Session()
+    http.headers["Content-Type"] = "application/json"
+    try:
+        end_id = fetch_end_id(http, base_url)
+    except (requests.RequestException, ValueError):
+        end_id = None
+    rnd = random.Random(user_idx)
+    order = list(range(len(sessions)))
+    rnd.shuffle(order)
+    i = 0
+    while not stop.is_set():
+        session = sessions[order[i % len(order)]]
+        i += 1
+        for step in session["steps"]:
+            if stop.is_set():
+                return
+            if step["think_ms"] and think_scale > 0:
+                stop.wait(step["think_ms"] * think_scale / 1000.0)
+            t0 = time.perf_counter()
+            try:
+                status = post_callback(http, base_url, step["body"], end_id, timeout)
+            except (requests.RequestException, ValueError) as e:
+                status = type(e).__name__
+            recorder.add(step["callback"], (time.perf_counter() - t0) * 1000.0, status)
+
+
+def _pct(sorted_ms: list[float], q: float) -> float:
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(q * (len(sorted_ms) - 1))))]
+
+
+def summarize(recorder: Recorder, elapsed_s: float) -> dict:
+    per_callback = {}
+    total = errors = 0
+    for callback, samples in sorted(recorder.samples.items()):
+        ms = sorted(s[0] for s in samples)
+        statuses = {}
+        for _, status in samples:
+            statuses[status] = statuses.get(status, 0) + 1
+        n_err = sum(n for s, n in statuses.items() if s not in ("ok", "no_update"))
+        per_callback[callback] = {
+            "n": len(samples),
+            "errors": n_err,
+            "error_rate": round(n_err / len(samples), 4),
+            "statuses": statuses,
+            "p50_ms": round(statistics.median(ms), 2),
+            "p95_ms": round(_pct(ms, 0.95), 2),
+            "p99_ms": round(_pct(ms, 0.99), 2),
+            "max_ms": round(ms[-1], 2),
+            "rps": round(len(samples) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        }
+        total += len(samples)
+        errors += n_err
+    all_ms = sorted(s[0] for samples in recorder.samples.values() for s in samples)
+    overall = {"n": total, "errors": errors, "rps": round(total / elapsed_s, 2) if elapsed_s > 0 else 0.0}
+    if all_ms:
+        overall.update(p50_ms=round(statistics.median(all_ms), 2), p95_ms=round(_pct(all_ms, 0.95), 2),
+                       p99_ms=round(_pct(all_ms, 0.99), 2))
+    return {"overall": overall, "callbacks": per_callback}
+
+
+def run_load(base_url, sessions, users, duration_s, warmup_s, think_scale, timeout) -> dict:
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=_virtual_user,
+            args=(base_url, sessions, recorder, stop, think_scale, timeout, u),
+            name=f"vu-{u}",
+            daemon=True,
+        )
+        for u in range(users)
+    ]
+    for t in threads:
+        t.start()
+    if warmup_s > 0:
+        print(f"[load] warm-up {warmup_s:.0f}s", flush=True)
+        time.sleep(warmup_s)
+    recorder.measuring = True
+    t0 = time.perf_counter()
+    print(f"[load] measuring {duration_s:.0f}s with {users} users", flush=True)
+    time.sleep(duration_s)
+    recorder.measuring = False
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    for t in threads:
+        t.join(timeout=timeout + 1)
+    return summarize(recorder, elapsed)
+
+
+# -------------------------------------------------
+# Local gunicorn with offline fixtures
+# -------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def fixture_env(tmp: Path, seasons: int, mlb_pitchers: int) -> dict:
+    from tools.bench_callbacks import _dataset_env
+    from tools.mlb_fixtures import write_mlb_fixtures
+
+    mlb_dir = write_mlb_fixtures(tmp / "mlb", n_pitchers=mlb_pitchers)
+    if seasons:
+        from tools.synth_data import write_synthetic
+
+        files = write_synthetic(tmp / "synthetic", seasons, props=True)
+        env = _dataset_env(files["nba"], files["nfl"], files["props"], mlb_dir)
+    else:
+        env = _dataset_env(
+            DATA_DIR / "NBA_Player_Stats.parquet",
+            DATA_DIR / "Player_Stats_Weekly.parquet",
+            DATA_DIR / "Basketball_Props.xlsx",
+            mlb_dir,
+        )
+    # keep background jobs, data generations, cached results and view logs
+    # out of the shared dirs
+    env["BACKGROUND_CACHE_DIR"] = str(tmp / "background")
+    env["RESULT_CACHE_DIR"] = str(tmp / "results")
+    env["VIEW_LOG_DIR"] = str(tmp / "views")
+    return env
+
+
+def spawn_gunicorn(env: dict, workers: int, threads: int, log_path: Path) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "gunicorn", "app:server",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--timeout", "300",
+    ]
+    log = open(log_path, "w")
+    proc = subprocess.Popen(
+        cmd, cwd=SRC_DIR, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SPAWN_READY_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}; see {log_path}")
+        try:
+            if requests.get(base_url + DASH_PREFIX, timeout=5).status_code == 200:
+                print(f"[load] gunicorn ready on {base_url} (workers={workers} threads={threads})", flush=True)
+                return proc, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_gunicorn(proc)
+    raise RuntimeError(f"gunicorn not ready after {SPAWN_READY_TIMEOUT_S}s; see {log_path}")
+
+
+def stop_gunicorn(proc: subprocess.Popen):
+    if proc.poll() is None:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+# -------------------------------------------------
+# Report
+# -------------------------------------------------
+def print_report(report: dict):
+    print(f"\n{'callback':<36}{'n':>7}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for name, r in report["callbacks"].items():
+        print(f"{name[:35]:<36}{r['n']:>7}{r['errors']:>6}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['rps']:>9.2f}")
+    o = report["overall"]
+    if o["n"]:
+        print(f"{'ALL':<36}{o['n']:>7}{o['errors']:>6}{o['p50_ms']:>10.1f}{o['p95_ms']:>10.1f}{o['p99_ms']:>10.1f}{o['rps']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Dash callback sessions against a local server.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server (Dash under /dash/)")
+    target.add_argument("--spawn", action="store_true", help="Start gunicorn locally with offline fixtures")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers (--spawn)")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker (--spawn)")
+    parser.add_argument("--seasons", type=int, default=0, help="Use tools.synth_data game logs (--spawn); 0 = data/")
+    parser.add_argument("--mlb-pitchers", type=int, default=30, help="Pitchers in the MLB fixture (--spawn)")
+    parser.add_argument("--sessions", help="Replay sessions from this JSON file")
+    parser.add_argument("--har", help="Replay the Dash requests in this HAR recording")
+    parser.add_argument("--save-sessions", help="Write the sessions used to this JSON file")
+    parser.add_argument("--flows", help="Comma-separated flows to replay (nba_stats,nba_impact,nba_props,nfl_stats,nfl_matchup,mlb)")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--think-scale", type=float, default=0.0,
+                        help="Multiplier on recorded think times (0 = closed loop, 1 = recorded pacing)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "users": args.users,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_scale": args.think_scale,
+        }
+        try:
+            if args.spawn:
+                env = fixture_env(Path(tmp), args.seasons, args.mlb_pitchers)
+                # sessions are built in this process against the same data as the server
+                os.environ.update(env)
+                proc, base_url = spawn_gunicorn(env, args.workers, args.threads, Path(tmp) / "gunicorn.log")
+                meta.update(workers=args.workers, threads=args.threads, seasons=args.seasons)
+            else:
+                base_url = args.url.rstrip("/")
+            meta["url"] = base_url
+
+            if args.sessions:
+                sessions = json.loads(Path(args.sessions).read_text())
+            elif args.har:
+                sessions = sessions_from_har(args.har)
+            else:
+                sessions = build_sessions(args.seed)
+            if args.flows:
+                flows = {f.strip() for f in args.flows.split(",")}
+                sessions = [s for s in sessions if s.get("flow") in flows]
+            if args.save_sessions:
+                Path(args.save_sessions).write_text(json.dumps(sessions, default=str))
+                print(f"[load] wrote {len(sessions)} sessions to {args.save_sessions}", flush=True)
+            if not sessions or args.duration <= 0:
+                return
+            meta["sessions"] = len(sessions)
+            meta["requests_per_pass"] = sum(len(s["steps"]) for s in sessions)
+
+            report = {"meta": meta, **run_load(
+                base_url, sessions, args.users, args.duration, args.warmup, args.think_scale, args.timeout
+            )}
+        finally:
+            if proc is not None:
+                stop_gunicorn(proc)
+
+    print_report(report)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\n[load] wrote {args.out}", flush=True)
+    if report["overall"]["errors"]:
+        print(f"\n[load] {report['overall']['errors']} failed request(s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
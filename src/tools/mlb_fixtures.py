@@ -0,0 +1,273 @@
+# tools/mlb_fixtures.py
+"""
+Offline MLB source files for benchmarks and load tests.
+
+mlb_data.py downloads twelve sheets from MLB_DATA_BASE_RAW. This writes
+synthetic stand-ins with the same file names, columns and join keys into a
+local directory; point MLB_DATA_BASE_RAW at it and the real loader and page
+callbacks run unchanged without network access.
+
+Usage (from src/):
+    python -m tools.mlb_fixtures --out /tmp/mlb_assets --pitchers 30
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MLB_TEAMS = [
+    "Arizona Diamondbacks", "Atlanta Braves", "Baltimore Orioles", "Boston Red Sox", "Chicago Cubs",
+    "Chicago White Sox", "Cincinnati Reds", "Cleveland Guardians", "Colorado Rockies", "Detroit Tigers",
+    "Houston Astros", "Kansas City Royals", "Los Angeles Angels", "Los Angeles Dodgers", "Miami Marlins",
+    "Milwaukee Brewers", "Minnesota Twins", "New York Mets", "New York Yankees", "Athletics",
+    "Philadelphia Phillies", "Pittsburgh Pirates", "San Diego Padres", "San Francisco Giants",
+    "Seattle Mariners", "St. Louis Cardinals", "Tampa Bay Rays", "Texas Rangers", "Toronto Blue Jays",
+    "Washington Nationals",
+]
+
+FIRST_NAMES = ["Alex", "Ben", "Carlos", "Dylan", "Eli", "Felix", "Gabe", "Hunter", "Ivan", "Jake",
+               "Kyle", "Luis", "Max", "Nate", "Oscar", "Pablo", "Quinn", "Ryan", "Sam", "Tyler"]
+LAST_NAMES = ["Adams", "Baker", "Cruz", "Diaz", "Evans", "Flores", "Garcia", "Hill", "Iglesias", "Jones",
+              "King", "Lopez", "Martinez", "Nunez", "Ortiz", "Perez", "Reyes", "Smith", "Torres", "Vargas",
+              "Walker", "Young"]
+
+# 19 rows per split, the statistics named in mlb_matchup.DEFAULT_SPLITS_STAT_ORDER
+SPLIT_STATS = [
+    "AVG", "BABIP", "BB%", "ERA", "FIP", "GB%", "HR/9", "K%", "K/9", "LD%",
+    "OBP", "OPS", "SLG", "SwStr%", "WHIP", "wOBA", "xFIP", "FB%", "HR/FB",
+]
+
+PROP_MARKETS = ["hits", "strikeouts", "total_bases"]
+# days of hitting logs, ending on the slate date; covers the 30-day hot-hitter window
+HITTING_LOG_DAYS = 35
+SLATE_DATE = "2025-07-01"
+PROP_BOOKS = ["draftkings", "fanduel", "betmgm", "caesars"]
+
+
+def _names(rng: np.random.Generator, n: int, offset: int = 0) -> list[str]:
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    # suffix keeps names unique at any scale
+    return [f"{f} {l}{offset + i}" for i, (f, l) in enumerate(zip(first, last))]
+
+
+def _american_odds(rng: np.random.Generator, n: int) -> np.ndarray:
+    # |odds| >= 100 on both sides, favourites a little more common
+    magnitude = rng.integers(100, 250, n)
+    sign = np.where(rng.random(n) < 0.55, -1, 1)
+    return sign * magnitude
+
+
+def build_mlb_frames(n_pitchers: int = 30, hitters_per_pitcher: int = 9, n_starts: int = 30, seed: int = 7) -> dict:
+    """Frames keyed by the file name mlb_data.py reads."""
+    rng = np.random.default_rng(seed)
+
+    pitchers = _names(rng, n_pitchers)
+    p_team = rng.choice(MLB_TEAMS, n_pitchers)
+    p_opp = rng.choice(MLB_TEAMS, n_pitchers)
+    p_hand = rng.choice(["R", "L"], n_pitchers, p=[0.7, 0.3])
+
+    ip = np.round(rng.uniform(40, 200, n_pitchers), 1)
+    so = np.round(ip * rng.uniform(0.7, 1.3, n_pitchers)).astype(int)
+    season = pd.DataFrame({
+        "Name": pitchers,
+        "W": rng.integers(0, 18, n_pitchers),
+        "L": rng.integers(0, 14, n_pitchers),
+        "ERA": np.round(rng.normal(4.1, 0.9, n_pitchers).clip(1.5, 8), 2),
+        "IP": ip,
+        "SO": so,
+        "WHIP": np.round(rng.normal(1.25, 0.15, n_pitchers).clip(0.8, 2), 3),
+        "GS": rng.integers(5, 33, n_pitchers),
+    })
+
+    historical = pd.DataFrame({
+        "Baseball_Savant_Name": pitchers,
+        "Savant ID": rng.integers(500000, 700000, n_pitchers),
+        "Handedness": p_hand,
+    })
+
+    # game logs: n_starts per pitcher, every 5 days
+    idx = np.repeat(np.arange(n_pitchers), n_starts)
+    start_no = np.tile(np.arange(n_starts), n_pitchers)
+    dates = pd.Timestamp("2025-03-27") + pd.to_timedelta(start_no * 5 + idx % 5, unit="D")
+    n_logs = len(idx)
+    logs = pd.DataFrame({
+        "Name": np.asarray(pitchers)[idx],
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Opp": rng.choice(MLB_TEAMS, n_logs),
+        "W": rng.integers(0, 2, n_logs),
+        "L": rng.integers(0, 2, n_logs),
+        "IP": np.round(rng.uniform(3, 8, n_logs), 1),
+        "BF": rng.integers(15, 32, n_logs),
+        "H": rng.integers(0, 11, n_logs),
+        "R": rng.integers(0, 8, n_logs),
+        "ER": rng.integers(0, 7, n_logs),
+        "HR": rng.integers(0, 4, n_logs),
+        "BB": rng.integers(0, 6, n_logs),
+        "SO": rng.integers(0, 13, n_logs),
+        "Pit": rng.integers(60, 115, n_logs),
+    })
+
+    split_rows = np.repeat(np.arange(n_pitchers), 2)
+    splits = pd.DataFrame({
+        "Pitcher": np.asarray(pitchers)[split_rows],
+        "Team": p_team[split_rows],
+        "Handedness": p_hand[split_rows],
+        "Opposing Team": p_opp[split_rows],
+        "Name": np.asarray(pitchers)[split_rows],
+        "Rotowire Name": np.asarray(pitchers)[split_rows],
+        "Split": np.tile(["vs L", "vs R"], n_pitchers),
+        "Baseball Savant Name": np.asarray(pitchers)[split_rows],
+        "Tm": p_team[split_rows],
+    })
+    for stat in SPLIT_STATS:
+        splits[stat] = np.round(rng.uniform(0, 1, len(splits)) * (10 if stat in ("ERA", "FIP", "xFIP", "K/9", "HR/9") else 1), 3)
+
+    def percentile_frame(names, cols):
+        last_first = [f"{n.split(' ', 1)[1]}, {n.split(' ', 1)[0]}" for n in names]
+        out = pd.DataFrame({"player_name": last_first})
+        for c in cols:
+            out[c] = rng.integers(1, 100, len(names))
+        return out
+
+    pitcher_pct = percentile_frame(
+        pitchers,
+        ["xera", "xba", "fb_velocity", "exit_velocity", "k_percent", "chase_percent",
+         "whiff_percent", "brl_percent", "hard_hit_percent", "bb_percent"],
+    )
+    pitcher_pct.insert(1, "player_id", historical["Savant ID"].values)
+    pitcher_pct["year"] = 2025
+
+    # hitters: one lineup per pitcher (the opposing batters)
+    n_hitters = n_pitchers * hitters_per_pitcher
+    hitters = _names(rng, n_hitters, offset=n_pitchers)
+    h_pitcher = np.repeat(np.arange(n_pitchers), hitters_per_pitcher)
+    h_team = p_opp[h_pitcher]
+
+    daily = pd.DataFrame({
+        "fg_name": hitters,
+        "Savant Name": hitters,
+        "Bats": rng.choice(["R", "L", "S"], n_hitters, p=[0.55, 0.35, 0.10]),
+        "Batting Order": np.tile(np.arange(1, hitters_per_pitcher + 1), n_pitchers),
+        "Average": np.round(rng.normal(0.250, 0.03, n_hitters), 3),
+        "wOBA": np.round(rng.normal(0.320, 0.035, n_hitters), 3),
+        "ISO": np.round(rng.normal(0.170, 0.05, n_hitters).clip(0.02), 3),
+        "K%": np.round(rng.normal(0.22, 0.05, n_hitters), 3),
+        "BB%": np.round(rng.normal(0.08, 0.03, n_hitters).clip(0.01), 3),
+        "Fly Ball %": np.round(rng.normal(0.38, 0.06, n_hitters), 3),
+        "Hard Contact %": np.round(rng.normal(0.36, 0.06, n_hitters), 3),
+        "Pitcher": np.asarray(pitchers)[h_pitcher],
+        "Baseball Savant Name": np.asarray(pitchers)[h_pitcher],
+        "Props Name": hitters,
+        "mlb_team_long": h_team,
+        "Pitcher Average": np.round(rng.normal(0.245, 0.03, n_hitters), 3),
+        "Pitcher K%": np.round(rng.normal(0.23, 0.05, n_hitters), 3),
+        "Weighted BB% Pitcher": np.round(rng.normal(0.08, 0.02, n_hitters), 3),
+    })
+
+    hitter_pct = percentile_frame(
+        hitters,
+        ["xwoba", "xba", "xslg", "xiso", "xobp", "brl_percent", "exit_velocity",
+         "hard_hit_percent", "k_percent", "bb_percent", "whiff_percent", "chase_percent"],
+    )
+    # mlb_data joins hitter percentiles on "Savant Name" == player_name
+    hitter_pct["player_name"] = hitters
+
+    last_week = pd.DataFrame({
+        "Name": hitters,
+        "PA": rng.integers(5, 32, n_hitters),
+        "BA": np.round(rng.normal(0.255, 0.08, n_hitters).clip(0, 0.7), 3),
+    })
+
+    # hitting logs: each hitter plays ~85% of the last HITTING_LOG_DAYS days
+    h_idx, h_day = np.nonzero(rng.random((n_hitters, HITTING_LOG_DAYS)) < 0.85)
+    n_games = len(h_idx)
+    skill = rng.normal(0.250, 0.04, n_hitters).clip(0.15, 0.36)[h_idx]
+    pa = rng.integers(3, 6, n_games)
+    bb = rng.binomial(pa, 0.08)
+    hbp = rng.binomial(pa - bb, 0.01)
+    sf = rng.binomial(pa - bb - hbp, 0.01)
+    ab = pa - bb - hbp - sf
+    hits = rng.binomial(ab, skill)
+    hr = rng.binomial(hits, 0.12)
+    triples = rng.binomial(hits - hr, 0.02)
+    doubles = rng.binomial(hits - hr - triples, 0.25)
+    hitting_logs = pd.DataFrame({
+        "Name": np.asarray(hitters)[h_idx],
+        "Date": (pd.Timestamp(SLATE_DATE) - pd.to_timedelta(HITTING_LOG_DAYS - 1 - h_day, unit="D")).strftime("%Y-%m-%d"),
+        "PA": pa,
+        "AB": ab,
+        "H": hits,
+        "2B": doubles,
+        "3B": triples,
+        "HR": hr,
+        "BB": bb,
+        "HBP": hbp,
+        "SF": sf,
+        "SO": rng.binomial(ab - hits, 0.3),
+    })
+
+    # props: every hitter and pitcher x market x book
+    players = np.array(hitters + pitchers)
+    n_players = len(players)
+    per_player = len(PROP_MARKETS) * len(PROP_BOOKS)
+    pidx = np.repeat(np.arange(n_players), per_player)
+    n_props = len(pidx)
+    props = pd.DataFrame({
+        "commence_time": f"{SLATE_DATE}T23:05:00Z",
+        "home_team": rng.choice(MLB_TEAMS, n_props),
+        "away_team": rng.choice(MLB_TEAMS, n_props),
+        "Player": players[pidx],
+        "market": np.tile(np.repeat(PROP_MARKETS, len(PROP_BOOKS)), n_players),
+        "bookmakers": np.tile(PROP_BOOKS, n_players * len(PROP_MARKETS)),
+        "Line": rng.choice([0.5, 1.5, 4.5, 5.5], n_props),
+        "Over Price": _american_odds(rng, n_props),
+        "Under Price": _american_odds(rng, n_props),
+    })
+
+    pitcher_list = pd.DataFrame({"Props Name": pitchers, "mlb_team_long": p_team})
+    hitter_list = pd.DataFrame({"Props Name": hitters, "mlb_team_long": h_team})
+
+    return {
+        "Pitcher_Season_Stats.xlsx": season,
+        "Historical_Starting_Pitchers.xlsx": historical,
+        "2025_Pitching_Logs.xlsx": logs,
+        "Season_Aggregated_Pitcher_Statistics.xlsx": splits,
+        "Pitcher_Percentile_Rankings.csv": pitcher_pct,
+        "Last_Week_Stats.xlsx": last_week,
+        "2025_Hitting_Logs.xlsx": hitting_logs,
+        "Combined_Daily_Data.xlsx": daily,
+        "Hitter_Percentile_Rankings.csv": hitter_pct,
+        "Daily_Props.xlsx": props,
+        "My_Pitcher_Listing.xlsx": pitcher_list,
+        "My_Hitter_Listing.xlsx": hitter_list,
+    }
+
+
+def write_mlb_fixtures(out_dir: Path, n_pitchers: int = 30, hitters_per_pitcher: int = 9, seed: int = 7) -> Path:
+    """Writes the MLB source files to out_dir; use it as MLB_DATA_BASE_RAW."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, frame in build_mlb_frames(n_pitchers, hitters_per_pitcher, seed=seed).items():
+        if name.endswith(".csv"):
+            frame.to_csv(out_dir / name, index=False)
+        else:
+            frame.to_excel(out_dir / name, index=False)
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write offline MLB source files for mlb_data.py.")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--pitchers", type=int, default=30)
+    parser.add_argument("--hitters-per-pitcher", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    out = write_mlb_fixtures(Path(args.out), args.pitchers, args.hitters_per_pitcher, args.seed)
+    print(f"[mlb_fixtures] wrote MLB sources to {out} (set MLB_DATA_BASE_RAW={out})", flush=True)
+
+
+if __name__ == "__main__":
+    main()
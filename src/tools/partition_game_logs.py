@@ -0,0 +1,88 @@
+# tools/partition_game_logs.py
+"""
+Writes the single-season game log parquet files into the Hive-partitioned
+store read by data_store when GAMELOG_DATASET_ROOT is set:
+
+    <out>/sport=nba/season=<season>/month=<month>/part-0.parquet
+    <out>/sport=nfl/season=<season>/week=<week>/part-0.parquet
+
+Re-running for a season replaces only that season's partitions, so new
+seasons can be appended without rewriting history.
+
+Usage (from src/):
+    python -m tools.partition_game_logs --out ../data/game_logs \\
+        --nba ../data/NBA_Player_Stats.parquet \\
+        --nfl ../data/Player_Stats_Weekly.parquet
+"""
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_store import (
+    _normalize_cols,
+    _read_parquet_anywhere,
+    NBA_DATE_COL,
+    NBA_PLAYER_COL,
+    NFL_PLAYER_COL,
+    with_nba_season,
+)
+
+
+def _write_partitions(df: pd.DataFrame, out: str, partition_cols: list[str], sort_cols: list[str]):
+    df = df.sort_values([c for c in sort_cols if c in df.columns], kind="stable")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=out,
+        partition_cols=partition_cols,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+
+def partition_nba(source: str, out: str):
+    partition_nba_frame(_read_parquet_anywhere(source), out)
+
+
+def partition_nba_frame(df: pd.DataFrame, out: str):
+    df = _normalize_cols(df)
+    df[NBA_DATE_COL] = pd.to_datetime(df[NBA_DATE_COL], errors="coerce")
+    df = with_nba_season(df).dropna(subset=[NBA_DATE_COL, "season"])
+    df["sport"] = "nba"
+    df["season"] = df["season"].astype(int)
+    df["month"] = df[NBA_DATE_COL].dt.month.astype(int)
+    _write_partitions(df, out, ["sport", "season", "month"], [NBA_PLAYER_COL, NBA_DATE_COL])
+    print(f"[partition] NBA rows={len(df):,} seasons={sorted(df['season'].unique().tolist())}", flush=True)
+
+
+def partition_nfl(source: str, out: str):
+    partition_nfl_frame(_read_parquet_anywhere(source), out)
+
+
+def partition_nfl_frame(df: pd.DataFrame, out: str):
+    df = _normalize_cols(df)
+    df = df.dropna(subset=["season", "week"])
+    df["sport"] = "nfl"
+    df["season"] = df["season"].astype(int)
+    df["week"] = df["week"].astype(int)
+    _write_partitions(df, out, ["sport", "season", "week"], [NFL_PLAYER_COL])
+    print(f"[partition] NFL rows={len(df):,} seasons={sorted(df['season'].unique().tolist())}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write game logs into the partitioned store.")
+    parser.add_argument("--out", required=True, help="Dataset root (GAMELOG_DATASET_ROOT)")
+    parser.add_argument("--nba", action="append", default=[], help="NBA game log parquet (repeatable)")
+    parser.add_argument("--nfl", action="append", default=[], help="NFL weekly stats parquet (repeatable)")
+    args = parser.parse_args()
+
+    for source in args.nba:
+        partition_nba(source, args.out)
+    for source in args.nfl:
+        partition_nfl(source, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tools/precompute_images.py
+"""
+Builds the image thumbnails the pages serve (images.py) ahead of traffic.
+
+Team logos are always built (warm-up does the same in every worker). With
+--pitchers, every pitcher photo of the current MLB data is fetched from
+MLB_IMAGE_BASE once into IMAGE_CACHE_DIR and thumbnailed too; otherwise
+each photo is built the first time its pitcher is selected.
+
+Prints the bytes a browser downloads per image before (the original file)
+and after (the WebP thumbnail).
+
+Usage (from src/):
+    python -m tools.precompute_images
+    python -m tools.precompute_images --pitchers --workers 8
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _sizes(kind: str, sources: list[str]) -> tuple[list[tuple[str, int, int]], list[str]]:
+    """(source, original bytes, thumbnail bytes) for each built image, and the sources that failed."""
+    import images
+
+    built, failed = [], []
+    for source in sources:
+        try:
+            name = images.thumbnail(kind, source)
+        except Exception:
+            failed.append(source)
+            continue
+        original = len(images._source_bytes(source))
+        built.append((source, original, (images.IMAGE_CACHE_DIR / kind / name).stat().st_size))
+    return built, failed
+
+
+def _report(kind: str, built: list, failed: list, seconds: float):
+    before = sum(b for _, b, _ in built)
+    after = sum(a for _, _, a in built)
+    ratio = f"{after / before:.0%}" if before else "n/a"
+    print(
+        f"[images] {kind}: {len(built):,} built, {len(failed):,} failed in {seconds:.1f}s; "
+        f"{before / 1024:,.0f} KB -> {after / 1024:,.0f} KB ({ratio})",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute pitcher photo and team logo thumbnails.")
+    parser.add_argument("--pitchers", action="store_true", help="Also fetch and thumbnail every pitcher photo")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent pitcher photo fetches")
+    args = parser.parse_args()
+
+    import app  # noqa: F401  (registers pages; logo fallbacks are Dash asset URLs)
+    import images
+
+    t0 = time.perf_counter()
+    logos = [str(images.logo_file(team)) for team in images.precompute_logos()]
+    built, failed = _sizes("logo", logos)
+    _report("logos", built, failed, time.perf_counter() - t0)
+    summary = {"logos": len(built), "logos_failed": len(failed)}
+
+    if args.pitchers:
+        from pages import mlb_matchup
+
+        t0 = time.perf_counter()
+        photos = sorted({b["picture"] for b in mlb_matchup.pitcher_bundles().values() if b["picture"]})
+        with ThreadPoolExecutor(args.workers) as pool:
+            list(pool.map(lambda src: images.image_src("pitcher", src), photos))
+        built, failed = _sizes("pitcher", photos)
+        _report("pitchers", built, failed, time.perf_counter() - t0)
+        summary.update(pitchers=len(built), pitchers_failed=len(failed))
+
+    print(json.dumps(summary), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# tools/repack_parquet.py
+"""
+Rewrites a game log parquet file for single-player lookups:
+
+  - normalized column names (what data_store expects after loading)
+  - rows sorted by player, then date, so each player lives in one or two
+    row groups and the per-group min/max statistics are tight
+  - small row groups (--row-group-size) so a lookup reads little data
+  - dictionary-encoded string columns, statistics on every column,
+    and the sort order recorded in the file metadata
+
+data_store.read_parquet_player_rows uses those statistics to skip every
+row group that cannot contain the requested player.
+
+Usage (from src/):
+    python -m tools.repack_parquet nba ../data/NBA_Player_Stats.parquet
+    python -m tools.repack_parquet nfl ../data/Player_Stats_Weekly.parquet --out /tmp/nfl.parquet
+"""
+import argparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_store import (
+    _normalize_cols,
+    _read_parquet_anywhere,
+    NBA_DATE_COL,
+    NBA_PLAYER_COL,
+    NFL_DATE_COL,
+    NFL_PLAYER_COL,
+)
+
+# sport -> sort keys (player first)
+SORT_KEYS = {
+    "nba": [NBA_PLAYER_COL, NBA_DATE_COL],
+    "nfl": [NFL_PLAYER_COL, "season", NFL_DATE_COL],
+}
+
+# ~1k rows per group keeps a player lookup to one or two groups
+# (NBA players have ~80 rows per season, NFL players ~17).
+DEFAULT_ROW_GROUP_SIZE = 1024
+
+
+def repack(sport: str, source: str, out: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> pq.FileMetaData:
+    df = _normalize_cols(_read_parquet_anywhere(source))
+
+    sort_cols = [c for c in SORT_KEYS[sport] if c in df.columns]
+    df = df.sort_values(sort_cols, kind="stable").reset_index(drop=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    string_cols = [
+        f.name for f in table.schema
+        if pa.types.is_string(f.type) or pa.types.is_large_string(f.type)
+    ]
+    sorting = [pq.SortingColumn(table.schema.get_field_index(c)) for c in sort_cols]
+
+    pq.write_table(
+        table,
+        out,
+        row_group_size=row_group_size,
+        use_dictionary=string_cols,
+        write_statistics=True,
+        sorting_columns=sorting,
+        compression="zstd",
+    )
+
+    meta = pq.ParquetFile(out).metadata
+    print(
+        f"[repack] {sport.upper()} rows={meta.num_rows:,} row_groups={meta.num_row_groups} "
+        f"sorted_by={sort_cols} dict_cols={len(string_cols)} -> {out}",
+        flush=True,
+    )
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repack a game log parquet file for player lookups.")
+    parser.add_argument("sport", choices=sorted(SORT_KEYS))
+    parser.add_argument("source", help="Input parquet path or URL")
+    parser.add_argument("--out", help="Output path (defaults to rewriting the input in place)")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    repack(args.sport, args.source, args.out or args.source, args.row_group_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,785 @@
+# tools/synth_data.py
+"""
+Synthetic game logs and props at any scale, learned from the bundled files:
+
+  NBA_Player_Stats.parquet     N seasons x M players, 82-game schedules
+  Player_Stats_Weekly.parquet  N seasons of NFL weeks (byes + postseason)
+  Basketball_Props.xlsx        one props slate for the last synthetic NBA date
+
+What is learned from the source files:
+  - schema (column order and dtypes) of every file
+  - per-player stat lines: every synthetic player is tied to one real
+    "template" player and each game samples one of the template's real rows,
+    so FG%/FP/PRA/DblDbl etc. stay internally consistent
+  - name pools, team codes, roster sizes, availability (rows per team game /
+    roster size), Played=0 rate, home win rate, NBA rest-day gaps (which drive
+    back_to_back / third_in_four), NFL teams per week and season_type
+  - props market / bookmaker mix, rows per player, line offsets from the
+    player's average and (Over, Under) price pairs per market
+
+Schedules, rosters (with trades and retirements) and all date/matchup
+columns are generated, and back_to_back / third_in_four are recomputed from
+the synthetic dates with the same definitions as the source. Everything is
+built with NumPy over whole seasons; 100 seasons take a few seconds.
+
+Usage (from src/):
+    python -m tools.synth_data --out /tmp/synth --seasons 100
+    python -m tools.synth_data --out /tmp/synth --seasons 10 --nba-players 900 --partitioned
+"""
+import argparse
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data"
+
+SOURCE_FILES = {
+    "nba": DATA_DIR / "NBA_Player_Stats.parquet",
+    "nfl": DATA_DIR / "Player_Stats_Weekly.parquet",
+    "props": DATA_DIR / "Basketball_Props.xlsx",
+}
+
+# Per season: share of players traded to another team / replaced by a new player
+TEAM_CHANGE_RATE = 0.2
+RETIRE_RATE = 0.1
+
+NBA_GAMES_PER_SEASON = 82
+NBA_MAX_REST_DAYS = 10  # longer source gaps are data holes, not rest
+
+NBA_TEAM_NAMES = {
+    "ATL": "Atlanta Hawks", "BKN": "Brooklyn Nets", "BOS": "Boston Celtics",
+    "CHA": "Charlotte Hornets", "CHI": "Chicago Bulls", "CLE": "Cleveland Cavaliers",
+    "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets", "DET": "Detroit Pistons",
+    "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
+    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies",
+    "MIA": "Miami Heat", "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves",
+    "NOP": "New Orleans Pelicans", "NYK": "New York Knicks", "OKC": "Oklahoma City Thunder",
+    "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHX": "Phoenix Suns",
+    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs",
+    "TOR": "Toronto Raptors", "UTA": "Utah Jazz", "WAS": "Washington Wizards",
+}
+
+# Columns the generator owns; everything else is sampled from template rows
+NBA_CONTEXT_COLS = {
+    "PLAYER", "TEAM", "MATCH UP", "GAME DATE", "W/L", "Played", "Date", "GameID",
+    "Location", "Opponent", "Season", "back_to_back", "third_in_four",
+}
+NFL_CONTEXT_COLS = {
+    "player_id", "player_name", "player_display_name", "position", "position_group",
+    "headshot_url", "season", "week", "season_type", "game_id", "team", "opponent_team",
+}
+NFL_TEMPLATE_COLS = ["position", "position_group", "headshot_url"]
+
+# Props market -> NBA stat column the line is set against
+PROPS_MARKET_STATS = {
+    "player_points": "PTS",
+    "player_rebounds": "REB",
+    "player_assists": "AST",
+    "player_threes": "3PM",
+    "player_steals": "STL",
+    "player_blocks": "BLK",
+    "player_turnovers": "TOV",
+    "player_blocks_steals": "BLK_STL",
+    "player_points_rebounds_assists": "PRA",
+    "player_points_rebounds": "PTS_REB",
+    "player_points_assists": "PTS_AST",
+    "player_rebounds_assists": "REB_AST",
+}
+
+
+# -------------------------------------------------
+# Shared helpers
+# -------------------------------------------------
+def _group_index(keys: np.ndarray):
+    """Sort order plus (offsets, counts) per group code for keys = codes 0..k-1."""
+    order = np.argsort(keys, kind="stable")
+    counts = np.bincount(keys)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return order, offsets, counts
+
+
+def _sample_in_groups(rng, groups: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """One uniformly drawn position inside each requested group."""
+    return offsets[groups] + (rng.random(len(groups)) * counts[groups]).astype(np.int64)
+
+
+def _split_names(names) -> tuple[np.ndarray, np.ndarray]:
+    parts = pd.Series(pd.unique(pd.Series(names).dropna().astype(str))).str.split(" ", n=1)
+    parts = parts[parts.str.len() == 2]
+    first = pd.unique(parts.str[0])
+    last = pd.unique(parts.str[1])
+    return np.asarray(first, dtype=object), np.asarray(last, dtype=object)
+
+
+def _unique_names(rng, first: np.ndarray, last: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """n distinct (first, last) pairs; numbered suffixes once the pool runs out."""
+    pool = len(first) * len(last)
+    picks = rng.choice(pool, size=min(n, pool), replace=False)
+    if n > pool:
+        picks = np.concatenate([picks, rng.integers(0, pool, n - pool)])
+    f = first[picks // len(last)]
+    la = last[picks % len(last)]
+    if n > pool:
+        suffix = np.concatenate([np.full(pool, ""), (" " + pd.Series(np.arange(pool, n)).astype(str)).to_numpy()])
+        la = (pd.Series(la) + suffix).to_numpy(dtype=object)
+    return f, la
+
+
+def _categorical(values: np.ndarray, codes: np.ndarray) -> pd.Categorical:
+    """Categorical of values[codes] without materializing the strings per row."""
+    uniq_codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return pd.Categorical.from_codes(uniq_codes[codes], categories=pd.Index(uniques))
+
+
+def _roll_rosters(rng, n_seasons: int, n_slots: int, n_teams: int, slot_groups: np.ndarray | None = None):
+    """
+    Roster slots over seasons. Returns (player_of_slot[season, slot],
+    team_of_slot[season, slot], n_players). Each season TEAM_CHANGE_RATE of
+    the slots swap teams among themselves (roster sizes stay fixed) and
+    RETIRE_RATE of the slots get a brand-new player.
+    """
+    if slot_groups is None:
+        team = rng.permutation(np.arange(n_slots) % n_teams)
+    else:
+        # deal slots round-robin in group order so every team gets a similar mix
+        order = np.lexsort((rng.random(n_slots), slot_groups))
+        team = np.empty(n_slots, dtype=np.int64)
+        team[order] = (np.arange(n_slots) + rng.integers(n_teams)) % n_teams
+
+    players = np.empty((n_seasons, n_slots), dtype=np.int64)
+    teams = np.empty((n_seasons, n_slots), dtype=np.int64)
+    current = np.arange(n_slots)
+    next_id = n_slots
+    for s in range(n_seasons):
+        if s > 0:
+            movers = np.flatnonzero(rng.random(n_slots) < TEAM_CHANGE_RATE)
+            team[movers] = team[rng.permutation(movers)]
+            retired = np.flatnonzero(rng.random(n_slots) < RETIRE_RATE)
+            current[retired] = np.arange(next_id, next_id + len(retired))
+            next_id += len(retired)
+        players[s] = current
+        teams[s] = team
+    return players, teams, next_id
+
+
+def _expand_rosters(tg_team: np.ndarray, tg_season: np.ndarray, teams: np.ndarray, players: np.ndarray):
+    """
+    One row per (team game, rostered player). Returns (team_game_index,
+    player_id) arrays. `teams`/`players` are the [season, slot] roster tables.
+    """
+    n_seasons, n_slots = teams.shape
+    n_teams = int(teams.max()) + 1
+    # slots sorted by (season, team) -> contiguous roster blocks
+    key = (np.arange(n_seasons)[:, None] * n_teams + teams).ravel()
+    order, offsets, counts = _group_index(key)
+    roster_players = players.ravel()[order]
+
+    block = tg_season * n_teams + tg_team
+    size = counts[block]
+    tg_rows = np.repeat(np.arange(len(tg_team)), size)
+    starts = np.repeat(offsets[block], size)
+    within = np.arange(len(tg_rows)) - np.repeat(np.cumsum(size) - size, size)
+    return tg_rows, roster_players[starts + within]
+
+
+def _week_day_strings(dates: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(dates.astype("datetime64[D]"), unit="D").astype(object)
+
+
+# -------------------------------------------------
+# NBA
+# -------------------------------------------------
+def learn_nba_profile(df: pd.DataFrame) -> SimpleNamespace:
+    df = df.reset_index(drop=True)
+    codes, _ = pd.factorize(df["PLAYER"])
+    order, offsets, counts = _group_index(codes)
+    stat_cols = [c for c in df.columns if c not in NBA_CONTEXT_COLS]
+    first, last = _split_names(df["PLAYER"])
+
+    team_game = df.drop_duplicates(["Season", "TEAM", "GAME DATE"]).sort_values(["Season", "TEAM", "GAME DATE"])
+    gaps = team_game.groupby(["Season", "TEAM"])["GAME DATE"].diff().dt.days.dropna()
+    gaps = gaps[(gaps >= 1) & (gaps <= NBA_MAX_REST_DAYS)].astype(int)
+    home = team_game[team_game["Location"] == "Home"]
+
+    per_team = df.groupby(["Season", "TEAM"]).agg(
+        rows=("PLAYER", "size"), games=("GAME DATE", "nunique"), players=("PLAYER", "nunique")
+    )
+    latest = int(df["Season"].max())
+    start = df.loc[df["Season"] == latest, "GAME DATE"].min()
+
+    return SimpleNamespace(
+        columns=list(df.columns),
+        dtypes=df.dtypes.to_dict(),
+        stat_cols=stat_cols,
+        stats={c: df[c].to_numpy()[order] for c in stat_cols},
+        offsets=offsets,
+        counts=counts,
+        first_names=first,
+        last_names=last,
+        teams=np.asarray(sorted(df["TEAM"].dropna().unique()), dtype=object),
+        roster_size=int(round(per_team["players"].mean())),
+        availability=float((per_team["rows"] / (per_team["games"] * per_team["players"])).mean()),
+        dnp_rate=float((df["Played"] == 0).mean()) if "Played" in df.columns else 0.0,
+        home_win_rate=float((home["W/L"] == "W").mean()) if len(home) else 0.55,
+        rest_days=gaps.value_counts(normalize=True).sort_index(),
+        latest_season=latest,
+        season_start=pd.Timestamp(start),
+    )
+
+
+def _nba_schedule(rng, profile, seasons: np.ndarray) -> pd.DataFrame:
+    """
+    Team-game table for all seasons. Every round all teams play (random
+    pairings); rounds are spaced by the learned rest-day distribution, so
+    back_to_back / third_in_four rates follow the source.
+    """
+    n_teams = len(profile.teams)
+    n_games = n_teams // 2
+    n_seasons, rounds = len(seasons), NBA_GAMES_PER_SEASON
+
+    gaps = rng.choice(profile.rest_days.index.to_numpy(), p=profile.rest_days.to_numpy(), size=(n_seasons, rounds))
+    gaps[:, 0] = 0
+    day = np.cumsum(gaps, axis=1)  # days from season start
+    start = np.array(
+        [profile.season_start - pd.DateOffset(years=int(profile.latest_season - s)) for s in seasons],
+        dtype="datetime64[D]",
+    )
+    round_date = start[:, None] + day.astype("timedelta64[D]")
+
+    pairs = np.argsort(rng.random((n_seasons, rounds, n_teams)), axis=2)[..., : n_games * 2]
+    pairs = pairs.reshape(n_seasons, rounds, n_games, 2)
+    home_wins = rng.random((n_seasons, rounds, n_games)) < profile.home_win_rate
+
+    shape = (n_seasons, rounds, n_games)
+    season_idx = np.broadcast_to(np.arange(n_seasons)[:, None, None], shape).ravel()
+    round_idx = np.broadcast_to(np.arange(rounds)[None, :, None], shape).ravel()
+    home_team, away_team = pairs[..., 0].ravel(), pairs[..., 1].ravel()
+    hw = home_wins.ravel()
+
+    tg = pd.DataFrame({
+        "season_idx": np.concatenate([season_idx, season_idx]),
+        "team": np.concatenate([home_team, away_team]),
+        "opp": np.concatenate([away_team, home_team]),
+        "home": np.concatenate([np.ones_like(hw), np.zeros_like(hw)]),
+        "win": np.concatenate([hw, ~hw]),
+        "date": np.concatenate([round_date.ravel()[season_idx * rounds + round_idx]] * 2),
+    })
+    tg = tg.sort_values(["season_idx", "team", "date"], kind="stable").reset_index(drop=True)
+
+    d = tg["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    same1 = np.r_[False, (tg["season_idx"].to_numpy()[1:] == tg["season_idx"].to_numpy()[:-1])
+                  & (tg["team"].to_numpy()[1:] == tg["team"].to_numpy()[:-1])]
+    same2 = np.r_[False, False, (tg["season_idx"].to_numpy()[2:] == tg["season_idx"].to_numpy()[:-2])
+                  & (tg["team"].to_numpy()[2:] == tg["team"].to_numpy()[:-2])]
+    diff1 = np.r_[0, d[1:] - d[:-1]]
+    diff2 = np.r_[0, 0, d[2:] - d[:-2]]
+    tg["back_to_back"] = (same1 & (diff1 == 1)).astype(np.int64)
+    tg["third_in_four"] = (same2 & (diff2 <= 3)).astype(np.int64)
+    return tg
+
+
+def iter_nba(
+    profile: SimpleNamespace,
+    n_seasons: int,
+    n_players: int | None = None,
+    seed: int = 0,
+    dnp_rate: float | None = None,
+    chunk_seasons: int = 10,
+):
+    """
+    Yields NBA game log frames with the source schema, `chunk_seasons`
+    seasons at a time (oldest first). String columns are categoricals.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(profile.teams)
+    n_slots = n_players or profile.roster_size * n_teams
+    seasons = np.arange(profile.latest_season - n_seasons + 1, profile.latest_season + 1)
+    dnp = profile.dnp_rate if dnp_rate is None else dnp_rate
+
+    tg = _nba_schedule(rng, profile, seasons)
+    players, teams, n_ids = _roll_rosters(rng, n_seasons, n_slots, n_teams)
+    template = rng.integers(0, len(profile.counts), n_ids)
+    first, last = _unique_names(rng, profile.first_names, profile.last_names, n_ids)
+    names = (pd.Series(first) + " " + pd.Series(last)).to_numpy(dtype=object)
+
+    for lo in range(0, n_seasons, chunk_seasons):
+        part = tg[(tg["season_idx"] >= lo) & (tg["season_idx"] < lo + chunk_seasons)]
+        tg_rows, player = _expand_rosters(part["team"].to_numpy(), part["season_idx"].to_numpy(), teams, players)
+        keep = rng.random(len(tg_rows)) < profile.availability
+        tg_rows, player = tg_rows[keep], player[keep]
+        n = len(tg_rows)
+        src = _sample_in_groups(rng, template[player], profile.offsets, profile.counts)
+
+        # team-game level strings, mapped to rows through categorical codes
+        team_code = profile.teams[part["team"].to_numpy()]
+        opp_code = profile.teams[part["opp"].to_numpy()]
+        home = part["home"].to_numpy().astype(bool)
+        day_str = _week_day_strings(part["date"].to_numpy())
+        matchup = np.where(home, team_code + " vs. " + opp_code, team_code + " @ " + opp_code)
+        game_id = team_code + "_" + day_str
+        dates = part["date"].to_numpy().astype("datetime64[ns]")[tg_rows]
+
+        cols = {}
+        for c in profile.columns:
+            if c == "PLAYER":
+                cols[c] = pd.Categorical.from_codes(player, categories=pd.Index(names))
+            elif c == "TEAM":
+                cols[c] = _categorical(team_code, tg_rows)
+            elif c == "Opponent":
+                cols[c] = _categorical(opp_code, tg_rows)
+            elif c == "MATCH UP":
+                cols[c] = _categorical(matchup, tg_rows)
+            elif c == "GameID":
+                cols[c] = _categorical(game_id, tg_rows)
+            elif c in ("GAME DATE", "Date"):
+                cols[c] = dates
+            elif c == "W/L":
+                cols[c] = _categorical(np.where(part["win"].to_numpy(), "W", "L").astype(object), tg_rows)
+            elif c == "Location":
+                cols[c] = _categorical(np.where(home, "Home", "Away").astype(object), tg_rows)
+            elif c == "Season":
+                cols[c] = seasons[part["season_idx"].to_numpy()[tg_rows]]
+            elif c in ("back_to_back", "third_in_four"):
+                cols[c] = part[c].to_numpy()[tg_rows]
+            elif c == "Played":
+                cols[c] = np.ones(n, dtype=np.int64)
+            else:
+                cols[c] = profile.stats[c][src]
+        df = pd.DataFrame(cols)
+
+        if dnp > 0:
+            _blank_dnp_rows(df, rng.random(n) < dnp, profile.stat_cols)
+        yield df
+
+
+def generate_nba(*args, **kwargs) -> pd.DataFrame:
+    """All seasons of iter_nba() in one frame."""
+    return pd.concat(list(iter_nba(*args, **kwargs)), ignore_index=True)
+
+
+def _blank_dnp_rows(df: pd.DataFrame, mask: np.ndarray, stat_cols: list[str]):
+    """Played=0 rows: zero counting stats, NaN percentages."""
+    if "Played" in df.columns:
+        df.loc[mask, "Played"] = 0
+    for c in stat_cols:
+        if not pd.api.types.is_numeric_dtype(df[c]):
+            continue
+        df.loc[mask, c] = np.nan if c.endswith("%") else 0
+
+
+# -------------------------------------------------
+# NFL
+# -------------------------------------------------
+def learn_nfl_profile(df: pd.DataFrame) -> SimpleNamespace:
+    df = df.reset_index(drop=True)
+    codes, _ = pd.factorize(df["player_id"].fillna(df["player_display_name"]).fillna(""))
+    order, offsets, counts = _group_index(codes)
+    stat_cols = [c for c in df.columns if c not in NFL_CONTEXT_COLS]
+    first, last = _split_names(df["player_display_name"])
+
+    first_rows = df.iloc[order[offsets]]
+    positions, pos_codes = np.unique(first_rows["position"].fillna("").astype(str), return_inverse=True)
+
+    weeks = df.groupby(["season", "week"]).agg(teams=("team", "nunique"), season_type=("season_type", "first"))
+    week_teams = weeks.groupby("week")["teams"].mean().round().astype(int)
+    week_types = weeks.groupby("week")["season_type"].first()
+    per_team = df.groupby(["season", "team"]).agg(
+        rows=("player_id", "size"), weeks=("week", "nunique"), players=("player_id", "nunique")
+    )
+
+    return SimpleNamespace(
+        columns=list(df.columns),
+        stat_cols=stat_cols,
+        stats={c: df[c].to_numpy()[order] for c in stat_cols},
+        template_cols={c: first_rows[c].to_numpy() for c in NFL_TEMPLATE_COLS if c in df.columns},
+        offsets=offsets,
+        counts=counts,
+        positions=positions,
+        template_position=pos_codes,
+        first_names=first,
+        last_names=last,
+        teams=np.asarray(sorted(df["team"].dropna().unique()), dtype=object),
+        roster_size=int(round(per_team["players"].mean())),
+        availability=float((per_team["rows"] / (per_team["weeks"] * per_team["players"])).mean()),
+        week_teams=week_teams,
+        week_types=week_types,
+        latest_season=int(df["season"].max()),
+    )
+
+
+def _nfl_schedule(rng, profile, seasons: np.ndarray) -> pd.DataFrame:
+    """
+    Team-week table. Regular-season weeks seat the learned number of teams
+    (the rest are on bye, each team once per cycle); postseason weeks keep a
+    shrinking subset of the previous week's teams.
+    """
+    n_teams = len(profile.teams)
+    weeks = [(w, min(n - n % 2, n_teams), profile.week_types.get(w, "REG")) for w, n in profile.week_teams.items()]
+    cols = {k: [] for k in ("season_idx", "week", "home_team", "away_team")}
+    for si in range(len(seasons)):
+        bye_queue = list(rng.permutation(n_teams))
+        alive = np.arange(n_teams)
+        for week, n_active, season_type in weeks:
+            if season_type == "REG":
+                n_bye = n_teams - n_active
+                if len(bye_queue) < n_bye:
+                    bye_queue += list(rng.permutation(n_teams))
+                on_bye = np.zeros(n_teams, dtype=bool)
+                on_bye[bye_queue[:n_bye]] = True
+                bye_queue = bye_queue[n_bye:]
+                active = np.flatnonzero(~on_bye)
+            else:
+                alive = rng.permutation(alive)[:n_active]
+                active = alive
+            active = rng.permutation(active)
+            k = len(active) // 2
+            cols["season_idx"].append(np.full(k, si))
+            cols["week"].append(np.full(k, week))
+            cols["home_team"].append(active[0::2][:k])
+            cols["away_team"].append(active[1::2][:k])
+
+    games = {k: np.concatenate(v) for k, v in cols.items()}
+    types = dict((w, t) for w, _, t in weeks)
+    tw = pd.DataFrame({
+        "season_idx": np.tile(games["season_idx"], 2),
+        "week": np.tile(games["week"], 2),
+        "team": np.concatenate([games["home_team"], games["away_team"]]),
+        "opp": np.concatenate([games["away_team"], games["home_team"]]),
+        "home_team": np.tile(games["home_team"], 2),
+        "away_team": np.tile(games["away_team"], 2),
+    })
+    tw["season"] = seasons[tw["season_idx"].to_numpy()]
+    tw["season_type"] = tw["week"].map(types)
+    return tw.sort_values(["season_idx", "week"], kind="stable").reset_index(drop=True)
+
+
+def iter_nfl(
+    profile: SimpleNamespace,
+    n_seasons: int,
+    n_players: int | None = None,
+    seed: int = 0,
+    chunk_seasons: int = 10,
+):
+    """
+    Yields NFL weekly frames with the source schema, `chunk_seasons` seasons
+    at a time (oldest first). String columns are categoricals.
+    """
+    rng = np.random.default_rng(seed + 1)
+    n_teams = len(profile.teams)
+    n_slots = n_players or profile.roster_size * n_teams
+    seasons = np.arange(profile.latest_season - n_seasons + 1, profile.latest_season + 1)
+
+    tw = _nfl_schedule(rng, profile, seasons)
+
+    # templates are drawn per slot position so replacements keep the roster mix
+    slot_template = rng.integers(0, len(profile.counts), n_slots)
+    slot_pos = profile.template_position[slot_template]
+    players, teams, n_ids = _roll_rosters(rng, n_seasons, n_slots, n_teams, slot_groups=slot_pos)
+    pos_order, pos_offsets, pos_counts = _group_index(profile.template_position)
+    template = np.empty(n_ids, dtype=np.int64)
+    template[:n_slots] = slot_template
+    for s in range(1, n_seasons):
+        slots = np.flatnonzero(players[s] != players[s - 1])
+        template[players[s][slots]] = pos_order[_sample_in_groups(rng, slot_pos[slots], pos_offsets, pos_counts)]
+
+    first, last = _unique_names(rng, profile.first_names, profile.last_names, n_ids)
+    display = (pd.Series(first) + " " + pd.Series(last)).to_numpy(dtype=object)
+    short = (pd.Series(first).str[0] + "." + pd.Series(last)).to_numpy(dtype=object)
+    ids = ("00-" + pd.Series(np.arange(n_ids) + 9_000_000).astype(str).str.zfill(7)).to_numpy(dtype=object)
+
+    for lo in range(0, n_seasons, chunk_seasons):
+        part = tw[(tw["season_idx"] >= lo) & (tw["season_idx"] < lo + chunk_seasons)]
+        tw_rows, player = _expand_rosters(part["team"].to_numpy(), part["season_idx"].to_numpy(), teams, players)
+        keep = rng.random(len(tw_rows)) < profile.availability
+        tw_rows, player = tw_rows[keep], player[keep]
+        src = _sample_in_groups(rng, template[player], profile.offsets, profile.counts)
+
+        team_code = profile.teams[part["team"].to_numpy()]
+        game_id = (
+            part["season"].astype(str) + "_" + part["week"].astype(str).str.zfill(2) + "_"
+            + profile.teams[part["away_team"].to_numpy()] + "_" + profile.teams[part["home_team"].to_numpy()]
+        ).to_numpy(dtype=object)
+
+        cols = {}
+        for c in profile.columns:
+            if c == "player_id":
+                cols[c] = pd.Categorical.from_codes(player, categories=pd.Index(ids))
+            elif c == "player_name":
+                cols[c] = _categorical(short, player)
+            elif c == "player_display_name":
+                cols[c] = pd.Categorical.from_codes(player, categories=pd.Index(display))
+            elif c in profile.template_cols:
+                cols[c] = _categorical(profile.template_cols[c].astype(object), template[player])
+            elif c in ("season", "week"):
+                cols[c] = part[c].to_numpy()[tw_rows]
+            elif c == "season_type":
+                cols[c] = _categorical(part["season_type"].to_numpy(dtype=object), tw_rows)
+            elif c == "game_id":
+                cols[c] = _categorical(game_id, tw_rows)
+            elif c == "team":
+                cols[c] = _categorical(team_code, tw_rows)
+            elif c == "opponent_team":
+                cols[c] = _categorical(profile.teams[part["opp"].to_numpy()], tw_rows)
+            else:
+                cols[c] = profile.stats[c][src]
+        yield pd.DataFrame(cols)
+
+
+def generate_nfl(*args, **kwargs) -> pd.DataFrame:
+    """All seasons of iter_nfl() in one frame."""
+    return pd.concat(list(iter_nfl(*args, **kwargs)), ignore_index=True)
+
+
+# -------------------------------------------------
+# NBA props
+# -------------------------------------------------
+def _stat_means(nba: pd.DataFrame, season: int) -> pd.DataFrame:
+    cols = sorted(set(PROPS_MARKET_STATS.values()) & set(nba.columns))
+    rows = nba[nba["Season"] == season]
+    if "Played" in rows.columns:
+        rows = rows[rows["Played"] == 1]
+    return rows.groupby(rows["PLAYER"].astype(str))[cols].mean()
+
+
+def _base_market(market: str) -> str:
+    return market[: -len("_alternate")] if market.endswith("_alternate") else market
+
+
+def learn_props_profile(props: pd.DataFrame, nba: pd.DataFrame) -> SimpleNamespace:
+    props = props.reset_index(drop=True)
+    markets = props["market"].value_counts(normalize=True)
+    books = props["bookmakers"].value_counts(normalize=True)
+    m_codes = pd.Categorical(props["market"], categories=markets.index).codes
+    order, offsets, counts = _group_index(m_codes)
+
+    # line offset from the player's season average, per market
+    means = _stat_means(nba, int(nba["Season"].max()))
+    stat = props["market"].map(lambda m: PROPS_MARKET_STATS.get(_base_market(m)))
+    avg = np.full(len(props), np.nan)
+    for col in stat.dropna().unique():
+        sel = (stat == col).to_numpy()
+        avg[sel] = props.loc[sel, "Player"].map(means[col]).to_numpy(dtype=float)
+    offset = props["Line"].to_numpy(dtype=float) - avg
+    line_pool = np.where(np.isnan(offset), props["Line"].to_numpy(dtype=float), offset)
+    relative = ~np.isnan(offset)
+    market_relative = pd.Series(relative).groupby(m_codes).mean().reindex(range(len(markets)), fill_value=0) > 0.5
+
+    tips = props["game_time"].drop_duplicates()
+    return SimpleNamespace(
+        columns=list(props.columns),
+        markets=markets,
+        books=books,
+        offsets=offsets,
+        counts=counts,
+        line_pool=line_pool[order],
+        pool_relative=relative[order],
+        market_relative=market_relative.to_numpy(),
+        over=props["Over Price"].to_numpy()[order],
+        under=props["Under Price"].to_numpy()[order],
+        rows_per_player=props.groupby("Player").size().to_numpy(),
+        games=int(props["home_team"].nunique()),
+        players_per_team=max(1, int(round(props["Player"].nunique() / (2 * max(1, props["home_team"].nunique()))))),
+        tip_minutes=(tips.dt.hour * 60 + tips.dt.minute).to_numpy(),
+    )
+
+
+def generate_props(profile: SimpleNamespace, nba: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """One props slate for the last game date of the synthetic NBA frame."""
+    rng = np.random.default_rng(seed + 2)
+    latest = int(nba["Season"].max())
+    slate_date = nba.loc[nba["Season"] == latest, "GAME DATE"].max()
+    slate = nba[(nba["GAME DATE"] == slate_date) & (nba["Location"] == "Home")]
+    games = slate[["TEAM", "Opponent"]].drop_duplicates().astype(str)
+    games = games.iloc[rng.permutation(len(games))[: profile.games]]
+    tips = rng.choice(profile.tip_minutes, len(games))
+
+    game_of_team = {}
+    for gi, (home, away) in enumerate(games.itertuples(index=False)):
+        game_of_team[home] = game_of_team[away] = gi
+    on_slate = nba[(nba["Season"] == latest) & nba["TEAM"].astype(str).isin(game_of_team)]
+    # the books only list each team's regulars: keep the top players by minutes
+    per_player = on_slate.groupby(on_slate["PLAYER"].astype(str)).agg(
+        team=("TEAM", "last"), minutes=("MIN", "mean")
+    )
+    per_player["team"] = per_player["team"].astype(str)
+    per_player = per_player.sort_values("minutes", ascending=False).groupby("team").head(profile.players_per_team)
+    player_team = per_player["team"].sort_index()
+    means = _stat_means(nba, latest).reindex(player_team.index)
+
+    n_rows = rng.choice(profile.rows_per_player, len(player_team))
+    player_idx = np.repeat(np.arange(len(player_team)), n_rows)
+    n = len(player_idx)
+    market = rng.choice(len(profile.markets), n, p=profile.markets.to_numpy())
+    src = _sample_in_groups(rng, market, profile.offsets, profile.counts)
+    relative = profile.market_relative[market]
+
+    base = np.zeros(n)
+    market_names = profile.markets.index.to_numpy()
+    for mi, name in enumerate(market_names):
+        col = PROPS_MARKET_STATS.get(_base_market(name))
+        sel = (market == mi) & relative
+        if col is not None and col in means.columns and sel.any():
+            base[sel] = means[col].to_numpy(dtype=float)[player_idx[sel]]
+    # markets learned as absolute lines (no average available) use the pool directly
+    line = np.where(relative & profile.pool_relative[src], base + profile.line_pool[src], profile.line_pool[src])
+    line = np.maximum(0.5, np.floor(np.nan_to_num(line, nan=0.0)) + 0.5)
+
+    game = np.array([game_of_team[t] for t in player_team.to_numpy()])[player_idx]
+    home_code = games["TEAM"].to_numpy()[game]
+    away_code = games["Opponent"].to_numpy()[game]
+    game_time = pd.Timestamp(slate_date).normalize() + pd.to_timedelta(tips[game], unit="m")
+
+    cols = {
+        "Player": player_team.index.to_numpy()[player_idx],
+        "Over Price": profile.over[src],
+        "Line": line,
+        "market": market_names[market],
+        "bookmakers": profile.books.index.to_numpy()[rng.choice(len(profile.books), n, p=profile.books.to_numpy())],
+        "home_team": pd.Series(home_code).map(NBA_TEAM_NAMES).fillna(pd.Series(home_code)).to_numpy(),
+        "away_team": pd.Series(away_code).map(NBA_TEAM_NAMES).fillna(pd.Series(away_code)).to_numpy(),
+        "Under Price": profile.under[src],
+        "game_time": np.asarray(game_time, dtype="datetime64[ns]"),
+    }
+    return pd.DataFrame({c: cols[c] for c in profile.columns if c in cols})
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+def _plain_strings(df: pd.DataFrame) -> pa.Table:
+    """Arrow table with categoricals cast back to plain strings (the source dtypes)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    arrays = []
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_dictionary(field.type):
+            column = column.cast(field.type.value_type)
+            field = pa.field(field.name, field.type.value_type)
+        fields.append(field)
+        arrays.append(column)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _write_chunks(chunks, path: Path, partition=None, partition_root: Path | None = None):
+    """
+    Streams generated chunks into one parquet file (and optionally the
+    partitioned store). Returns (rows written, last chunk).
+    """
+    writer = None
+    rows = 0
+    last = None
+    try:
+        for chunk in chunks:
+            table = _plain_strings(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            if partition is not None:
+                partition(table.to_pandas(), str(partition_root))
+            rows += len(chunk)
+            last = chunk
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, last
+
+
+def load_profiles(sources: dict | None = None) -> dict:
+    sources = {**SOURCE_FILES, **(sources or {})}
+    nba = pd.read_parquet(sources["nba"])
+    return {
+        "nba": learn_nba_profile(nba),
+        "nfl": learn_nfl_profile(pd.read_parquet(sources["nfl"])),
+        "props": learn_props_profile(pd.read_excel(sources["props"]), nba),
+    }
+
+
+def write_synthetic(
+    out_dir: Path,
+    n_seasons: int,
+    nba_players: int | None = None,
+    nfl_players: int | None = None,
+    seed: int = 0,
+    partitioned: bool = False,
+    props: bool = True,
+    profiles: dict | None = None,
+) -> dict:
+    """
+    Writes NBA_Player_Stats.parquet, Player_Stats_Weekly.parquet and (with
+    props=True) Basketball_Props.xlsx into out_dir. With partitioned=True the
+    game logs are also written to <out_dir>/game_logs for GAMELOG_DATASET_ROOT.
+    Returns {"nba", "nfl", "props"?, "game_logs"?: Path}.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    profiles = profiles or load_profiles()
+    files = {
+        "nba": out_dir / SOURCE_FILES["nba"].name,
+        "nfl": out_dir / SOURCE_FILES["nfl"].name,
+    }
+
+    partition_nba = partition_nfl = None
+    if partitioned:
+        from tools.partition_game_logs import partition_nba_frame as partition_nba
+        from tools.partition_game_logs import partition_nfl_frame as partition_nfl
+
+        files["game_logs"] = out_dir / "game_logs"
+
+    t0 = time.perf_counter()
+    nba_rows, nba_last = _write_chunks(
+        iter_nba(profiles["nba"], n_seasons, nba_players, seed),
+        files["nba"], partition_nba, files.get("game_logs"),
+    )
+    t1 = time.perf_counter()
+    nfl_rows, _ = _write_chunks(
+        iter_nfl(profiles["nfl"], n_seasons, nfl_players, seed),
+        files["nfl"], partition_nfl, files.get("game_logs"),
+    )
+    t2 = time.perf_counter()
+    print(
+        f"[synth] NBA rows={nba_rows:,} ({t1 - t0:.2f}s)  NFL rows={nfl_rows:,} ({t2 - t1:.2f}s)  "
+        f"seasons={n_seasons}",
+        flush=True,
+    )
+
+    if props:
+        # the slate only needs the latest season, which is in the last chunk
+        files["props"] = out_dir / SOURCE_FILES["props"].name
+        slate = generate_props(profiles["props"], nba_last, seed)
+        slate.to_excel(files["props"], index=False)
+        print(f"[synth] Props rows={len(slate):,}", flush=True)
+
+    print(f"[synth] Wrote {out_dir} in {time.perf_counter() - t0:.2f}s", flush=True)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic NBA/NFL game logs and NBA props.")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--nba-players", type=int, default=None, help="Rostered NBA players per season")
+    parser.add_argument("--nfl-players", type=int, default=None, help="Rostered NFL players per season")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--partitioned", action="store_true", help="Also write the Hive-partitioned store")
+    parser.add_argument("--no-props", action="store_true", help="Skip the props workbook")
+    args = parser.parse_args()
+
+    write_synthetic(
+        Path(args.out),
+        args.seasons,
+        nba_players=args.nba_players,
+        nfl_players=args.nfl_players,
+        seed=args.seed,
+        partitioned=args.partitioned,
+        props=not args.no_props,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# -----------------------------
+# Worker warm-up + readiness
+# -----------------------------
+# Loads every dataset, builds the per-season frames, backend schemas and team
+# logo thumbnails, and precomputes the most viewed cached-callback results of
+# the previous day (metrics.log_view) before a worker serves users.
+#
+# Under gunicorn, gunicorn.conf.py runs it in post_worker_init, i.e. in each
+# worker before it accepts connections. Elsewhere (python app.py) the first
+# GET /healthz?ready starts it in a thread. /healthz?ready answers 503 until
+# warm-up has finished, and keeps answering 503 (listing the failed steps,
+# and retrying them) while a required step has failed, so a rolling deploy
+# only routes to warm workers.
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+# Most viewed (callback, inputs) pairs from the previous day to precompute
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "50"))
+# Read this view log instead of yesterday's (e.g. a file copied from another host)
+WARMUP_VIEW_LOG = os.getenv("WARMUP_VIEW_LOG", "")
+# Steps whose failure still lets the worker report ready
+WARMUP_OPTIONAL_STEPS = {
+    s.strip() for s in os.getenv("WARMUP_OPTIONAL_STEPS", "images,top_views").split(",") if s.strip()
+}
+
+_state = {"status": "pending", "steps": {}, "started": None, "finished": None}
+_lock = threading.Lock()
+
+
+def _load_datasets(beat):
+    import data_store
+    import mlb_data
+    from pages import nfl_matchup
+
+    loaders = {
+        "nba": lambda: len(data_store.get_nba_df()),
+        "nfl": lambda: len(data_store.get_nfl_df()),
+        "nba_impact": lambda: len(data_store.get_nba_impact_df()),
+        "nba_props": lambda: len(data_store.get_nba_props_df()),
+        "nfl_matchup": lambda: len(nfl_matchup.current_data()[0]),
+        "mlb_pitchers": lambda: len(mlb_data.get_mlb_data().dfPitchers),
+    }
+    out = {}
+    for name, load in loaders.items():
+        out[name] = load()
+        beat()
+    return out
+
+
+def _build_indexes(beat):
+    import data_store
+    from mlb_data import mlb_derived
+    from pages import mlb_hot_hitters, mlb_matchup, mlb_props
+    from query_backend import get_backend
+
+    backend = get_backend()  # duckdb: views + column schemas
+    seasons = backend.nba_seasons()
+    latest = seasons[-1] if seasons else None
+    nfl_seasons = data_store.nfl_seasons()
+    # per-season frames the callbacks filter, and the option lists pages build
+    data_store.get_nba_df(latest)
+    data_store.get_nfl_df(nfl_seasons[-1] if nfl_seasons else None)
+    beat()
+    return {
+        "backend": backend.name,
+        "nba_players": len(backend.nba_players(latest)),
+        "impact_players": len(backend.impact_players()),
+        "impact_stats": len(backend.impact_stat_cols()),
+        "mlb_pitcher_bundles": len(mlb_matchup.pitcher_bundles()),
+        "mlb_props_views": len(mlb_derived("props_views", mlb_props.build_props_views)),
+        "mlb_hitting_windows": mlb_hot_hitters.hitting_windows() is not None,
+    }
+
+
+def _precompute_images(beat):
+    import images
+
+    logos = images.precompute_logos()
+    return {"logos": sum(src.startswith(images.IMAGE_ROUTE) for src in logos.values()), "teams": len(logos)}
+
+
+def previous_views_path() -> str:
+    from metrics import view_log_path
+
+    if WARMUP_VIEW_LOG:
+        return WARMUP_VIEW_LOG
+    return view_log_path(time.strftime("%Y-%m-%d", time.gmtime(time.time() - 86400)))
+
+
+def top_views(path: str, n: int) -> list[tuple[str, list, int]]:
+    """(function id, inputs, views) for the n most viewed entries in a view log."""
+    counts = Counter()
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    counts[(rec["fn"], json.dumps(rec["args"]))] += 1
+                except (ValueError, KeyError):
+                    continue
+    except FileNotFoundError:
+        return []
+    return [(fn, json.loads(args), views) for (fn, args), views in counts.most_common(n)]
+
+
+def _prune_view_logs():
+    from metrics import VIEW_LOG_DIR, VIEW_LOG_KEEP_DAYS
+
+    cutoff = time.time() - VIEW_LOG_KEEP_DAYS * 86400
+    try:
+        names = os.listdir(VIEW_LOG_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(VIEW_LOG_DIR, name)
+        try:
+            if name.startswith("views-") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _precompute_top_views(beat):
+    from caching import REPLAYABLE
+    from metrics import views_not_logged
+
+    _prune_view_logs()
+    path = previous_views_path()
+    done = failed = skipped = 0
+    with views_not_logged():
+        for fn_id, args, _views in top_views(path, WARMUP_TOP_N):
+            fn = REPLAYABLE.get(fn_id)
+            if fn is None:
+                skipped += 1
+                continue
+            try:
+                fn(*args)
+                done += 1
+            except Exception:  # inputs from yesterday may no longer apply
+                failed += 1
+            beat()
+    return {"log": os.path.basename(path), "computed": done, "failed": failed, "skipped": skipped}
+
+
+STEPS = [
+    ("datasets", _load_datasets),
+    ("indexes", _build_indexes),
+    ("images", _precompute_images),
+    ("top_views", _precompute_top_views),
+]
+
+
+def run_warmup(notify=None) -> dict:
+    """
+    Runs every warm-up step once per process; later callers get the current
+    status without running it again. A failing step is recorded and the rest
+    still run: the worker serves what it could load, as it would without
+    warm-up, but is only reported ready once every required step succeeded
+    (a later call retries). `notify` is gunicorn's worker heartbeat; steps
+    call it after each dataset / replayed view, not only between steps.
+    """
+    with _lock:
+        if _state["status"] in ("running", "ready"):
+            return status()
+        _state.update(status="running", started=time.time(), steps={})
+
+    beat = notify if notify is not None else (lambda: None)
+    if WARMUP_ENABLED:
+        for name, step in STEPS:
+            t0 = time.perf_counter()
+            try:
+                result = {"ok": True, **step(beat)}
+            except Exception as e:
+                result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            result["ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+            _state["steps"][name] = result
+            print(f"[warmup] {name}: {result}", flush=True)
+            beat()
+
+    failed = failed_steps()
+    _state.update(status="failed" if failed else "ready", finished=time.time())
+    elapsed = _state["finished"] - _state["started"]
+    if failed:
+        print(f"[warmup] not ready after {elapsed:.1f}s, failed: {', '.join(failed)}", flush=True)
+    else:
+        print(f"[warmup] ready in {elapsed:.1f}s", flush=True)
+    return status()
+
+
+def failed_steps() -> list[str]:
+    """Required steps that failed in the last warm-up run."""
+    return [
+        name for name, result in _state["steps"].items()
+        if not result["ok"] and name not in WARMUP_OPTIONAL_STEPS
+    ]
+
+
+def start_warmup():
+    """Runs warm-up in a daemon thread unless it is ready or already running."""
+    if _state["status"] in ("pending", "failed"):
+        threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _state["status"] == "ready"
+
+
+def status() -> dict:
+    return {**_state, "steps": dict(_state["steps"]), "failed": failed_steps(), "pid": os.getpid()}
+
+
+def register_health_routes(server, path: str = "/healthz"):
+    """GET /healthz: liveness. GET /healthz?ready: 200 only once warmed up without failed steps."""
+    from flask import jsonify, request
+
+    @server.route(path)
+    def healthz():
+        if "ready" not in request.args:
+            return jsonify({"status": "ok"})
+        if not is_ready():
+            start_warmup()
+            return jsonify(status()), 503
+        return jsonify(status())
+
+    return healthz